@@ -0,0 +1,524 @@
+import asyncio
+import json
+import threading
+import tracemalloc
+from typing import (
+    List,
+    Optional,
+    Type,
+)
+
+from bench.models import (
+    WIDE_MODEL_FIELD_COUNTS,
+    WIDE_MODELS,
+    CascadeChild,
+    DiffedDocument,
+    Document,
+    Narrow,
+    Parent,
+    SetNullChild,
+    UntrackedNarrow,
+)
+from bench.registry import (
+    Timer,
+    register,
+)
+from django.apps import apps
+from django.db.models import Model
+from django.test import override_settings
+
+import revy
+from revy.contrib.django import (
+    diffs,
+    get_attribute_delta_model,
+    get_object_delta_model,
+    get_revision_model,
+)
+from revy.contrib.django.aggregates import ObjectSnapshot
+from revy.contrib.django.querysets import untracked
+from revy.contrib.django.setup import (
+    setup,
+    teardown,
+)
+
+
+ASSIGNMENTS = 1000
+
+LOOKUPS = 10000
+
+WORKERS = 4
+
+STORAGES = {
+    'asgiref': revy.ASGIRefLocalStorage,
+    'contextvar': revy.ContextVarStorage,
+}
+
+ROWS = 1000
+
+DOCUMENT_LINES = 200
+
+
+def reset_database() -> None:
+    for model in (
+        get_revision_model(),
+        Narrow,
+        UntrackedNarrow,
+        *WIDE_MODELS.values(),
+        CascadeChild,
+        SetNullChild,
+        Parent,
+        Document,
+        DiffedDocument,
+    ):
+        model._default_manager.all().delete()
+
+
+@register(
+    'setattr',
+    params=[
+        {'patched': True},
+        {'patched': False},
+    ],
+)
+def bench_setattr(
+    timer: Timer,
+    patched: bool,
+) -> None:
+    model: Type[Model] = Narrow if patched else UntrackedNarrow
+    values = [f'value-{index}' for index in range(ASSIGNMENTS)]
+    with revy.Context():
+        instance = model()
+
+        def assign() -> None:
+            for value in values:
+                instance.name = value  # type: ignore[attr-defined]
+
+        timer.measure(assign, operations=ASSIGNMENTS)
+
+
+@register(
+    'pending.memory',
+    params=[
+        {'field_count': field_count}
+        for field_count in WIDE_MODEL_FIELD_COUNTS
+    ],
+)
+def bench_pending_memory(
+    timer: Timer,
+    field_count: int,
+) -> None:
+    model = WIDE_MODELS[field_count]
+    kwargs = {
+        f'field_{index}': f'value-{index}'
+        for index in range(field_count)
+    }
+    with revy.Context():
+
+        def build() -> List[Model]:
+            return [model(**kwargs) for _ in range(ROWS)]
+
+        timer.measure(build, operations=ROWS)
+        tracemalloc.start()
+        try:
+            instances = build()
+            allocated_bytes, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    timer.set_extra('bytes_per_instance', allocated_bytes // len(instances))
+
+
+@register(
+    'save.create',
+    params=[
+        {'field_count': field_count}
+        for field_count in WIDE_MODEL_FIELD_COUNTS
+    ],
+)
+def bench_save_create(
+    timer: Timer,
+    field_count: int,
+) -> None:
+    reset_database()
+    model = WIDE_MODELS[field_count]
+    kwargs = {
+        f'field_{index}': f'value-{index}'
+        for index in range(field_count)
+    }
+    with revy.Context():
+
+        def save() -> None:
+            model(**kwargs).save()
+
+        timer.measure(save, count_queries=True)
+
+
+@register(
+    'save.update',
+    params=[
+        {'field_count': field_count}
+        for field_count in WIDE_MODEL_FIELD_COUNTS
+    ],
+)
+def bench_save_update(
+    timer: Timer,
+    field_count: int,
+) -> None:
+    reset_database()
+    model = WIDE_MODELS[field_count]
+    with revy.Context():
+        instance = model._default_manager.create()
+        counter = 0
+
+        def save() -> None:
+            nonlocal counter
+            counter += 1
+            setattr(instance, 'field_0', f'value-{counter}')
+            instance.save()
+
+        timer.measure(save, count_queries=True)
+
+
+@register(
+    'queryset.iterate',
+    params=[
+        {'patched': True},
+        {'patched': False},
+    ],
+)
+def bench_queryset_iterate(
+    timer: Timer,
+    patched: bool,
+) -> None:
+    reset_database()
+    model: Type[Model] = Narrow if patched else UntrackedNarrow
+    model._default_manager.bulk_create([
+        model(name=f'name-{index}', value=index)
+        for index in range(ROWS)
+    ])
+    with revy.Context():
+
+        def iterate() -> None:
+            list(model._default_manager.all())
+
+        timer.measure(iterate, operations=ROWS)
+
+
+@register(
+    'queryset.untracked',
+    params=[
+        {'mode': 'enabled'},
+        {'mode': 'disabled'},
+        {'mode': 'untracked'},
+    ],
+)
+def bench_queryset_untracked(
+    timer: Timer,
+    mode: str,
+) -> None:
+    reset_database()
+    Narrow._default_manager.bulk_create([
+        Narrow(name=f'name-{index}', value=index)
+        for index in range(ROWS)
+    ])
+    queryset = Narrow._default_manager.all()
+    if mode == 'untracked':
+        queryset = untracked(queryset)
+    context = revy.Context.as_disabled() if mode == 'disabled' else revy.Context()
+    with context:
+
+        def iterate() -> None:
+            list(queryset.all())
+
+        timer.measure(iterate, operations=ROWS)
+
+
+@register(
+    'delete.cascade',
+    params=[
+        {'children': 10},
+        {'children': 100},
+    ],
+)
+def bench_delete_cascade(
+    timer: Timer,
+    children: int,
+) -> None:
+    reset_database()
+    parents: List[Parent] = []
+
+    def setup() -> None:
+        parent = Parent.objects.create()
+        CascadeChild.objects.bulk_create([
+            CascadeChild(parent=parent)
+            for _ in range(children)
+        ])
+        parents.append(Parent.objects.get(pk=parent.pk))
+
+    with revy.Context():
+
+        def delete() -> None:
+            parents.pop().delete()
+
+        timer.measure(delete, setup=setup, count_queries=True)
+
+
+@register(
+    'delete.set_null',
+    params=[
+        {'children': 10},
+        {'children': 100},
+    ],
+)
+def bench_delete_set_null(
+    timer: Timer,
+    children: int,
+) -> None:
+    reset_database()
+    parents: List[Parent] = []
+
+    def setup() -> None:
+        parent = Parent.objects.create()
+        SetNullChild.objects.bulk_create([
+            SetNullChild(parent=parent)
+            for _ in range(children)
+        ])
+        parents.append(Parent.objects.get(pk=parent.pk))
+
+    with revy.Context():
+
+        def delete() -> None:
+            parents.pop().delete()
+
+        timer.measure(delete, setup=setup, count_queries=True)
+
+
+@register(
+    'snapshot',
+    params=[
+        {'history_length': 10},
+        {'history_length': 100},
+        {'history_length': 1000},
+    ],
+)
+def bench_snapshot(
+    timer: Timer,
+    history_length: int,
+) -> None:
+    reset_database()
+    object_delta_model = get_object_delta_model()
+    with revy.Context():
+        instance = Narrow.objects.create()
+        for index in range(history_length - 1):
+            instance.name = f'name-{index}'
+            instance.value = index
+            instance.save()
+    latest_object_delta = object_delta_model.objects.latest('pk')
+
+    def snapshot() -> None:
+        object_delta = object_delta_model.objects.filter(
+            pk=latest_object_delta.pk,
+        ).annotate(
+            snapshot=ObjectSnapshot(Narrow),
+        ).get()
+        assert isinstance(getattr(object_delta, 'snapshot'), Narrow)  # noqa
+
+    timer.measure(snapshot, count_queries=True)
+
+
+@register(
+    'text.edits',
+    params=[
+        {'diff': True, 'edits': 10},
+        {'diff': True, 'edits': 100},
+        {'diff': False, 'edits': 10},
+        {'diff': False, 'edits': 100},
+    ],
+)
+def bench_text_edits(
+    timer: Timer,
+    diff: bool,
+    edits: int,
+) -> None:
+    reset_database()
+    model: Type[Model] = DiffedDocument if diff else Document
+    attribute_delta_model = get_attribute_delta_model()
+    lines = [f'Line {index} of a long document.\n' for index in range(DOCUMENT_LINES)]
+    with revy.Context():
+        instance = model._default_manager.create(body=''.join(lines))
+        for index in range(edits):
+            lines[index * 7 % DOCUMENT_LINES] = f'Line edited for the {index}th time.\n'
+            setattr(instance, 'body', ''.join(lines))
+            instance.save()
+    body_attribute_deltas = attribute_delta_model.objects.filter(
+        field_name='body',
+    )
+    stored_bytes = sum(
+        len(json.dumps(getattr(attribute_delta, field_name)))
+        for attribute_delta in body_attribute_deltas
+        for field_name in (
+            attribute_delta_model.OLD_VALUE_FIELD_NAME,
+            attribute_delta_model.NEW_VALUE_FIELD_NAME,
+        )
+    )
+    timer.set_extra('stored_bytes', stored_bytes)
+    latest_attribute_delta = body_attribute_deltas.latest('pk')
+
+    def reconstruct() -> None:
+        diffs._text_cache.clear()
+        attribute_delta = attribute_delta_model.objects.get(pk=latest_attribute_delta.pk)
+        assert attribute_delta.get_new_value() == ''.join(lines)  # noqa
+
+    timer.measure(reconstruct, count_queries=True)
+
+
+@register(
+    'setup',
+    params=[
+        {'lazy': False},
+        {'lazy': True},
+    ],
+)
+def bench_setup(
+    timer: Timer,
+    lazy: bool,
+) -> None:
+    with override_settings(REVY_MODELS=['*'], REVY_INCLUDE_AUTO_CREATED_MODELS=True, REVY_LAZY_PATCHING=lazy):
+        models = apps.get_models(include_auto_created=True)
+        timer.set_extra('models', len(models))
+        timer.measure(setup, operations=len(models), setup=teardown)
+
+
+@register(
+    'setup.override',
+)
+def bench_setup_override(
+    timer: Timer,
+) -> None:
+    model_fields = {
+        'bench.Narrow': {
+            'exclude': ['value'],
+        },
+    }
+
+    def override() -> None:
+        with override_settings(REVY_MODEL_FIELDS=model_fields):
+            pass
+
+    timer.measure(override)
+
+
+@register(
+    'context.lookup',
+    params=[
+        {'storage': storage, 'concurrency': concurrency}
+        for storage in STORAGES
+        for concurrency in ('thread', 'task')
+    ],
+)
+def bench_context_lookup(
+    timer: Timer,
+    storage: str,
+    concurrency: str,
+) -> None:
+    context_class = STORAGES[storage]().create_context_class(base=revy.Context)
+
+    def look_up() -> None:
+        with context_class.via_actor(1):
+            for _ in range(LOOKUPS):
+                context_class.is_disabled()
+                context_class.get_actor()
+
+    async def look_up_in_task() -> None:
+        await asyncio.sleep(0)
+        look_up()
+
+    def run_threads() -> None:
+        threads = [threading.Thread(target=look_up) for _ in range(WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    async def gather_tasks() -> None:
+        await asyncio.gather(*(look_up_in_task() for _ in range(WORKERS)))
+
+    def run_tasks() -> None:
+        asyncio.run(gather_tasks())
+
+    timer.measure(
+        run_threads if concurrency == 'thread' else run_tasks,
+        operations=LOOKUPS * WORKERS * 2,
+    )
+
+
+@register(
+    'save.coalesce',
+    params=[
+        {'coalescing': False},
+        {'coalescing': True},
+    ],
+)
+def bench_save_coalesce(
+    timer: Timer,
+    coalescing: bool,
+) -> None:
+    reset_database()
+    revision_class = get_revision_model()
+    attribute_delta_class = get_attribute_delta_model()
+    saves = 10
+
+    def save() -> None:
+        revision = revision_class._default_manager.create()
+        with revy.Context.via_revision(revision), revy.Context():
+            if coalescing:
+                revy.Context.enable_coalescing()
+            instance = Narrow._default_manager.create(name='value')
+            for index in range(saves):
+                instance.name = f'value-{index}'  # type: ignore[attr-defined]
+                instance.save()
+
+    timer.measure(save, operations=saves + 1, count_queries=True)
+    timer.set_extra(
+        'attribute_deltas_per_revision',
+        attribute_delta_class._default_manager.count() / revision_class._default_manager.count(),
+    )
+
+
+@register(
+    'save.batch',
+    params=[
+        {'batch_size': None},
+        {'batch_size': 100},
+        {'batch_size': 1000},
+    ],
+)
+def bench_save_batch(
+    timer: Timer,
+    batch_size: Optional[int],
+) -> None:
+    reset_database()
+
+    def save() -> None:
+        context = revy.Context.via_batch(revy.Batch(max_objects=batch_size)) if batch_size else revy.Context()
+        with context:
+            for index in range(ROWS):
+                Narrow._default_manager.create(name=f'name-{index}', value=index)
+
+    timer.measure(save, operations=ROWS, count_queries=True)
+
+
+@register(
+    'save.unchanged',
+)
+def bench_save_unchanged(
+    timer: Timer,
+) -> None:
+    reset_database()
+    with revy.Context():
+        instance = Narrow._default_manager.create(name='value')
+
+        def save() -> None:
+            instance.name = 'value'  # type: ignore[attr-defined]
+            instance.save()
+
+        timer.measure(save, count_queries=True)
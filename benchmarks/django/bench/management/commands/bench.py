@@ -0,0 +1,144 @@
+import json
+import platform
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+from bench.registry import (
+    BENCHMARKS,
+    Result,
+)
+import django
+from django.core.management import call_command
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+import revy
+
+
+class Command(BaseCommand):
+
+    help = 'Measures the overhead of revy and optionally compares it with a previous run.'
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help='Names (or name prefixes) of the benchmarks to run. Runs all by default.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of samples collected per benchmark.',
+        )
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='Path of the JSON file the results are written to.',
+        )
+        parser.add_argument(
+            '--format',
+            default='text',
+            choices=('text', 'json'),
+            help='Format of the results written to the standard output.',
+        )
+        parser.add_argument(
+            '--compare',
+            default=None,
+            help='Path of a JSON file produced by a previous run to compare the results with.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.1,
+            help='Relative slowdown of the median tolerated before a result counts as a regression.',
+        )
+
+    def handle(
+        self,
+        *args: Any,
+        **options: Any,
+    ) -> None:
+        import bench.cases  # noqa
+
+        call_command('migrate', run_syncdb=True, verbosity=0)
+
+        names = options['names']
+        benchmarks = [
+            benchmark
+            for name, benchmark in BENCHMARKS.items()
+            if not names or any(name.startswith(prefix) for prefix in names)
+        ]
+        if not benchmarks:
+            raise CommandError('No benchmark matches the given names.')
+
+        results: List[Result] = []
+        for benchmark in benchmarks:
+            results.extend(benchmark.run(options['repeat']))
+
+        report = {
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'revy': revy.__version__,
+            },
+            'results': [result.to_dict() for result in results],
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(report, output_file, indent=2)
+
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            for result in results:
+                queries = f', {result.queries:g} queries/op' if result.queries is not None else ''
+                extra = ''.join(
+                    f', {key}={value}'
+                    for key, value in result.extra.items()
+                )
+                self.stdout.write(
+                    f'{result.key}: median {result.median * 1e6:.2f} us/op, '
+                    f'min {result.min * 1e6:.2f} us/op{queries}{extra}',
+                )
+
+        if options['compare']:
+            self.compare(results, options['compare'], options['threshold'])
+
+    def compare(
+        self,
+        results: List[Result],
+        baseline_path: str,
+        threshold: float,
+    ) -> None:
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+        baseline_results: Dict[str, Dict[str, Any]] = {
+            result['key']: result
+            for result in baseline.get('results', [])
+        }
+        regressions = []
+        for result in results:
+            baseline_result = baseline_results.get(result.key)
+            if baseline_result is None or not baseline_result['median']:
+                continue
+            ratio = result.median / baseline_result['median']
+            is_regression = ratio > 1 + threshold
+            self.stderr.write(
+                f'{result.key}: {ratio:.2f}x of baseline'
+                f'{" (regression)" if is_regression else ""}',
+            )
+            if is_regression:
+                regressions.append(result.key)
+        if regressions:
+            raise CommandError(f'{len(regressions)} benchmark(s) regressed: {", ".join(regressions)}')
@@ -0,0 +1,106 @@
+from typing import (
+    Any,
+    Dict,
+    Type,
+)
+
+from django.db import models
+
+from revy.contrib.django.deletion import (
+    CASCADE,
+    SET_NULL,
+)
+
+
+WIDE_MODEL_FIELD_COUNTS = (1, 10, 50)
+
+
+class Narrow(models.Model):
+
+    name = models.CharField(  # type: ignore
+        max_length=255,
+        blank=True,
+        default='',
+    )
+
+    value = models.IntegerField(  # type: ignore
+        default=0,
+    )
+
+
+class UntrackedNarrow(models.Model):
+
+    name = models.CharField(  # type: ignore
+        max_length=255,
+        blank=True,
+        default='',
+    )
+
+    value = models.IntegerField(  # type: ignore
+        default=0,
+    )
+
+
+def _create_wide_model(
+    field_count: int,
+) -> Type[models.Model]:
+    namespace: Dict[str, Any] = {
+        '__module__': __name__,
+    }
+    for index in range(field_count):
+        namespace[f'field_{index}'] = models.CharField(
+            max_length=255,
+            blank=True,
+            default='',
+        )
+    return type(f'Wide{field_count}', (models.Model,), namespace)
+
+
+WIDE_MODELS: Dict[int, Type[models.Model]] = {
+    field_count: _create_wide_model(field_count)
+    for field_count in WIDE_MODEL_FIELD_COUNTS
+}
+
+
+class Parent(models.Model):
+
+    name = models.CharField(  # type: ignore
+        max_length=255,
+        blank=True,
+        default='',
+    )
+
+
+class CascadeChild(models.Model):
+
+    parent = models.ForeignKey(  # type: ignore
+        Parent,
+        on_delete=CASCADE,
+        related_name='cascade_children',
+    )
+
+
+class SetNullChild(models.Model):
+
+    parent = models.ForeignKey(  # type: ignore
+        Parent,
+        on_delete=SET_NULL,
+        related_name='set_null_children',
+        null=True,
+    )
+
+
+class Document(models.Model):
+
+    body = models.TextField(  # type: ignore
+        blank=True,
+        default='',
+    )
+
+
+class DiffedDocument(models.Model):
+
+    body = models.TextField(  # type: ignore
+        blank=True,
+        default='',
+    )
@@ -0,0 +1,194 @@
+import dataclasses
+import statistics
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+from django.db import connection
+
+
+__all__ = (
+    'Result',
+    'Timer',
+    'Benchmark',
+    'BENCHMARKS',
+    'register',
+)
+
+
+@dataclasses.dataclass()
+class Result:
+
+    name: str = dataclasses.field(
+        kw_only=True,
+    )
+
+    params: Dict[str, Any] = dataclasses.field(
+        kw_only=True,
+        default_factory=dict,
+    )
+
+    unit: str = dataclasses.field(
+        kw_only=True,
+        default='s',
+    )
+
+    samples: List[float] = dataclasses.field(
+        kw_only=True,
+        default_factory=list,
+    )
+
+    queries: Optional[float] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    extra: Dict[str, Any] = dataclasses.field(
+        kw_only=True,
+        default_factory=dict,
+    )
+
+    @property
+    def key(self) -> str:
+        params = ','.join(
+            f'{name}={value}'
+            for name, value in sorted(self.params.items())
+        )
+        return f'{self.name}[{params}]'
+
+    @property
+    def min(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'key': self.key,
+            'name': self.name,
+            'params': self.params,
+            'unit': self.unit,
+            'min': self.min,
+            'median': self.median,
+            'mean': self.mean,
+            'samples': self.samples,
+            'queries': self.queries,
+            'extra': self.extra,
+        }
+
+
+class Timer:
+
+    repeat: int
+
+    result: Result
+
+    def __init__(
+        self,
+        result: Result,
+        repeat: int,
+    ) -> None:
+        self.result = result
+        self.repeat = repeat
+
+    def measure(
+        self,
+        function: Callable[[], Any],
+        operations: int = 1,
+        setup: Optional[Callable[[], Any]] = None,
+        count_queries: bool = False,
+    ) -> None:
+        if count_queries:
+            if setup is not None:
+                setup()
+            queries = 0
+
+            def count_query(
+                execute: Callable[..., Any],
+                *args: Any,
+            ) -> Any:
+                nonlocal queries
+                queries += 1
+                return execute(*args)
+
+            with connection.execute_wrapper(count_query):
+                function()
+            self.result.queries = queries / operations
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            started_at = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started_at
+            self.result.samples.append(elapsed / operations)
+
+    def set_extra(
+        self,
+        key: str,
+        value: Any,
+    ) -> None:
+        self.result.extra[key] = value
+
+
+@dataclasses.dataclass()
+class Benchmark:
+
+    name: str = dataclasses.field(
+        kw_only=True,
+    )
+
+    function: Callable[..., None] = dataclasses.field(
+        kw_only=True,
+    )
+
+    params: Sequence[Dict[str, Any]] = dataclasses.field(
+        kw_only=True,
+        default=({},),
+    )
+
+    def run(
+        self,
+        repeat: int,
+    ) -> List[Result]:
+        results = []
+        for params in self.params:
+            result = Result(
+                name=self.name,
+                params=dict(params),
+            )
+            self.function(Timer(result, repeat), **params)
+            results.append(result)
+        return results
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def register(
+    name: str,
+    params: Sequence[Dict[str, Any]] = ({},),
+) -> Callable[[Callable[..., None]], Callable[..., None]]:
+
+    def decorator(
+        function: Callable[..., None],
+    ) -> Callable[..., None]:
+        BENCHMARKS[name] = Benchmark(
+            name=name,
+            function=function,
+            params=params,
+        )
+        return function
+
+    return decorator
@@ -0,0 +1,64 @@
+"""
+Settings of the benchmark project.
+
+The benchmarks run offline against an in-memory SQLite database.
+"""
+
+from pathlib import Path
+from typing import List
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+SECRET_KEY = 'django-insecure-benchmarks'
+
+DEBUG = False
+
+ALLOWED_HOSTS: List[str] = []
+
+
+INSTALLED_APPS = [
+    'django.contrib.contenttypes',
+
+    'revy.contrib.django',
+
+    'bench',
+]
+
+MIDDLEWARE: List[str] = []
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+USE_TZ = True
+
+TIME_ZONE = 'UTC'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Revy
+# https://github.com/ertgl/revy/
+
+REVY_MODELS = [
+    'bench.Narrow',
+    'bench.Wide1',
+    'bench.Wide10',
+    'bench.Wide50',
+    'bench.Parent',
+    'bench.CascadeChild',
+    'bench.SetNullChild',
+    'bench.Document',
+    'bench.DiffedDocument',
+]
+
+REVY_MODEL_FIELDS = {
+    'bench.DiffedDocument': {
+        'diff': ['body'],
+    },
+}
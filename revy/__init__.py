@@ -2,10 +2,19 @@ from revy.__version__ import (
     VERSION,
     __version__,
 )
-from revy.context import Context
-from revy.globals import global_storage
+from revy.batch import Batch
+from revy.context import (
+    Context,
+    ContextSnapshot,
+)
+from revy.cost_account import CostAccount
+from revy.globals import (
+    global_storage,
+    set_global_storage,
+)
 from revy.storages import (
     ASGIRefLocalStorage,
+    ContextVarStorage,
     Storage,
 )
 
@@ -14,7 +23,12 @@ __all__ = (
     '__version__',
     'VERSION',
     'Context',
+    'ContextSnapshot',
+    'Batch',
+    'CostAccount',
     'global_storage',
+    'set_global_storage',
     'Storage',
     'ASGIRefLocalStorage',
+    'ContextVarStorage',
 )
@@ -1,3 +1,5 @@
+import argparse
+import os
 import sys
 from typing import (
     Optional,
@@ -7,12 +9,29 @@ from typing import (
 from revy._argparse import ArgumentParser
 
 
+def stats(
+    args: argparse.Namespace,
+    command_argv: Sequence[str],
+) -> int:
+    if args.settings:
+        os.environ['DJANGO_SETTINGS_MODULE'] = args.settings
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    import django
+    from django.core.management import call_command
+    django.setup()
+    call_command('revy_stats', *command_argv)
+    return 0
+
+
 def main(
     argv: Optional[Sequence[str]] = None,
 ) -> int:
     argv = argv or sys.argv
     arg_parser = ArgumentParser()
-    arg_parser.parse_known_args(argv)
+    args, unknown_argv = arg_parser.parse_known_args(argv[1:])
+    if args.command == 'stats':
+        return stats(args, unknown_argv)
     return 0
 
 
@@ -25,3 +25,18 @@ class ArgumentParser(argparse.ArgumentParser):
             action='version',
             version=f'%(prog)s {__version__}',
         )
+        subparsers = self.add_subparsers(
+            dest='command',
+            parser_class=argparse.ArgumentParser,
+        )
+        stats_parser = subparsers.add_parser(
+            'stats',
+            help='Report the size and the write rate of the revision history of a Django project.',
+            add_help=False,
+            description='Unrecognized arguments are passed to the `revy_stats` management command.',
+        )
+        stats_parser.add_argument(
+            '--settings',
+            default=None,
+            help='Python path to the settings module of the Django project.',
+        )
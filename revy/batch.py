@@ -0,0 +1,90 @@
+from typing import (
+    Any,
+    Callable,
+    List,
+    Optional,
+)
+
+
+__all__ = (
+    'Batch',
+)
+
+
+class Batch:
+
+    max_objects: Optional[int]
+
+    max_bytes: Optional[int]
+
+    on_progress: Optional[Callable[['Batch'], None]]
+
+    flush_handler: Optional[Callable[['Batch', List[Any]], None]]
+
+    entries: List[Any]
+
+    pending_bytes: int
+
+    flushed_objects: int
+
+    flushed_bytes: int
+
+    flushes: int
+
+    revision: Optional[Any]
+
+    def __init__(
+        self,
+        max_objects: Optional[int] = 1000,
+        max_bytes: Optional[int] = None,
+        on_progress: Optional[Callable[['Batch'], None]] = None,
+    ) -> None:
+        self.max_objects = max_objects
+        self.max_bytes = max_bytes
+        self.on_progress = on_progress
+        self.flush_handler = None
+        self.entries = []
+        self.pending_bytes = 0
+        self.flushed_objects = 0
+        self.flushed_bytes = 0
+        self.flushes = 0
+        self.revision = None
+
+    def is_full(self) -> bool:
+        if self.max_objects is not None and len(self.entries) >= self.max_objects:
+            return True
+        if self.max_bytes is not None and self.pending_bytes >= self.max_bytes:
+            return True
+        return False
+
+    def add(
+        self,
+        entry: Any,
+        size: int = 0,
+    ) -> None:
+        self.entries.append(entry)
+        self.pending_bytes += size
+        if self.is_full():
+            self.flush()
+
+    def clear(self) -> None:
+        self.entries = []
+        self.pending_bytes = 0
+
+    def flush(self) -> None:
+        if not self.entries or self.flush_handler is None:
+            return
+        entries, pending_bytes = self.entries, self.pending_bytes
+        self.clear()
+        self.flush_handler(self, entries)
+        self.flushed_objects += len(entries)
+        self.flushed_bytes += pending_bytes
+        self.flushes += 1
+        if self.on_progress is not None:
+            self.on_progress(self)
+
+    def __str__(self) -> str:
+        return f'{self.flushed_objects} objects / {self.flushes} flushes / {len(self.entries)} pending'
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}: {self}>'
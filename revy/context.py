@@ -1,3 +1,5 @@
+import dataclasses
+from types import TracebackType
 from typing import (
     Any,
     Dict,
@@ -5,6 +7,7 @@ from typing import (
     Tuple,
     Type,
     Union,
+    cast,
 )
 
 import stackholm
@@ -13,14 +16,82 @@ from revy.abc import (
     LazyRevision,
     Revision,
 )
+from revy.batch import Batch
+from revy.cost_account import CostAccount
 
 
 __all__ = (
+    'ContextSnapshot',
+    'DISABLED_SNAPSHOT',
     'ContextMeta',
     'Context',
 )
 
 
+SNAPSHOT_ATTNAME = '__revy__snapshot'
+
+
+def _invalidate_snapshot(
+    storage: stackholm.Storage,
+) -> None:
+    state = storage.get_state()
+    if getattr(state, SNAPSHOT_ATTNAME, None) is not None:
+        setattr(state, SNAPSHOT_ATTNAME, None)
+
+
+@dataclasses.dataclass(frozen=True)
+class ContextSnapshot:
+
+    is_disabled: bool = dataclasses.field(
+        kw_only=True,
+    )
+
+    actor: Optional[Any] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    revision_description: str = dataclasses.field(
+        kw_only=True,
+        default='',
+    )
+
+    object_delta_description: str = dataclasses.field(
+        kw_only=True,
+        default='',
+    )
+
+    attribute_delta_description: str = dataclasses.field(
+        kw_only=True,
+        default='',
+    )
+
+    deletion_description: str = dataclasses.field(
+        kw_only=True,
+        default='',
+    )
+
+    cost_account: Optional[CostAccount] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    is_coalescing: bool = dataclasses.field(
+        kw_only=True,
+        default=False,
+    )
+
+    batch: Optional[Batch] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+
+DISABLED_SNAPSHOT = ContextSnapshot(
+    is_disabled=True,
+)
+
+
 class ContextMeta(type):
 
     def __new__(
@@ -29,7 +100,8 @@ class ContextMeta(type):
         bases: Tuple[Type, ...],
         namespace: Dict[str, Any],
     ) -> type:
-        if namespace.get('_storage') is None:
+        is_storage_inherited = any(getattr(base, '_storage', None) is not None for base in bases)
+        if namespace.get('_storage') is None and not is_storage_inherited:
             from revy.globals import global_storage
             namespace['_storage'] = global_storage
         return super(ContextMeta, mcs).__new__(mcs, name, bases, namespace)
@@ -56,6 +128,85 @@ class Context(
 
         DELETION_DESCRIPTION = 'deletion_description'
 
+        COST_ACCOUNT = 'cost_account'
+
+        IS_COALESCING = 'is_coalescing'
+
+        BATCH = 'batch'
+
+    @classmethod
+    def set_checkpoint_value(
+        cls,
+        key: str,
+        value: Any,
+    ) -> None:
+        super().set_checkpoint_value(key, value)
+        _invalidate_snapshot(cls._storage)
+
+    @classmethod
+    def pop_checkpoint_value(
+        cls,
+        key: str,
+        default: Any = None,
+    ) -> Any:
+        value = super().pop_checkpoint_value(key, default)
+        _invalidate_snapshot(cls._storage)
+        return value
+
+    @classmethod
+    def get_snapshot(cls) -> ContextSnapshot:
+        state = cls._storage.get_state()
+        if state.get_last_context() is None:
+            return DISABLED_SNAPSHOT
+        cached_snapshot = cast(
+            Optional[Tuple[Type['Context'], ContextSnapshot]],
+            getattr(state, SNAPSHOT_ATTNAME, None),
+        )
+        if cached_snapshot is not None and cached_snapshot[0] is cls:
+            return cached_snapshot[1]
+        snapshot = ContextSnapshot(
+            is_disabled=cls.is_disabled(),
+            actor=cls.get_actor(),
+            revision_description=cls.get_revision_description(),
+            object_delta_description=cls.get_object_delta_description(),
+            attribute_delta_description=cls.get_attribute_delta_description(),
+            deletion_description=cls.get_deletion_description(),
+            cost_account=cls.get_cost_account(),
+            is_coalescing=cls.is_coalescing(),
+            batch=cls.get_batch(),
+        )
+        setattr(state, SNAPSHOT_ATTNAME, (cls, snapshot))
+        return snapshot
+
+    def activate(self) -> 'Context':
+        is_active = self.is_active
+        super().activate()
+        if not is_active:
+            _invalidate_snapshot(self.storage)
+        return self
+
+    def deactivate(self) -> None:
+        is_active = self.is_active
+        super().deactivate()
+        if is_active:
+            _invalidate_snapshot(self.storage)
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        batch = cast(Optional[Batch], self.checkpoint_data.get(self.__class__.Key.BATCH))
+        try:
+            if batch is not None and self.is_active:
+                if exception_type is None:
+                    batch.flush()
+                else:
+                    batch.clear()
+        finally:
+            super().__exit__(exception_type, exception, traceback)
+
     @classmethod
     def via(
         cls,
@@ -290,3 +441,84 @@ class Context(
         context = cls()
         context.checkpoint_data[cls.Key.DELETION_DESCRIPTION] = deletion_description
         return context
+
+    @classmethod
+    def get_cost_account(cls) -> Optional[CostAccount]:
+        return cls.get_checkpoint_value(cls.Key.COST_ACCOUNT)
+
+    @classmethod
+    def set_cost_account(
+        cls,
+        cost_account: Optional[CostAccount],
+    ) -> None:
+        cls.set_checkpoint_value(cls.Key.COST_ACCOUNT, cost_account)
+
+    @classmethod
+    def unset_cost_account(cls) -> None:
+        cls.pop_checkpoint_value(cls.Key.COST_ACCOUNT)
+
+    @classmethod
+    def reset_cost_account(cls) -> None:
+        cls.reset_checkpoint_value(cls.Key.COST_ACCOUNT)
+
+    @classmethod
+    def via_cost_account(
+        cls,
+        cost_account: Optional[CostAccount] = None,
+    ) -> 'Context':
+        if cost_account is None:
+            cost_account = CostAccount(parent=cls.get_cost_account())
+        context = cls()
+        context.checkpoint_data[cls.Key.COST_ACCOUNT] = cost_account
+        return context
+
+    @classmethod
+    def enable_coalescing(cls) -> None:
+        cls.set_checkpoint_value(cls.Key.IS_COALESCING, True)
+
+    @classmethod
+    def disable_coalescing(cls) -> None:
+        cls.set_checkpoint_value(cls.Key.IS_COALESCING, False)
+
+    @classmethod
+    def is_coalescing(cls) -> bool:
+        return bool(cls.get_checkpoint_value(cls.Key.IS_COALESCING, False))
+
+    @classmethod
+    def as_coalescing(cls) -> 'Context':
+        context = cls()
+        context.checkpoint_data[cls.Key.IS_COALESCING] = True
+        return context
+
+    @classmethod
+    def get_batch(cls) -> Optional[Batch]:
+        return cls.get_checkpoint_value(cls.Key.BATCH)
+
+    @classmethod
+    def set_batch(
+        cls,
+        batch: Optional[Batch],
+    ) -> None:
+        cls.set_checkpoint_value(cls.Key.BATCH, batch)
+
+    @classmethod
+    def unset_batch(cls) -> None:
+        batch = cast(Optional[Batch], cls.pop_checkpoint_value(cls.Key.BATCH))
+        if batch is not None:
+            batch.flush()
+
+    @classmethod
+    def reset_batch(cls) -> None:
+        while cls.get_batch() is not None:
+            cls.unset_batch()
+
+    @classmethod
+    def via_batch(
+        cls,
+        batch: Optional[Batch] = None,
+    ) -> 'Context':
+        if batch is None:
+            batch = Batch()
+        context = cls()
+        context.checkpoint_data[cls.Key.BATCH] = batch
+        return context
@@ -10,6 +10,8 @@ __all__ = (
     'CharField',
     'TextField',
     'DateTimeField',
+    'BinaryField',
+    'PositiveBigIntegerField',
     'ForeignKey',
     'OneToOneField',
     'QuerySet',
@@ -45,6 +47,16 @@ if not TYPE_CHECKING or not IS_MYPY_DJANGO_PLUGIN_ENABLED:
     DateTimeField = mimic_generic(models.DateTimeField)  # type: ignore[misc]
 
 
+BinaryField = models.BinaryField
+if not TYPE_CHECKING or not IS_MYPY_DJANGO_PLUGIN_ENABLED:
+    BinaryField = mimic_generic(models.BinaryField)  # type: ignore[misc]
+
+
+PositiveBigIntegerField = models.PositiveBigIntegerField
+if not TYPE_CHECKING or not IS_MYPY_DJANGO_PLUGIN_ENABLED:
+    PositiveBigIntegerField = mimic_generic(models.PositiveBigIntegerField)  # type: ignore[misc]
+
+
 ForeignKey = models.ForeignKey
 if not TYPE_CHECKING or not IS_MYPY_DJANGO_PLUGIN_ENABLED:
     ForeignKey = mimic_generic(models.ForeignKey)  # type: ignore[misc]
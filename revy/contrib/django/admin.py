@@ -0,0 +1,369 @@
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Type,
+    cast,
+)
+
+from django.contrib import admin
+from django.contrib.admin.utils import unquote
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import (
+    PermissionDenied,
+    ValidationError,
+)
+from django.db.models import (
+    Model,
+    QuerySet,
+)
+from django.db.models.options import Options
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+)
+from django.template.response import TemplateResponse
+from django.utils.text import capfirst
+from django.utils.translation import gettext_lazy as _
+
+from revy.contrib.django import old_values
+from revy.contrib.django.apps import RevyConfig
+from revy.contrib.django.conf import settings
+from revy.contrib.django.history import (
+    object_history,
+    paginate_keyset,
+)
+from revy.contrib.django.querysets import (
+    DeltaQuerySet,
+    RevisionQuerySet,
+    estimate_count,
+)
+from revy.contrib.django.utils import (
+    get_attribute_delta_model,
+    get_object_delta_model,
+    get_revision_model,
+)
+
+
+__all__ = (
+    'CURSOR_VAR',
+    'get_cursor',
+    'get_query_string',
+    'KeysetChangeList',
+    'KeysetPaginationMixin',
+    'ReadOnlyAdminMixin',
+    'RevisionAdmin',
+    'ObjectDeltaAdmin',
+    'AttributeDeltaAdmin',
+    'HistoryAdminMixin',
+    'register',
+)
+
+
+CURSOR_VAR = 'cursor'
+
+
+def get_cursor(
+    request: HttpRequest,
+    model: Type[Model],
+) -> Optional[Any]:
+    cursor = request.GET.get(CURSOR_VAR) or None
+    if cursor is None:
+        return None
+    try:
+        return cast(Options, model._meta).pk.to_python(cursor)  # noqa
+    except ValidationError:
+        return None
+
+
+def get_query_string(
+    request: HttpRequest,
+    new_params: Dict[str, Optional[Any]],
+) -> str:
+    params = request.GET.copy()
+    for name, value in new_params.items():
+        if value is None:
+            params.pop(name, None)
+        else:
+            params[name] = str(value)
+    return f'?{params.urlencode()}'
+
+
+class KeysetChangeList(ChangeList):
+
+    def get_filters_params(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_results(
+        self,
+        request: HttpRequest,
+    ) -> None:
+        cursor = get_cursor(request, self.model)
+        page = paginate_keyset(
+            self.queryset,
+            cursor=cursor,
+            page_size=self.list_per_page,
+            descending=True,
+        )
+        result_count, is_exact = estimate_count(self.queryset, settings.ADMIN_COUNT_LIMIT)
+
+        self.result_count = result_count
+        self.result_count_is_exact = is_exact
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.full_result_count = None
+        self.result_list = page.objects
+        self.can_show_all = False
+        self.multi_page = page.has_next or cursor is not None
+        self.paginator = None
+        self.first_url = self.get_query_string(remove=[CURSOR_VAR]) if cursor is not None else None
+        self.next_url = self.get_query_string({CURSOR_VAR: page.next_cursor}) if page.has_next else None
+
+
+class KeysetPaginationMixin:
+
+    change_list_template: Any = 'admin/revy/keyset_change_list.html'
+
+    show_full_result_count = False
+
+    sortable_by: Any = ()
+
+    def get_changelist(
+        self,
+        request: HttpRequest,
+        **kwargs: Any,
+    ) -> Type[ChangeList]:
+        return KeysetChangeList
+
+
+class ReadOnlyAdminMixin:
+
+    def has_add_permission(
+        self,
+        request: HttpRequest,
+        obj: Optional[Model] = None,
+    ) -> bool:
+        return False
+
+    def has_change_permission(
+        self,
+        request: HttpRequest,
+        obj: Optional[Model] = None,
+    ) -> bool:
+        return False
+
+    def has_delete_permission(
+        self,
+        request: HttpRequest,
+        obj: Optional[Model] = None,
+    ) -> bool:
+        return False
+
+
+class RevisionAdmin(
+    KeysetPaginationMixin,
+    ReadOnlyAdminMixin,
+    admin.ModelAdmin,
+):
+
+    list_display = (
+        'id',
+        'description',
+        'created_at',
+        'actors',
+    )
+
+    def get_queryset(
+        self,
+        request: HttpRequest,
+    ) -> QuerySet:
+        return cast(RevisionQuerySet, super().get_queryset(request)).prefetch_actors()
+
+    @admin.display(description=_('actors'))
+    def actors(
+        self,
+        obj: Model,
+    ) -> str:
+        return ', '.join(str(actor) for actor in getattr(obj, 'get_actors')())
+
+
+class ObjectDeltaAdmin(
+    KeysetPaginationMixin,
+    ReadOnlyAdminMixin,
+    admin.ModelAdmin,
+):
+
+    list_display = (
+        'id',
+        'revision_id',
+        'action',
+        'content_type',
+        'content_id',
+        'content',
+        'actor',
+        'created_at',
+    )
+
+    list_select_related = (
+        'content_type',
+    )
+
+    def get_queryset(
+        self,
+        request: HttpRequest,
+    ) -> QuerySet:
+        return cast(DeltaQuerySet, super().get_queryset(request)).prefetch_actors().prefetch_contents()
+
+    @admin.display(description=_('content'))
+    def content(
+        self,
+        obj: Model,
+    ) -> Optional[Model]:
+        return getattr(obj, 'get_object')()
+
+    @admin.display(description=_('actor'))
+    def actor(
+        self,
+        obj: Model,
+    ) -> Optional[Model]:
+        return getattr(obj, 'get_actor')()
+
+
+class AttributeDeltaAdmin(
+    KeysetPaginationMixin,
+    ReadOnlyAdminMixin,
+    admin.ModelAdmin,
+):
+
+    list_display = (
+        'id',
+        'object_delta_id',
+        'content_type',
+        'content_id',
+        'attribute_name',
+        'old_value',
+        'new_value',
+        'actor',
+        'created_at',
+    )
+
+    list_select_related = (
+        'content_type',
+    )
+
+    def get_queryset(
+        self,
+        request: HttpRequest,
+    ) -> QuerySet:
+        attribute_deltas = cast(DeltaQuerySet, super().get_queryset(request)).prefetch_actors()
+        if settings.OLD_VALUES != old_values.MODE_ALWAYS:
+            attribute_deltas = old_values.annotate_previous_new_values(attribute_deltas)
+        return attribute_deltas
+
+    @admin.display(description=_('object delta'))
+    def object_delta_id(
+        self,
+        obj: Model,
+    ) -> Any:
+        object_delta_field = cast(Options, obj._meta).get_field(getattr(obj, 'OBJECT_DELTA_FIELD_NAME'))  # noqa
+        return getattr(obj, getattr(object_delta_field, 'attname'))
+
+    @admin.display(description=_('attribute name'))
+    def attribute_name(
+        self,
+        obj: Model,
+    ) -> str:
+        return cast(str, getattr(obj, 'get_attribute_name')())
+
+    @admin.display(description=_('old value'))
+    def old_value(
+        self,
+        obj: Model,
+    ) -> Any:
+        return getattr(obj, 'get_old_value')()
+
+    @admin.display(description=_('new value'))
+    def new_value(
+        self,
+        obj: Model,
+    ) -> Any:
+        return getattr(obj, 'get_new_value')()
+
+    @admin.display(description=_('actor'))
+    def actor(
+        self,
+        obj: Model,
+    ) -> Optional[Model]:
+        return getattr(obj, 'get_actor')()
+
+
+class HistoryAdminMixin:
+
+    object_history_template: Any = 'admin/revy/object_history.html'
+
+    history_per_page = 50
+
+    def history_view(
+        self,
+        request: HttpRequest,
+        object_id: str,
+        extra_context: Optional[Dict[str, Any]] = None,
+    ) -> HttpResponse:
+        model_admin = cast(admin.ModelAdmin, self)
+        options = cast(Options, model_admin.opts)
+        obj = model_admin.get_object(request, unquote(object_id))
+        if obj is None:
+            return model_admin._get_obj_does_not_exist_redirect(  # type: ignore[attr-defined]
+                request,
+                options,
+                object_id,
+            )
+        if not model_admin.has_view_or_change_permission(request, obj):
+            raise PermissionDenied
+
+        cursor = get_cursor(request, get_object_delta_model())
+        page = paginate_keyset(
+            object_history(obj).prefetch_actors(),
+            cursor=cursor,
+            page_size=self.history_per_page,
+            descending=True,
+        )
+        context = {
+            **model_admin.admin_site.each_context(request),
+            'title': _('Change history: %s') % obj,
+            'subtitle': None,
+            'module_name': str(capfirst(options.verbose_name_plural)),
+            'object': obj,
+            'opts': options,
+            'preserved_filters': model_admin.get_preserved_filters(request),
+            'page': page,
+            'first_url': get_query_string(request, {CURSOR_VAR: None}) if cursor is not None else None,
+            'next_url': get_query_string(request, {CURSOR_VAR: page.next_cursor}) if page.has_next else None,
+            **(extra_context or {}),
+        }
+        request.current_app = model_admin.admin_site.name
+        return TemplateResponse(request, self.object_history_template, context)
+
+
+def register(
+    site: admin.AdminSite = admin.site,
+) -> None:
+    model_admins = (
+        (get_revision_model(), RevisionAdmin),
+        (get_object_delta_model(), ObjectDeltaAdmin),
+        (get_attribute_delta_model(), AttributeDeltaAdmin),
+    )
+    for model, model_admin in model_admins:
+        if cast(Options, model._meta).app_label != RevyConfig.label:  # noqa
+            continue
+        if site.is_registered(model):
+            continue
+        site.register(model, model_admin)
+
+
+register()
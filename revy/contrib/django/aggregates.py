@@ -1,5 +1,6 @@
 from typing import (
     Any,
+    Dict,
     TYPE_CHECKING,
     Type,
     TypeVar,
@@ -10,6 +11,7 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.models import (
     Field,
+    Func,
     JSONField,
     Model,
     OuterRef,
@@ -19,6 +21,12 @@ from django.db.models.functions import JSONObject  # type: ignore[attr-defined]
 from django.db.models.functions import Cast
 from django.db.models.options import Options
 
+from revy.contrib.django import (
+    diffs,
+    field_codecs,
+    values,
+)
+from revy.contrib.django.policies import is_field_tracked
 from revy.contrib.django.utils import (
     get_attribute_delta_model,
     get_object_delta_model,
@@ -35,6 +43,24 @@ __all__ = ("ObjectSnapshot",)
 T = TypeVar("T")
 
 
+class _JSONValue(Func):
+    template = "%(expressions)s"
+
+    def as_sqlite(
+        self,
+        compiler: Any,
+        connection: BaseDatabaseWrapper,
+        **extra_context: Any,
+    ) -> Any:
+        return super(_JSONValue, self).as_sql(
+            compiler,
+            connection,
+            function="JSON",
+            template="%(function)s(%(expressions)s)",
+            **extra_context,
+        )
+
+
 class _InstanceField(JSONField):
     model: Type[Model]
 
@@ -58,14 +84,33 @@ class _InstanceField(JSONField):
             connection,
         )
         if isinstance(python_value, dict):
-            return self.model(**python_value)
+            return self.build_instance(python_value)
         if isinstance(python_value, (list, tuple)):
             container_type = type(python_value)
-            return container_type(
-                map(lambda kwargs: self.model(**kwargs), python_value)
-            )
+            return container_type(map(self.build_instance, python_value))
         return python_value
 
+    def build_instance(
+        self,
+        kwargs: Dict[str, Any],
+    ) -> Model:
+        options = cast(Options, self.model._meta)  # noqa
+        pk = kwargs.get(options.pk.attname) if options.pk is not None else None
+        attribute_codecs = field_codecs.get_field_codecs(self.model)
+        return self.model(
+            **{
+                attname: attribute_codecs.get(attname, field_codecs.IDENTITY_CODEC).decode(
+                    diffs.resolve_object_value(
+                        self.model,
+                        pk,
+                        attname,
+                        values.decode_value(value),
+                    ),
+                )
+                for attname, value in kwargs.items()
+            }
+        )
+
 
 class ObjectSnapshot(Subquery):
     @classmethod
@@ -100,7 +145,9 @@ class ObjectSnapshot(Subquery):
             any_to_many = one_to_many or many_to_many
             if not attname or any_to_many:
                 continue
-            annotations[attname] = (
+            if not is_field_tracked(model, cast(Field, field)):
+                continue
+            annotations[attname] = _JSONValue(
                 attribute_delta_model.objects.filter(
                     **{
                         att_ct_field.attname: OuterRef(obj_ct_field.attname),
@@ -116,7 +163,8 @@ class ObjectSnapshot(Subquery):
                 )
                 .values(
                     attribute_delta_model.NEW_VALUE_FIELD_NAME,
-                )[:1]
+                )[:1],
+                output_field=JSONField(),
             )
         return JSONObject(**annotations)  # type: ignore[arg-type]
 
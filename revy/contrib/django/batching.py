@@ -0,0 +1,228 @@
+import dataclasses
+import json
+import time
+from typing import (
+    Any,
+    List,
+    Sequence,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+    cast,
+)
+
+from django.db import (
+    connections,
+    transaction,
+)
+from django.db.models import Model
+from django.db.models.options import Options
+
+from revy.batch import Batch
+from revy.context import ContextSnapshot
+from revy.contrib.django import metrics
+from revy.contrib.django.conf import settings
+from revy.contrib.django.cost_accounting import account_cost
+from revy.contrib.django.routers import get_audit_database
+from revy.contrib.django.utils import (
+    get_attribute_delta_model,
+    get_context_class,
+    get_json_encoder_class,
+    get_object_delta_model,
+    get_revision_model,
+)
+
+
+if TYPE_CHECKING:
+    from revy.contrib.django.models import (
+        AbstractAttributeDelta,
+        AbstractObjectDelta,
+        AbstractRevision,
+    )
+
+
+__all__ = (
+    'BatchEntry',
+    'set_generic_object',
+    'get_encoded_size',
+    'get_batch_revision',
+    'bulk_insert',
+    'add_to_batch',
+    'flush_batch_entries',
+)
+
+
+@dataclasses.dataclass(slots=True)
+class BatchEntry:
+
+    model: Type[Model] = dataclasses.field(
+        kw_only=True,
+    )
+
+    object_delta: 'AbstractObjectDelta' = dataclasses.field(
+        kw_only=True,
+    )
+
+    attribute_deltas: List['AbstractAttributeDelta'] = dataclasses.field(
+        kw_only=True,
+    )
+
+
+def set_generic_object(
+    delta: Model,
+    generic_foreign_key_name: str,
+    instance: Model,
+) -> None:
+    from django.contrib.contenttypes.fields import GenericForeignKey
+
+    from revy.contrib.django.querysets import get_generic_attnames
+
+    generic_foreign_key = cast(
+        GenericForeignKey,
+        cast(Options, delta._meta).get_field(generic_foreign_key_name),  # noqa
+    )
+    ct_attname, fk_attname = get_generic_attnames(delta.__class__, generic_foreign_key_name)
+    setattr(delta, ct_attname, generic_foreign_key.get_content_type(obj=instance).pk)
+    setattr(delta, fk_attname, instance.pk)
+
+
+def get_encoded_size(
+    attribute_deltas: Sequence['AbstractAttributeDelta'],
+) -> int:
+    json_encoder_class = get_json_encoder_class()
+    encoded_size = 0
+    for attribute_delta in attribute_deltas:
+        for field_name in (
+            attribute_delta.__class__.OLD_VALUE_FIELD_NAME,
+            attribute_delta.__class__.NEW_VALUE_FIELD_NAME,
+        ):
+            encoded_size += len(json.dumps(getattr(attribute_delta, field_name), cls=json_encoder_class))
+    return encoded_size
+
+
+def get_batch_revision(
+    batch: Batch,
+    context_snapshot: ContextSnapshot,
+) -> Tuple['AbstractRevision', bool]:
+    revision = get_context_class().get_revision() or batch.revision
+    if revision is not None:
+        return cast('AbstractRevision', revision), False
+    revision = get_revision_model()()
+    revision.set_description(context_snapshot.revision_description)
+    revision.save(using=get_audit_database())
+    batch.revision = revision
+    return revision, True
+
+
+def _insert_rows(
+    model: Type[Model],
+    instances: Sequence[Model],
+    using: str,
+) -> None:
+    options = cast(Options, model._meta)  # noqa
+    for parent, parent_link in options.parents.items():
+        _insert_rows(parent, instances, using)
+        if parent_link is None:
+            continue
+        parent_pk_attname = cast(Options, parent._meta).pk.attname  # noqa
+        for instance in instances:
+            setattr(instance, parent_link.attname, getattr(instance, parent_pk_attname))
+    pk = options.pk
+    has_pk = getattr(instances[0], pk.attname) is not None
+    fields = [
+        field
+        for field in options.local_concrete_fields
+        if not field.generated and (has_pk or field is not pk)
+    ]
+    manager = model._base_manager
+    batch_size = max(connections[using].ops.bulk_batch_size(fields, instances), 1)
+    for start in range(0, len(instances), batch_size):
+        chunk = instances[start:start + batch_size]
+        if has_pk:
+            manager._insert(chunk, fields=fields, using=using)  # type: ignore[attr-defined]
+            continue
+        returning_fields = options.db_returning_fields
+        rows = manager._insert(  # type: ignore[attr-defined]
+            chunk,
+            fields=fields,
+            returning_fields=returning_fields,
+            using=using,
+        )
+        for instance, row in zip(chunk, rows):
+            for field, value in zip(returning_fields, row):
+                setattr(instance, field.attname, value)
+
+
+def bulk_insert(
+    model: Type[Model],
+    instances: Sequence[Model],
+    using: str,
+) -> None:
+    if not instances:
+        return
+    if not connections[using].features.can_return_rows_from_bulk_insert:
+        for instance in instances:
+            instance.save(force_insert=True, using=using)
+        return
+    _insert_rows(model, instances, using)
+    for instance in instances:
+        instance._state.adding = False
+        instance._state.db = using
+
+
+def add_to_batch(
+    batch: Batch,
+    model: Type[Model],
+    object_delta: 'AbstractObjectDelta',
+    attribute_deltas: List['AbstractAttributeDelta'],
+) -> None:
+    if batch.flush_handler is None:
+        batch.flush_handler = flush_batch_entries
+    batch.add(
+        BatchEntry(
+            model=model,
+            object_delta=object_delta,
+            attribute_deltas=attribute_deltas,
+        ),
+        get_encoded_size(attribute_deltas) if batch.max_bytes is not None else 0,
+    )
+
+
+def flush_batch_entries(
+    batch: Batch,
+    entries: List[Any],
+) -> None:
+    batch_entries = cast(List[BatchEntry], entries)
+    context_snapshot = get_context_class().get_snapshot()
+    object_delta_class = get_object_delta_model()
+    using = get_audit_database()
+
+    with account_cost(context_snapshot.cost_account, using), transaction.atomic(using=using):
+
+        flush_started_at = time.perf_counter()
+
+        revision, is_revision_created = get_batch_revision(batch, context_snapshot)
+
+        object_deltas = [batch_entry.object_delta for batch_entry in batch_entries]
+        for object_delta in object_deltas:
+            object_delta.set_revision(revision)
+        bulk_insert(object_delta_class, object_deltas, using)
+
+        attribute_deltas: List['AbstractAttributeDelta'] = []
+        for batch_entry in batch_entries:
+            for attribute_delta in batch_entry.attribute_deltas:
+                attribute_delta.set_revision(revision)
+                attribute_delta.set_object_delta(batch_entry.object_delta)
+                attribute_deltas.append(attribute_delta)
+        bulk_insert(get_attribute_delta_model(), attribute_deltas, using)
+
+        if settings.METRICS:
+            flush_duration = (time.perf_counter() - flush_started_at) / len(batch_entries)
+            for index, batch_entry in enumerate(batch_entries):
+                metrics.record_flush(
+                    batch_entry.model,
+                    'batch',
+                    is_revision_created and index == 0,
+                    batch_entry.attribute_deltas,
+                    flush_duration,
+                )
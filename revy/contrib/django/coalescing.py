@@ -0,0 +1,198 @@
+import dataclasses
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    Tuple,
+    cast,
+)
+
+from django.db.models import Model
+from django.db.models.options import Options
+
+
+if TYPE_CHECKING:
+    from revy.contrib.django.models import (
+        AbstractAttributeDelta,
+        AbstractObjectDelta,
+        AbstractRevision,
+    )
+
+
+__all__ = (
+    'COALESCED_OBJECT_DELTAS_ATTNAME',
+    'CoalescedObjectDelta',
+    'get_object_key',
+    'get_coalesced_object_deltas',
+    'prune_coalesced_object_delta',
+    'get_coalesced_object_delta',
+    'add_coalesced_object_delta',
+    'discard_coalesced_object_delta',
+    'get_old_values',
+    'merge_attribute_deltas',
+    'replace_attribute_delta',
+    'update_coalesced_object_delta',
+)
+
+
+COALESCED_OBJECT_DELTAS_ATTNAME = '__revy__coalesced_object_deltas'
+
+
+@dataclasses.dataclass()
+class CoalescedObjectDelta:
+
+    object_delta: 'AbstractObjectDelta' = dataclasses.field(
+        kw_only=True,
+    )
+
+    attribute_deltas: Dict[str, 'AbstractAttributeDelta'] = dataclasses.field(
+        kw_only=True,
+        default_factory=dict,
+    )
+
+    old_values: Dict[str, Any] = dataclasses.field(
+        kw_only=True,
+        default_factory=dict,
+    )
+
+
+def get_object_key(
+    instance: Model,
+) -> Tuple[Hashable, str]:
+    return cast(Options, instance._meta).concrete_model, str(instance.pk)  # noqa
+
+
+def get_coalesced_object_deltas(
+    revision: 'AbstractRevision',
+) -> Dict[Tuple[Hashable, str], CoalescedObjectDelta]:
+    return revision.__dict__.setdefault(COALESCED_OBJECT_DELTAS_ATTNAME, {})
+
+
+def prune_coalesced_object_delta(
+    coalesced_object_delta: CoalescedObjectDelta,
+    using: str,
+) -> bool:
+    attribute_deltas = coalesced_object_delta.attribute_deltas
+    if attribute_deltas:
+        attribute_delta_class = next(iter(attribute_deltas.values())).__class__
+        written_pks = set(
+            attribute_delta_class._base_manager.using(using).filter(
+                pk__in=[attribute_delta.pk for attribute_delta in attribute_deltas.values()],
+            ).values_list('pk', flat=True)
+        )
+        for attribute_name, attribute_delta in list(attribute_deltas.items()):
+            if attribute_delta.pk not in written_pks:
+                del attribute_deltas[attribute_name]
+                coalesced_object_delta.old_values.pop(attribute_name, None)
+        if attribute_deltas:
+            return True
+    object_delta = coalesced_object_delta.object_delta
+    return object_delta.__class__._base_manager.using(using).filter(pk=object_delta.pk).exists()
+
+
+def get_coalesced_object_delta(
+    revision: 'AbstractRevision',
+    object_key: Tuple[Hashable, str],
+    using: str,
+) -> Optional[CoalescedObjectDelta]:
+    coalesced_object_delta = get_coalesced_object_deltas(revision).get(object_key)
+    if coalesced_object_delta is not None and not prune_coalesced_object_delta(coalesced_object_delta, using):
+        discard_coalesced_object_delta(revision, object_key)
+        return None
+    return coalesced_object_delta
+
+
+def add_coalesced_object_delta(
+    revision: 'AbstractRevision',
+    object_key: Tuple[Hashable, str],
+    object_delta: 'AbstractObjectDelta',
+) -> CoalescedObjectDelta:
+    coalesced_object_delta = CoalescedObjectDelta(object_delta=object_delta)
+    get_coalesced_object_deltas(revision)[object_key] = coalesced_object_delta
+    return coalesced_object_delta
+
+
+def discard_coalesced_object_delta(
+    revision: 'AbstractRevision',
+    object_key: Tuple[Hashable, str],
+) -> None:
+    get_coalesced_object_deltas(revision).pop(object_key, None)
+
+
+def get_old_values(
+    attribute_deltas: List['AbstractAttributeDelta'],
+) -> Dict[str, Any]:
+    old_values: Dict[str, Any] = {}
+    for attribute_delta in attribute_deltas:
+        old_values.setdefault(
+            attribute_delta.get_attribute_name(),
+            getattr(attribute_delta, attribute_delta.__class__.OLD_VALUE_FIELD_NAME),
+        )
+    return old_values
+
+
+def merge_attribute_deltas(
+    coalesced_object_delta: CoalescedObjectDelta,
+    attribute_deltas: List['AbstractAttributeDelta'],
+) -> Dict[int, 'AbstractAttributeDelta']:
+    replaced_attribute_deltas: Dict[int, 'AbstractAttributeDelta'] = {}
+    merged_attribute_names: Set[str] = set()
+    for attribute_delta in attribute_deltas:
+        attribute_name = attribute_delta.get_attribute_name()
+        if attribute_name in merged_attribute_names:
+            continue
+        merged_attribute_names.add(attribute_name)
+        previous_attribute_delta = coalesced_object_delta.attribute_deltas.get(attribute_name)
+        if previous_attribute_delta is None:
+            continue
+        attribute_delta.set_old_value(coalesced_object_delta.old_values[attribute_name])
+        replaced_attribute_deltas[id(attribute_delta)] = previous_attribute_delta
+    return replaced_attribute_deltas
+
+
+def replace_attribute_delta(
+    previous_attribute_delta: 'AbstractAttributeDelta',
+    attribute_delta: 'AbstractAttributeDelta',
+) -> 'AbstractAttributeDelta':
+    from revy.contrib.django.querysets import get_generic_attnames
+
+    attribute_delta_class = attribute_delta.__class__
+    field_names = [
+        attribute_delta_class.ACTION_FIELD_NAME,
+        attribute_delta_class.DESCRIPTION_FIELD_NAME,
+        attribute_delta_class.OLD_VALUE_FIELD_NAME,
+        attribute_delta_class.NEW_VALUE_FIELD_NAME,
+    ]
+    for field_name in field_names:
+        setattr(previous_attribute_delta, field_name, getattr(attribute_delta, field_name))
+    previous_attribute_delta.set_actor(attribute_delta.get_actor())
+    previous_attribute_delta.save(update_fields=[
+        *field_names,
+        *get_generic_attnames(attribute_delta_class, attribute_delta_class.ACTOR_FIELD_NAME),
+        attribute_delta_class.UPDATED_AT_FIELD_NAME,
+    ])
+    return previous_attribute_delta
+
+
+def update_coalesced_object_delta(
+    revision: 'AbstractRevision',
+    object_key: Tuple[Hashable, str],
+    object_delta: 'AbstractObjectDelta',
+    attribute_deltas: List['AbstractAttributeDelta'],
+    replaced_attribute_deltas: Dict[int, 'AbstractAttributeDelta'],
+    old_values: Dict[str, Any],
+) -> None:
+    coalesced_object_delta = get_coalesced_object_deltas(revision).get(object_key)
+    if coalesced_object_delta is None:
+        coalesced_object_delta = add_coalesced_object_delta(revision, object_key, object_delta)
+    for attribute_name, old_value in old_values.items():
+        coalesced_object_delta.old_values.setdefault(attribute_name, old_value)
+    for attribute_delta in attribute_deltas:
+        coalesced_object_delta.attribute_deltas[attribute_delta.get_attribute_name()] = replaced_attribute_deltas.get(
+            id(attribute_delta),
+            attribute_delta,
+        )
@@ -1,4 +1,8 @@
-from typing import Sequence
+from typing import (
+    Mapping,
+    Optional,
+    Sequence,
+)
 
 from django.conf import settings
 
@@ -34,6 +38,42 @@ __all__ = (
     'CONTEXT_CLASS_ATTNAME',
     'DEFAULT_CONTEXT_CLASS',
     'CONTEXT_CLASS',
+    'METRICS_ATTNAME',
+    'DEFAULT_METRICS',
+    'METRICS',
+    'MODEL_FIELDS_ATTNAME',
+    'DEFAULT_MODEL_FIELDS',
+    'MODEL_FIELDS',
+    'FIELD_TYPE_POLICIES_ATTNAME',
+    'DEFAULT_FIELD_TYPE_POLICIES',
+    'FIELD_TYPE_POLICIES',
+    'VALUE_STORE_ATTNAME',
+    'DEFAULT_VALUE_STORE',
+    'VALUE_STORE',
+    'VALUE_STORE_THRESHOLD_ATTNAME',
+    'DEFAULT_VALUE_STORE_THRESHOLD',
+    'VALUE_STORE_THRESHOLD',
+    'DIFF_KEYFRAME_INTERVAL_ATTNAME',
+    'DEFAULT_DIFF_KEYFRAME_INTERVAL',
+    'DIFF_KEYFRAME_INTERVAL',
+    'OLD_VALUES_ATTNAME',
+    'DEFAULT_OLD_VALUES',
+    'OLD_VALUES',
+    'ADMIN_COUNT_LIMIT_ATTNAME',
+    'DEFAULT_ADMIN_COUNT_LIMIT',
+    'ADMIN_COUNT_LIMIT',
+    'LAZY_PATCHING_ATTNAME',
+    'DEFAULT_LAZY_PATCHING',
+    'LAZY_PATCHING',
+    'STORAGE_ATTNAME',
+    'DEFAULT_STORAGE',
+    'STORAGE',
+    'DATABASE_ATTNAME',
+    'DEFAULT_DATABASE',
+    'DATABASE',
+    'METRICS_ENCODED_BYTES_ATTNAME',
+    'DEFAULT_METRICS_ENCODED_BYTES',
+    'METRICS_ENCODED_BYTES',
 )
 
 
@@ -100,6 +140,90 @@ DEFAULT_CONTEXT_CLASS = 'revy.Context'
 CONTEXT_CLASS: str
 
 
+METRICS_ATTNAME = 'REVY_METRICS'
+
+DEFAULT_METRICS = False
+
+METRICS: bool
+
+
+MODEL_FIELDS_ATTNAME = 'REVY_MODEL_FIELDS'
+
+DEFAULT_MODEL_FIELDS: Mapping[str, Mapping[str, Sequence[str]]] = {}
+
+MODEL_FIELDS: Mapping[str, Mapping[str, Sequence[str]]]
+
+
+FIELD_TYPE_POLICIES_ATTNAME = 'REVY_FIELD_TYPE_POLICIES'
+
+DEFAULT_FIELD_TYPE_POLICIES: Mapping[str, bool] = {}
+
+FIELD_TYPE_POLICIES: Mapping[str, bool]
+
+
+VALUE_STORE_ATTNAME = 'REVY_VALUE_STORE'
+
+DEFAULT_VALUE_STORE = False
+
+VALUE_STORE: bool
+
+
+VALUE_STORE_THRESHOLD_ATTNAME = 'REVY_VALUE_STORE_THRESHOLD'
+
+DEFAULT_VALUE_STORE_THRESHOLD = 1024
+
+VALUE_STORE_THRESHOLD: int
+
+
+DIFF_KEYFRAME_INTERVAL_ATTNAME = 'REVY_DIFF_KEYFRAME_INTERVAL'
+
+DEFAULT_DIFF_KEYFRAME_INTERVAL = 16
+
+DIFF_KEYFRAME_INTERVAL: int
+
+
+OLD_VALUES_ATTNAME = 'REVY_OLD_VALUES'
+
+DEFAULT_OLD_VALUES = 'always'
+
+OLD_VALUES: str
+
+
+ADMIN_COUNT_LIMIT_ATTNAME = 'REVY_ADMIN_COUNT_LIMIT'
+
+DEFAULT_ADMIN_COUNT_LIMIT = 1000
+
+ADMIN_COUNT_LIMIT: int
+
+
+LAZY_PATCHING_ATTNAME = 'REVY_LAZY_PATCHING'
+
+DEFAULT_LAZY_PATCHING = False
+
+LAZY_PATCHING: bool
+
+
+STORAGE_ATTNAME = 'REVY_STORAGE'
+
+DEFAULT_STORAGE = 'revy.storages.ASGIRefLocalStorage'
+
+STORAGE: str
+
+
+DATABASE_ATTNAME = 'REVY_DATABASE'
+
+DEFAULT_DATABASE = None
+
+DATABASE: Optional[str]
+
+
+METRICS_ENCODED_BYTES_ATTNAME = 'REVY_METRICS_ENCODED_BYTES'
+
+DEFAULT_METRICS_ENCODED_BYTES = False
+
+METRICS_ENCODED_BYTES: bool
+
+
 def reload() -> None:
     global MODELS
     MODELS = getattr(
@@ -182,5 +306,113 @@ def reload() -> None:
     if not hasattr(settings, CONTEXT_CLASS_ATTNAME):
         setattr(settings, CONTEXT_CLASS_ATTNAME, CONTEXT_CLASS)
 
+    global METRICS
+    METRICS = getattr(
+        settings,
+        METRICS_ATTNAME,
+        DEFAULT_METRICS,
+    )
+    if not hasattr(settings, METRICS_ATTNAME):
+        setattr(settings, METRICS_ATTNAME, METRICS)
+
+    global MODEL_FIELDS
+    MODEL_FIELDS = getattr(
+        settings,
+        MODEL_FIELDS_ATTNAME,
+        None,
+    ) or DEFAULT_MODEL_FIELDS
+    if not hasattr(settings, MODEL_FIELDS_ATTNAME):
+        setattr(settings, MODEL_FIELDS_ATTNAME, MODEL_FIELDS)
+
+    global FIELD_TYPE_POLICIES
+    FIELD_TYPE_POLICIES = getattr(
+        settings,
+        FIELD_TYPE_POLICIES_ATTNAME,
+        None,
+    ) or DEFAULT_FIELD_TYPE_POLICIES
+    if not hasattr(settings, FIELD_TYPE_POLICIES_ATTNAME):
+        setattr(settings, FIELD_TYPE_POLICIES_ATTNAME, FIELD_TYPE_POLICIES)
+
+    global VALUE_STORE
+    VALUE_STORE = getattr(
+        settings,
+        VALUE_STORE_ATTNAME,
+        DEFAULT_VALUE_STORE,
+    )
+    if not hasattr(settings, VALUE_STORE_ATTNAME):
+        setattr(settings, VALUE_STORE_ATTNAME, VALUE_STORE)
+
+    global VALUE_STORE_THRESHOLD
+    VALUE_STORE_THRESHOLD = getattr(
+        settings,
+        VALUE_STORE_THRESHOLD_ATTNAME,
+        DEFAULT_VALUE_STORE_THRESHOLD,
+    )
+    if not hasattr(settings, VALUE_STORE_THRESHOLD_ATTNAME):
+        setattr(settings, VALUE_STORE_THRESHOLD_ATTNAME, VALUE_STORE_THRESHOLD)
+
+    global DIFF_KEYFRAME_INTERVAL
+    DIFF_KEYFRAME_INTERVAL = getattr(
+        settings,
+        DIFF_KEYFRAME_INTERVAL_ATTNAME,
+        DEFAULT_DIFF_KEYFRAME_INTERVAL,
+    )
+    if not hasattr(settings, DIFF_KEYFRAME_INTERVAL_ATTNAME):
+        setattr(settings, DIFF_KEYFRAME_INTERVAL_ATTNAME, DIFF_KEYFRAME_INTERVAL)
+
+    global OLD_VALUES
+    OLD_VALUES = getattr(
+        settings,
+        OLD_VALUES_ATTNAME,
+        DEFAULT_OLD_VALUES,
+    )
+    if not hasattr(settings, OLD_VALUES_ATTNAME):
+        setattr(settings, OLD_VALUES_ATTNAME, OLD_VALUES)
+
+    global ADMIN_COUNT_LIMIT
+    ADMIN_COUNT_LIMIT = getattr(
+        settings,
+        ADMIN_COUNT_LIMIT_ATTNAME,
+        DEFAULT_ADMIN_COUNT_LIMIT,
+    )
+    if not hasattr(settings, ADMIN_COUNT_LIMIT_ATTNAME):
+        setattr(settings, ADMIN_COUNT_LIMIT_ATTNAME, ADMIN_COUNT_LIMIT)
+
+    global LAZY_PATCHING
+    LAZY_PATCHING = getattr(
+        settings,
+        LAZY_PATCHING_ATTNAME,
+        DEFAULT_LAZY_PATCHING,
+    )
+    if not hasattr(settings, LAZY_PATCHING_ATTNAME):
+        setattr(settings, LAZY_PATCHING_ATTNAME, LAZY_PATCHING)
+
+    global STORAGE
+    STORAGE = getattr(
+        settings,
+        STORAGE_ATTNAME,
+        DEFAULT_STORAGE,
+    )
+    if not hasattr(settings, STORAGE_ATTNAME):
+        setattr(settings, STORAGE_ATTNAME, STORAGE)
+
+    global DATABASE
+    DATABASE = getattr(
+        settings,
+        DATABASE_ATTNAME,
+        DEFAULT_DATABASE,
+    )
+    if not hasattr(settings, DATABASE_ATTNAME):
+        setattr(settings, DATABASE_ATTNAME, DATABASE)
+
+    global METRICS_ENCODED_BYTES
+    METRICS_ENCODED_BYTES = getattr(
+        settings,
+        METRICS_ENCODED_BYTES_ATTNAME,
+        DEFAULT_METRICS_ENCODED_BYTES,
+    )
+    if not hasattr(settings, METRICS_ENCODED_BYTES_ATTNAME):
+        setattr(settings, METRICS_ENCODED_BYTES_ATTNAME, METRICS_ENCODED_BYTES)
+
 
 reload()
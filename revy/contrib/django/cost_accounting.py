@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+)
+
+from django.db import connections
+
+from revy.cost_account import CostAccount
+
+
+__all__ = (
+    'account_cost',
+)
+
+
+@contextmanager
+def account_cost(
+    cost_account: Optional[CostAccount],
+    using: str,
+) -> Iterator[None]:
+    if cost_account is None:
+        yield
+        return
+
+    statements = 0
+    rows = 0
+
+    def execute_wrapper(
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        nonlocal statements, rows
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            statements += 1
+            rows += max(getattr(context.get('cursor'), 'rowcount', 0) or 0, 0)
+
+    started_at = time.perf_counter()
+    try:
+        with connections[using].execute_wrapper(execute_wrapper):
+            yield
+    finally:
+        cost_account.add(
+            statements=statements,
+            rows=rows,
+            duration=time.perf_counter() - started_at,
+        )
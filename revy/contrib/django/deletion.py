@@ -18,6 +18,7 @@ from django.db.models.deletion import (
 )
 from django.db.models.fields.related import RelatedField
 
+from revy.contrib.django import metrics
 from revy.contrib.django.conf import settings
 from revy.contrib.django.utils import get_context_class
 
@@ -51,6 +52,7 @@ def CASCADE(  # noqa
     if Context.is_disabled():
         return _CASCADE(collector, field, sub_objects, using)
 
+    fan_out = 0
     with Context.via_actor(None):
         sub_object_iterator = _get_sub_object_iterator(sub_objects)
         for sub_object in sub_object_iterator:
@@ -58,6 +60,9 @@ def CASCADE(  # noqa
                 Context.get_deletion_description(),
             ):
                 sub_object.delete(using=using)
+            fan_out += 1
+    if settings.METRICS:
+        metrics.record_cascade(field.model, 'CASCADE', fan_out)
 
 
 def SET(  # noqa
@@ -81,6 +86,7 @@ def SET(  # noqa
         if callable(new_value):
             new_value = new_value()
 
+        fan_out = 0
         with Context.via_actor(None):
             sub_object_iterator = _get_sub_object_iterator(sub_objects)
             for sub_object in sub_object_iterator:
@@ -89,6 +95,9 @@ def SET(  # noqa
                 ):
                     setattr(sub_object, field.attname, new_value)
                 sub_object.save(using=using)
+                fan_out += 1
+        if settings.METRICS:
+            metrics.record_cascade(field.model, 'SET', fan_out)
 
     setattr(
         set_on_delete,
@@ -109,6 +118,7 @@ def SET_NULL(  # noqa
     if Context.is_disabled():
         return _SET_NULL(collector, field, sub_objects, using)
 
+    fan_out = 0
     with Context.via_actor(None):
         sub_object_iterator = _get_sub_object_iterator(sub_objects)
         for sub_object in sub_object_iterator:
@@ -117,6 +127,9 @@ def SET_NULL(  # noqa
             ):
                 setattr(sub_object, field.attname, None)
             sub_object.save(using=using)
+            fan_out += 1
+    if settings.METRICS:
+        metrics.record_cascade(field.model, 'SET_NULL', fan_out)
 
 
 def SET_DEFAULT(  # noqa
@@ -129,6 +142,7 @@ def SET_DEFAULT(  # noqa
     if Context.is_disabled():
         return _SET_DEFAULT(collector, field, sub_objects, using)
 
+    fan_out = 0
     with Context.via_actor(None):
         sub_object_iterator = _get_sub_object_iterator(sub_objects)
         for sub_object in sub_object_iterator:
@@ -137,3 +151,6 @@ def SET_DEFAULT(  # noqa
             ):
                 setattr(sub_object, field.attname, field.get_default())
             sub_object.save(using=using)
+            fan_out += 1
+    if settings.METRICS:
+        metrics.record_cascade(field.model, 'SET_DEFAULT', fan_out)
@@ -0,0 +1,292 @@
+from collections import OrderedDict
+import difflib
+import json
+import threading
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+)
+
+from django.db.models import Model
+
+from revy.contrib.django import values
+from revy.contrib.django.conf import settings
+from revy.contrib.django.utils import get_attribute_delta_model
+
+
+if TYPE_CHECKING:
+    from revy.contrib.django.models import AbstractAttributeDelta
+
+
+__all__ = (
+    'DIFF_KEY',
+    'is_diff',
+    'diff_texts',
+    'patch_text',
+    'encode_attribute_delta',
+    'resolve',
+    'resolve_attribute_delta_value',
+    'resolve_object_value',
+)
+
+
+DIFF_KEY = '__revy__diff__'
+
+UNIT_LINE = 'l'
+
+UNIT_CHARACTER = 'c'
+
+TEXT_CACHE_SIZE = 256
+
+
+Operation = Tuple[int, int, str]
+
+
+_text_cache: 'OrderedDict[str, str]' = OrderedDict()
+
+_text_cache_lock = threading.Lock()
+
+
+def _get_cached_text(
+    digest: str,
+) -> Optional[str]:
+    with _text_cache_lock:
+        text = _text_cache.get(digest)
+        if text is not None:
+            _text_cache.move_to_end(digest)
+        return text
+
+
+def _cache_text(
+    digest: str,
+    text: str,
+) -> None:
+    with _text_cache_lock:
+        _text_cache[digest] = text
+        _text_cache.move_to_end(digest)
+        while len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+
+
+def _get_text_digest(
+    text: str,
+) -> str:
+    return values.get_digest(text.encode())
+
+
+def is_diff(
+    value: Any,
+) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(DIFF_KEY), dict)
+
+
+def _tokenize(
+    text: str,
+    unit: str,
+) -> Sequence[str]:
+    if unit == UNIT_LINE:
+        return text.splitlines(keepends=True)
+    return text
+
+
+def diff_texts(
+    old_text: str,
+    new_text: str,
+) -> Tuple[str, List[Operation]]:
+    unit = UNIT_LINE if '\n' in old_text or '\n' in new_text else UNIT_CHARACTER
+    old_tokens = _tokenize(old_text, unit)
+    new_tokens = _tokenize(new_text, unit)
+    sequence_matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    operations = [
+        (i1, i2, ''.join(new_tokens[j1:j2]))
+        for tag, i1, i2, j1, j2 in sequence_matcher.get_opcodes()
+        if tag != 'equal'
+    ]
+    return unit, operations
+
+
+def patch_text(
+    text: str,
+    unit: str,
+    operations: Sequence[Sequence[Any]],
+) -> str:
+    tokens = _tokenize(text, unit)
+    parts: List[str] = []
+    position = 0
+    for start, end, replacement in operations:
+        parts.append(''.join(tokens[position:start]))
+        parts.append(replacement)
+        position = end
+    parts.append(''.join(tokens[position:]))
+    return ''.join(parts)
+
+
+def _get_previous_new_value(
+    attribute_delta: 'AbstractAttributeDelta',
+) -> Any:
+    from revy.contrib.django.aggregates import ObjectSnapshot
+
+    attribute_delta_class = attribute_delta.__class__
+    ct_field, fk_field = ObjectSnapshot.get_ct_fk_fields(attribute_delta_class)
+    previous_new_value = attribute_delta_class._default_manager.filter(
+        **{
+            ct_field.attname: getattr(attribute_delta, ct_field.attname),
+            fk_field.attname: getattr(attribute_delta, fk_field.attname),
+            attribute_delta_class.ATTRIBUTE_NAME_FIELD_NAME: attribute_delta.get_attribute_name(),
+        },
+    ).order_by(
+        '-pk',
+    ).values_list(
+        attribute_delta_class.NEW_VALUE_FIELD_NAME,
+        flat=True,
+    ).first()
+    return values.decode_value(previous_new_value)
+
+
+def encode_attribute_delta(
+    attribute_delta: 'AbstractAttributeDelta',
+) -> None:
+    attribute_delta_class = attribute_delta.__class__
+    old_text = getattr(attribute_delta, attribute_delta_class.OLD_VALUE_FIELD_NAME)
+    new_text = getattr(attribute_delta, attribute_delta_class.NEW_VALUE_FIELD_NAME)
+    if not isinstance(old_text, str) or not isinstance(new_text, str):
+        return
+
+    previous_new_value = _get_previous_new_value(attribute_delta)
+    if is_diff(previous_new_value):
+        previous_depth = previous_new_value[DIFF_KEY]['depth']
+        previous_digest = previous_new_value[DIFF_KEY]['digest']
+    elif isinstance(previous_new_value, str):
+        previous_depth = 0
+        previous_digest = _get_text_digest(previous_new_value)
+    else:
+        return
+
+    old_digest = _get_text_digest(old_text)
+    if previous_digest != old_digest:
+        return
+    _cache_text(old_digest, old_text)
+    setattr(
+        attribute_delta,
+        attribute_delta_class.OLD_VALUE_FIELD_NAME,
+        {DIFF_KEY: {'digest': old_digest}},
+    )
+
+    new_digest = _get_text_digest(new_text)
+    _cache_text(new_digest, new_text)
+    depth = previous_depth + 1
+    if depth >= settings.DIFF_KEYFRAME_INTERVAL:
+        return
+    unit, operations = diff_texts(old_text, new_text)
+    record = {
+        'digest': new_digest,
+        'depth': depth,
+        'unit': unit,
+        'ops': operations,
+    }
+    if len(json.dumps(record)) >= len(json.dumps(new_text)):
+        return
+    setattr(
+        attribute_delta,
+        attribute_delta_class.NEW_VALUE_FIELD_NAME,
+        {DIFF_KEY: record},
+    )
+
+
+def resolve(
+    rows: Any,
+    record: Dict[str, Any],
+) -> str:
+    target_digest = record['digest']
+    text = _get_cached_text(target_digest)
+    if text is not None:
+        return text
+    chain: List[Dict[str, Any]] = []
+    base_text: Optional[str] = None
+    for row in rows:
+        value = values.decode_value(row)
+        if is_diff(value):
+            if not chain and value[DIFF_KEY]['digest'] != target_digest:
+                continue
+            chain.append(value[DIFF_KEY])
+            cached_text = _get_cached_text(value[DIFF_KEY]['digest'])
+            if cached_text is not None:
+                chain.pop()
+                base_text = cached_text
+                break
+            continue
+        if not isinstance(value, str):
+            continue
+        if not chain and _get_text_digest(value) != target_digest:
+            continue
+        base_text = value
+        break
+    if base_text is None:
+        raise LookupError(f"The text with the digest '{target_digest}' could not be reconstructed.")
+    text = base_text
+    for diff in reversed(chain):
+        text = patch_text(text, diff['unit'], diff['ops'])
+        _cache_text(diff['digest'], text)
+    _cache_text(target_digest, text)
+    return text
+
+
+def resolve_attribute_delta_value(
+    attribute_delta: 'AbstractAttributeDelta',
+    value: Any,
+) -> Any:
+    from revy.contrib.django.aggregates import ObjectSnapshot
+
+    if not is_diff(value):
+        return value
+    attribute_delta_class = attribute_delta.__class__
+    ct_field, fk_field = ObjectSnapshot.get_ct_fk_fields(attribute_delta_class)
+    rows = attribute_delta_class._default_manager.filter(
+        **{
+            ct_field.attname: getattr(attribute_delta, ct_field.attname),
+            fk_field.attname: getattr(attribute_delta, fk_field.attname),
+            attribute_delta_class.ATTRIBUTE_NAME_FIELD_NAME: attribute_delta.get_attribute_name(),
+            'pk__lte': attribute_delta.pk,
+        },
+    ).order_by(
+        '-pk',
+    ).values_list(
+        attribute_delta_class.NEW_VALUE_FIELD_NAME,
+        flat=True,
+    )
+    return resolve(rows.iterator(), value[DIFF_KEY])
+
+
+def resolve_object_value(
+    model: Type[Model],
+    pk: Any,
+    attname: str,
+    value: Any,
+) -> Any:
+    from django.contrib.contenttypes.models import ContentType
+
+    from revy.contrib.django.aggregates import ObjectSnapshot
+
+    if not is_diff(value):
+        return value
+    attribute_delta_class = get_attribute_delta_model()
+    ct_field, fk_field = ObjectSnapshot.get_ct_fk_fields(attribute_delta_class)
+    rows = attribute_delta_class._default_manager.filter(
+        **{
+            ct_field.attname: ContentType.objects.get_for_model(model).pk,
+            fk_field.attname: str(pk),
+            attribute_delta_class.ATTRIBUTE_NAME_FIELD_NAME: attname,
+        },
+    ).order_by(
+        '-pk',
+    ).values_list(
+        attribute_delta_class.NEW_VALUE_FIELD_NAME,
+        flat=True,
+    )
+    return resolve(rows.iterator(), value[DIFF_KEY])
@@ -0,0 +1,324 @@
+import datetime
+import decimal
+import functools
+from typing import (
+    Any,
+    Mapping,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+)
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import (
+    Field,
+    Model,
+)
+from django.utils.dateparse import (
+    parse_date,
+    parse_datetime,
+    parse_duration,
+    parse_time,
+)
+from django.utils.duration import duration_iso_string
+from django.utils.timezone import (
+    get_default_timezone,
+    is_aware,
+    is_naive,
+    make_aware,
+    make_naive,
+)
+
+from revy.contrib.django.policies import get_tracked_fields
+
+
+if TYPE_CHECKING:
+    from revy.contrib.django.models import AbstractAttributeDelta
+
+
+__all__ = (
+    'Codec',
+    'DecimalCodec',
+    'DateTimeCodec',
+    'DateCodec',
+    'TimeCodec',
+    'DurationCodec',
+    'UUIDCodec',
+    'IDENTITY_CODEC',
+    'FIELD_CODECS',
+    'get_field_codec',
+    'get_field_codecs',
+    'is_value_changed',
+    'encode_attribute_delta',
+    'decode_attribute_delta_value',
+    'clear_caches',
+)
+
+
+class Codec:
+
+    python_type: Optional[type] = None
+
+    def encode(
+        self,
+        value: Any,
+    ) -> Any:
+        return value
+
+    def decode(
+        self,
+        value: Any,
+    ) -> Any:
+        if value is None or self.python_type is None or isinstance(value, self.python_type):
+            return value
+        try:
+            return self.parse(value)
+        except (TypeError, ValueError, ArithmeticError):
+            return value
+
+    def parse(
+        self,
+        value: Any,
+    ) -> Any:
+        return value
+
+    def normalize(
+        self,
+        field: Field,
+        value: Any,
+    ) -> Any:
+        if value is None:
+            return value
+        try:
+            return field.to_python(value)
+        except (ValidationError, TypeError, ValueError, ArithmeticError):
+            return value
+
+
+class DecimalCodec(Codec):
+
+    python_type = decimal.Decimal
+
+    def encode(
+        self,
+        value: Any,
+    ) -> Any:
+        if type(value) is decimal.Decimal:
+            return str(value)
+        return value
+
+    def parse(
+        self,
+        value: Any,
+    ) -> Any:
+        if isinstance(value, float):
+            value = repr(value)
+        return decimal.Decimal(value)
+
+    def normalize(
+        self,
+        field: Field,
+        value: Any,
+    ) -> Any:
+        value = super(DecimalCodec, self).normalize(field, value)
+        decimal_places = getattr(field, 'decimal_places', None)
+        if not isinstance(value, decimal.Decimal) or decimal_places is None:
+            return value
+        try:
+            return value.quantize(decimal.Decimal(1).scaleb(-decimal_places))
+        except decimal.InvalidOperation:
+            return value
+
+
+class DateTimeCodec(Codec):
+
+    python_type = datetime.datetime
+
+    def encode(
+        self,
+        value: Any,
+    ) -> Any:
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        return value
+
+    def parse(
+        self,
+        value: Any,
+    ) -> Any:
+        return parse_datetime(value) or value
+
+    def normalize(
+        self,
+        field: Field,
+        value: Any,
+    ) -> Any:
+        value = super(DateTimeCodec, self).normalize(field, value)
+        if not isinstance(value, datetime.datetime):
+            return value
+        try:
+            if settings.USE_TZ and is_naive(value):
+                return make_aware(value, get_default_timezone())
+            if not settings.USE_TZ and is_aware(value):
+                return make_naive(value, get_default_timezone())
+        except ValueError:
+            return value
+        return value
+
+
+class DateCodec(Codec):
+
+    python_type = datetime.date
+
+    def encode(
+        self,
+        value: Any,
+    ) -> Any:
+        if isinstance(value, datetime.date):
+            return value.isoformat()
+        return value
+
+    def parse(
+        self,
+        value: Any,
+    ) -> Any:
+        return parse_date(value) or value
+
+
+class TimeCodec(Codec):
+
+    python_type = datetime.time
+
+    def encode(
+        self,
+        value: Any,
+    ) -> Any:
+        if isinstance(value, datetime.time):
+            return value.isoformat()
+        return value
+
+    def parse(
+        self,
+        value: Any,
+    ) -> Any:
+        return parse_time(value) or value
+
+
+class DurationCodec(Codec):
+
+    python_type = datetime.timedelta
+
+    def encode(
+        self,
+        value: Any,
+    ) -> Any:
+        if isinstance(value, datetime.timedelta):
+            return duration_iso_string(value)
+        return value
+
+    def parse(
+        self,
+        value: Any,
+    ) -> Any:
+        return parse_duration(value) or value
+
+
+class UUIDCodec(Codec):
+
+    python_type = uuid.UUID
+
+    def encode(
+        self,
+        value: Any,
+    ) -> Any:
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return value
+
+    def parse(
+        self,
+        value: Any,
+    ) -> Any:
+        return uuid.UUID(value)
+
+
+IDENTITY_CODEC = Codec()
+
+FIELD_CODECS: Tuple[Tuple[Type[Field], Codec], ...] = (
+    (models.DecimalField, DecimalCodec()),
+    (models.DateTimeField, DateTimeCodec()),
+    (models.DateField, DateCodec()),
+    (models.TimeField, TimeCodec()),
+    (models.DurationField, DurationCodec()),
+    (models.UUIDField, UUIDCodec()),
+)
+
+
+def get_field_codec(
+    field: Field,
+) -> Codec:
+    target_field = getattr(field, 'target_field', None) if field.is_relation else None
+    if target_field is not None:
+        return get_field_codec(target_field)
+    for field_class, codec in FIELD_CODECS:
+        if isinstance(field, field_class):
+            return codec
+    return IDENTITY_CODEC
+
+
+@functools.lru_cache(maxsize=None)
+def get_field_codecs(
+    model: Type[Model],
+) -> Mapping[str, Codec]:
+    return {
+        attname: get_field_codec(field)
+        for attname, field in get_tracked_fields(model).items()
+    }
+
+
+def is_value_changed(
+    field: Field,
+    codec: Codec,
+    old_value: Any,
+    new_value: Any,
+) -> bool:
+    if old_value == new_value:
+        return False
+    return bool(codec.normalize(field, old_value) != codec.normalize(field, new_value))
+
+
+def encode_attribute_delta(
+    attribute_delta: 'AbstractAttributeDelta',
+    codec: Codec,
+) -> None:
+    attribute_delta.set_old_value(codec.encode(getattr(attribute_delta, attribute_delta.__class__.OLD_VALUE_FIELD_NAME)))
+    attribute_delta.set_new_value(codec.encode(getattr(attribute_delta, attribute_delta.__class__.NEW_VALUE_FIELD_NAME)))
+
+
+def decode_attribute_delta_value(
+    attribute_delta: 'AbstractAttributeDelta',
+    value: Any,
+) -> Any:
+    from django.contrib.contenttypes.models import ContentType
+
+    from revy.contrib.django.old_values import get_object_attnames
+
+    if value is None:
+        return value
+    ct_attname, _ = get_object_attnames(attribute_delta.__class__)
+    content_type_id = getattr(attribute_delta, ct_attname)
+    if content_type_id is None:
+        return value
+    model = ContentType.objects.get_for_id(content_type_id).model_class()
+    if model is None:
+        return value
+    codec = get_field_codecs(model).get(attribute_delta.get_attribute_name(), IDENTITY_CODEC)
+    return codec.decode(value)
+
+
+def clear_caches() -> None:
+    get_field_codecs.cache_clear()
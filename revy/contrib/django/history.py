@@ -0,0 +1,97 @@
+import dataclasses
+from typing import (
+    Any,
+    Generic,
+    List,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+from django.db.models import (
+    Model,
+    QuerySet,
+)
+
+from revy.contrib.django import old_values
+from revy.contrib.django.conf import settings
+from revy.contrib.django.querysets import DeltaQuerySet
+from revy.contrib.django.utils import (
+    get_attribute_delta_model,
+    get_object_delta_model,
+)
+
+
+__all__ = (
+    'DEFAULT_PAGE_SIZE',
+    'KeysetPage',
+    'paginate_keyset',
+    'object_history',
+)
+
+
+DEFAULT_PAGE_SIZE = 50
+
+
+ModelT = TypeVar('ModelT', bound=Model)
+
+
+@dataclasses.dataclass()
+class KeysetPage(Generic[ModelT]):
+
+    objects: List[ModelT] = dataclasses.field(
+        kw_only=True,
+    )
+
+    cursor: Optional[Any] = dataclasses.field(
+        kw_only=True,
+    )
+
+    next_cursor: Optional[Any] = dataclasses.field(
+        kw_only=True,
+    )
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def paginate_keyset(
+    queryset: 'QuerySet[ModelT]',
+    cursor: Optional[Any] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    descending: bool = False,
+) -> KeysetPage[ModelT]:
+    if page_size < 1:
+        raise ValueError('page_size must be a positive integer')
+    queryset = queryset.order_by('-pk' if descending else 'pk')
+    if cursor is not None:
+        queryset = queryset.filter(**{
+            'pk__lt' if descending else 'pk__gt': cursor,
+        })
+    objects = list(queryset[:page_size + 1])
+    next_cursor = objects[page_size - 1].pk if len(objects) > page_size else None
+    return KeysetPage(
+        objects=objects[:page_size],
+        cursor=cursor,
+        next_cursor=next_cursor,
+    )
+
+
+def object_history(
+    instance: Model,
+) -> DeltaQuerySet:
+    object_delta_class = get_object_delta_model()
+    attribute_deltas = get_attribute_delta_model()._default_manager.order_by('pk')
+    if settings.OLD_VALUES != old_values.MODE_ALWAYS:
+        attribute_deltas = old_values.annotate_previous_new_values(attribute_deltas)
+    object_deltas = cast(DeltaQuerySet, object_delta_class._default_manager.all())
+    return object_deltas.for_object(
+        instance,
+    ).select_related(
+        object_delta_class.REVISION_FIELD_NAME,
+    ).prefetch_attribute_deltas(
+        attribute_deltas,
+    ).order_by(
+        'pk',
+    )
@@ -0,0 +1,156 @@
+import dataclasses
+from typing import (
+    Callable,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from django.db.models import Model
+
+
+__all__ = (
+    'HookEvent',
+    'Hook',
+    'HookRegistry',
+    'hook_registry',
+)
+
+
+@dataclasses.dataclass(slots=True)
+class HookEvent:
+
+    OPERATION_INIT = '__init__'
+    OPERATION_SETATTR = '__setattr__'
+    OPERATION_SAVE_BASE = 'save_base'
+    OPERATION_REFRESH_FROM_DB = 'refresh_from_db'
+    OPERATION_DELETE = 'delete'
+
+    operation: str = dataclasses.field(
+        kw_only=True,
+    )
+
+    model: Type[Model] = dataclasses.field(
+        kw_only=True,
+    )
+
+    instance: Model = dataclasses.field(
+        kw_only=True,
+    )
+
+    delta_count: int = dataclasses.field(
+        kw_only=True,
+        default=0,
+    )
+
+    started_at: float = dataclasses.field(
+        kw_only=True,
+    )
+
+    duration: Optional[float] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    exception: Optional[BaseException] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+
+HookCallback = Callable[[HookEvent], None]
+
+
+@dataclasses.dataclass(frozen=True)
+class Hook:
+
+    callback: HookCallback = dataclasses.field()
+
+    operations: Optional[FrozenSet[str]] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    def accepts(
+        self,
+        operation: str,
+    ) -> bool:
+        return self.operations is None or operation in self.operations
+
+
+class HookRegistry:
+
+    _before_hooks: Tuple[Hook, ...]
+
+    _after_hooks: Tuple[Hook, ...]
+
+    def __init__(self) -> None:
+        self._before_hooks = ()
+        self._after_hooks = ()
+
+    def register_before(
+        self,
+        callback: HookCallback,
+        operations: Optional[Iterable[str]] = None,
+    ) -> None:
+        self._before_hooks += (self._create_hook(callback, operations),)
+        self.changed()
+
+    def register_after(
+        self,
+        callback: HookCallback,
+        operations: Optional[Iterable[str]] = None,
+    ) -> None:
+        self._after_hooks += (self._create_hook(callback, operations),)
+        self.changed()
+
+    def unregister(
+        self,
+        callback: HookCallback,
+    ) -> None:
+        self._before_hooks = tuple(hook for hook in self._before_hooks if hook.callback != callback)
+        self._after_hooks = tuple(hook for hook in self._after_hooks if hook.callback != callback)
+        self.changed()
+
+    def clear(self) -> None:
+        self._before_hooks = ()
+        self._after_hooks = ()
+        self.changed()
+
+    def get_before_callbacks(
+        self,
+        operation: str,
+    ) -> Tuple[HookCallback, ...]:
+        return tuple(hook.callback for hook in self._before_hooks if hook.accepts(operation))
+
+    def get_after_callbacks(
+        self,
+        operation: str,
+    ) -> Tuple[HookCallback, ...]:
+        return tuple(hook.callback for hook in self._after_hooks if hook.accepts(operation))
+
+    def has_callbacks(
+        self,
+        operation: str,
+    ) -> bool:
+        return bool(self.get_before_callbacks(operation) or self.get_after_callbacks(operation))
+
+    def changed(self) -> None:
+        from revy.contrib.django.setup import recompile
+        recompile()
+
+    @classmethod
+    def _create_hook(
+        cls,
+        callback: HookCallback,
+        operations: Optional[Iterable[str]],
+    ) -> Hook:
+        return Hook(
+            callback,
+            operations=frozenset(operations) if operations is not None else None,
+        )
+
+
+hook_registry = HookRegistry()
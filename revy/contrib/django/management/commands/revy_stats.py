@@ -0,0 +1,159 @@
+import argparse
+import datetime
+import json
+from typing import (
+    Any,
+    Optional,
+)
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import (
+    parse_date,
+    parse_datetime,
+)
+
+from revy.contrib.django.stats import (
+    BUCKET_SIZES,
+    HistoryStats,
+    collect_stats,
+)
+
+
+__all__ = (
+    'Command',
+)
+
+
+def _parse_since(
+    value: Optional[str],
+) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        if date is None:
+            raise CommandError(f"'{value}' is not a valid ISO 8601 date or datetime.")
+        since = datetime.datetime.combine(date, datetime.time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def _parse_positive_int(
+    value: str,
+) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not an integer.")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a positive integer.")
+    return number
+
+
+def _format_size(
+    size: Optional[float],
+) -> str:
+    if size is None:
+        return '-'
+    return f'{size:.1f}'
+
+
+class Command(BaseCommand):
+
+    help = 'Reports the size and the write rate of the revision history.'
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument(
+            '--since',
+            default=None,
+            help='Only consider deltas created at or after this ISO 8601 date or datetime.',
+        )
+        parser.add_argument(
+            '--bucket',
+            default='hour',
+            choices=tuple(BUCKET_SIZES.keys()),
+            help='Size of the time buckets used for the write rate.',
+        )
+        parser.add_argument(
+            '--buckets',
+            type=_parse_positive_int,
+            default=24,
+            help='Number of recent time buckets used for the write rate and the hottest objects.',
+        )
+        parser.add_argument(
+            '--top',
+            type=_parse_positive_int,
+            default=10,
+            help='Number of hottest objects to report.',
+        )
+        parser.add_argument(
+            '--format',
+            default='text',
+            choices=('text', 'json'),
+            help='Output format.',
+        )
+        parser.add_argument(
+            '--database',
+            default=None,
+            help='Database alias to read the revision history from. Defaults to the audit database.',
+        )
+
+    def handle(
+        self,
+        *args: Any,
+        **options: Any,
+    ) -> None:
+        stats = collect_stats(
+            since=_parse_since(options['since']),
+            bucket=options['bucket'],
+            buckets=options['buckets'],
+            hot_objects_limit=options['top'],
+            using=options['database'],
+        )
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(stats.to_dict(), cls=DjangoJSONEncoder, indent=2))
+            return
+        self.write_text(stats)
+
+    def write_text(
+        self,
+        stats: HistoryStats,
+    ) -> None:
+        self.stdout.write('Models')
+        for model_stats in stats.models:
+            self.stdout.write(
+                f'  {model_stats.model_label or "-"}: '
+                f'{model_stats.object_delta_count} object deltas, '
+                f'{model_stats.attribute_delta_count} attribute deltas',
+            )
+            for field_stats in model_stats.fields:
+                self.stdout.write(
+                    f'    {field_stats.field_name}: '
+                    f'{field_stats.attribute_delta_count} attribute deltas, '
+                    f'avg old value {_format_size(field_stats.average_old_value_size)} B, '
+                    f'avg new value {_format_size(field_stats.average_new_value_size)} B',
+                )
+        self.stdout.write(f'Write rate (per {stats.bucket})')
+        for bucket in stats.write_rate:
+            self.stdout.write(
+                f'  {bucket.started_at.isoformat()}: '
+                f'{bucket.object_delta_count} object deltas, '
+                f'{bucket.attribute_delta_count} attribute deltas',
+            )
+        self.stdout.write('Hottest objects')
+        for hot_object in stats.hot_objects:
+            self.stdout.write(
+                f'  {hot_object.model_label}#{hot_object.object_id}: '
+                f'{hot_object.object_delta_count} object deltas',
+            )
@@ -0,0 +1,435 @@
+import abc
+import bisect
+import json
+import math
+import threading
+import weakref
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    cast,
+)
+
+from django.db.models import Model
+from django.db.models.options import Options
+
+from revy.contrib.django.conf import settings
+from revy.contrib.django.utils import get_json_encoder_class
+
+
+__all__ = (
+    'DEFAULT_DURATION_BUCKETS',
+    'DEFAULT_SIZE_BUCKETS',
+    'Metric',
+    'Counter',
+    'Histogram',
+    'MetricsRegistry',
+    'metrics_registry',
+    'deltas_written',
+    'revisions_created',
+    'flush_duration',
+    'json_encoded_bytes',
+    'cascade_fan_out',
+    'writes_suppressed',
+    'record_flush',
+    'record_cascade',
+    'record_suppressed_write',
+)
+
+
+DEFAULT_DURATION_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+DEFAULT_SIZE_BUCKETS = (
+    1,
+    2,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label_value(
+    value: str,
+) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(
+    label_names: Sequence[str],
+    label_values: Sequence[str],
+) -> str:
+    if not label_names:
+        return ''
+    labels = ','.join(
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in zip(label_names, label_values)
+    )
+    return f'{{{labels}}}'
+
+
+def _format_value(
+    value: float,
+) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class _ShardOwner:
+
+    __slots__ = ('shard', '__weakref__')
+
+    shard: Dict[LabelValues, Any]
+
+    def __init__(
+        self,
+        shard: Dict[LabelValues, Any],
+    ) -> None:
+        self.shard = shard
+
+
+class Metric(abc.ABC):
+
+    TYPE = 'untyped'
+
+    name: str
+
+    documentation: str
+
+    label_names: Tuple[str, ...]
+
+    _local: threading.local
+
+    _lock: threading.Lock
+
+    _base_shard: Dict[LabelValues, Any]
+
+    _shards: List[Dict[LabelValues, Any]]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._base_shard = {}
+        self._shards = [self._base_shard]
+
+    def get_shard(self) -> Dict[LabelValues, Any]:
+        owner = getattr(self._local, 'owner', None)
+        if owner is None:
+            owner = _ShardOwner({})
+            self._local.owner = owner
+            with self._lock:
+                self._shards.append(owner.shard)
+            weakref.finalize(owner, self.retire_shard, owner.shard)
+        return owner.shard
+
+    def get_shards(self) -> List[Dict[LabelValues, Any]]:
+        with self._lock:
+            return [shard.copy() for shard in self._shards]
+
+    @abc.abstractmethod
+    def merge_value(
+        self,
+        value: Any,
+        other_value: Any,
+    ) -> Any:
+        ...
+
+    def retire_shard(
+        self,
+        shard: Dict[LabelValues, Any],
+    ) -> None:
+        with self._lock:
+            self._shards = [other_shard for other_shard in self._shards if other_shard is not shard]
+            for label_values, value in shard.items():
+                base_value = self._base_shard.get(label_values)
+                self._base_shard[label_values] = value if base_value is None else self.merge_value(base_value, value)
+
+    def reset(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def render(self) -> List[str]:
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.TYPE}',
+        ]
+
+
+class Counter(Metric):
+
+    TYPE = 'counter'
+
+    def inc(
+        self,
+        amount: float = 1,
+        *label_values: str,
+    ) -> None:
+        shard = self.get_shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def merge_value(
+        self,
+        value: float,
+        other_value: float,
+    ) -> float:
+        return value + other_value
+
+    def collect(self) -> Dict[LabelValues, float]:
+        values: Dict[LabelValues, float] = {}
+        for shard in self.get_shards():
+            for label_values, value in shard.items():
+                values[label_values] = values.get(label_values, 0) + value
+        return values
+
+    def get(
+        self,
+        *label_values: str,
+    ) -> float:
+        return self.collect().get(label_values, 0)
+
+    def render(self) -> List[str]:
+        lines = super(Counter, self).render()
+        for label_values, value in sorted(self.collect().items()):
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f'{self.name}{labels} {_format_value(value)}')
+        return lines
+
+
+class Histogram(Metric):
+
+    TYPE = 'histogram'
+
+    buckets: Tuple[float, ...]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_DURATION_BUCKETS,
+    ) -> None:
+        super(Histogram, self).__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(
+        self,
+        value: float,
+        *label_values: str,
+    ) -> None:
+        shard = self.get_shard()
+        observations = shard.get(label_values)
+        if observations is None:
+            observations = [0] * (len(self.buckets) + 3)
+            shard[label_values] = observations
+        observations[bisect.bisect_left(self.buckets, value)] += 1
+        observations[-2] += value
+        observations[-1] += 1
+
+    def merge_value(
+        self,
+        value: List[float],
+        other_value: List[float],
+    ) -> List[float]:
+        return [observation + other_observation for observation, other_observation in zip(value, other_value)]
+
+    def collect(self) -> Dict[LabelValues, List[float]]:
+        values: Dict[LabelValues, List[float]] = {}
+        for shard in self.get_shards():
+            for label_values, observations in shard.items():
+                if label_values not in values:
+                    values[label_values] = [0] * (len(self.buckets) + 3)
+                for index, observation in enumerate(list(observations)):
+                    values[label_values][index] += observation
+        return values
+
+    def get_count(
+        self,
+        *label_values: str,
+    ) -> int:
+        observations = self.collect().get(label_values)
+        return int(observations[-1]) if observations is not None else 0
+
+    def get_sum(
+        self,
+        *label_values: str,
+    ) -> float:
+        observations = self.collect().get(label_values)
+        return observations[-2] if observations is not None else 0
+
+    def render(self) -> List[str]:
+        lines = super(Histogram, self).render()
+        label_names = self.label_names + ('le',)
+        for label_values, observations in sorted(self.collect().items()):
+            cumulative_count: float = 0
+            for bucket, count in zip(self.buckets + (math.inf,), observations):
+                cumulative_count += count
+                labels = _format_labels(label_names, label_values + (_format_value(bucket),))
+                lines.append(f'{self.name}_bucket{labels} {_format_value(cumulative_count)}')
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f'{self.name}_sum{labels} {_format_value(observations[-2])}')
+            lines.append(f'{self.name}_count{labels} {_format_value(observations[-1])}')
+        return lines
+
+
+class MetricsRegistry:
+
+    _metrics: Dict[str, Metric]
+
+    def __init__(self) -> None:
+        self._metrics = {}
+
+    def register(
+        self,
+        metric: Metric,
+    ) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"A metric named '{metric.name}' is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(
+        self,
+        metric: Metric,
+    ) -> None:
+        self._metrics.pop(metric.name, None)
+
+    def get_metrics(self) -> List[Metric]:
+        return list(self._metrics.values())
+
+    def reset(self) -> None:
+        for metric in self.get_metrics():
+            metric.reset()
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.get_metrics():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+metrics_registry = MetricsRegistry()
+
+
+deltas_written = cast(Counter, metrics_registry.register(Counter(
+    'revy_deltas_written_total',
+    'Number of deltas written.',
+    label_names=('model', 'kind'),
+)))
+
+revisions_created = cast(Counter, metrics_registry.register(Counter(
+    'revy_revisions_created_total',
+    'Number of revisions created.',
+)))
+
+flush_duration = cast(Histogram, metrics_registry.register(Histogram(
+    'revy_flush_duration_seconds',
+    'Time spent writing the revision and the deltas of an operation.',
+    label_names=('model', 'operation'),
+)))
+
+json_encoded_bytes = cast(Counter, metrics_registry.register(Counter(
+    'revy_json_encoded_bytes_total',
+    'Number of bytes of JSON encoded for the old and new values of attribute deltas.',
+    label_names=('model',),
+)))
+
+cascade_fan_out = cast(Histogram, metrics_registry.register(Histogram(
+    'revy_cascade_fan_out',
+    'Number of related objects handled by a deletion handler.',
+    label_names=('model', 'handler'),
+    buckets=DEFAULT_SIZE_BUCKETS,
+)))
+
+writes_suppressed = cast(Counter, metrics_registry.register(Counter(
+    'revy_writes_suppressed_total',
+    'Number of saves that wrote no revision and no deltas because nothing changed.',
+    label_names=('model',),
+)))
+
+
+def _get_model_label(
+    model: Type[Model],
+) -> str:
+    return cast(Options, model._meta).label_lower  # noqa
+
+
+def record_flush(
+    model: Type[Model],
+    operation: str,
+    is_revision_created: bool,
+    attribute_deltas: Sequence[Any],
+    duration: float,
+) -> None:
+    from revy.contrib.django.models import AbstractAttributeDelta
+
+    model_label = _get_model_label(model)
+    if is_revision_created:
+        revisions_created.inc(1)
+    deltas_written.inc(1, model_label, 'object')
+    if attribute_deltas:
+        deltas_written.inc(len(attribute_deltas), model_label, 'attribute')
+    if attribute_deltas and settings.METRICS_ENCODED_BYTES:
+        json_encoder_class = get_json_encoder_class()
+        encoded_bytes = 0
+        for attribute_delta in attribute_deltas:
+            attribute_delta = cast(AbstractAttributeDelta, attribute_delta)
+            for field_name in (
+                attribute_delta.__class__.OLD_VALUE_FIELD_NAME,
+                attribute_delta.__class__.NEW_VALUE_FIELD_NAME,
+            ):
+                encoded_bytes += len(json.dumps(getattr(attribute_delta, field_name), cls=json_encoder_class))
+        json_encoded_bytes.inc(encoded_bytes, model_label)
+    flush_duration.observe(duration, model_label, operation)
+
+
+def record_cascade(
+    model: Type[Model],
+    handler: str,
+    fan_out: int,
+) -> None:
+    cascade_fan_out.observe(fan_out, _get_model_label(model), handler)
+
+
+def record_suppressed_write(
+    model: Type[Model],
+) -> None:
+    writes_suppressed.inc(1, _get_model_label(model))
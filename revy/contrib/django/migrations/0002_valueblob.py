@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('revy', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValueBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='digest')),
+                ('data', models.BinaryField(verbose_name='data')),
+                ('size', models.PositiveBigIntegerField(verbose_name='size')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+            ],
+            options={
+                'verbose_name': 'value blob',
+                'verbose_name_plural': 'value blobs',
+                'db_table': 'revy__value_blobs',
+            },
+        ),
+    ]
@@ -9,7 +9,7 @@ from typing import (
     List,
     Optional,
     Protocol,
-    Set,
+    Type,
     runtime_checkable,
 )
 
@@ -23,6 +23,12 @@ from django.utils.translation import gettext_lazy as _
 import revy.abc
 from revy.contrib.django import _typing
 from revy.contrib.django.aggregates import ObjectSnapshot
+from revy.contrib.django import (
+    diffs,
+    field_codecs,
+    old_values,
+    values,
+)
 from revy.contrib.django.conf import settings
 from revy.contrib.django.deletion import (
     CASCADE,
@@ -30,6 +36,14 @@ from revy.contrib.django.deletion import (
     SET_DEFAULT,
     SET_NULL,
 )
+from revy.contrib.django.policies import get_tracked_fields
+from revy.contrib.django.querysets import (
+    DeltaQuerySet,
+    RevisionQuerySet,
+    collect_generic_objects,
+    fetch_generic_objects,
+    get_generic_attnames,
+)
 from revy.contrib.django.utils import (
     get_attribute_delta_model,
     get_delta_model,
@@ -61,6 +75,8 @@ __all__ = (
     'AbstractAttributeDelta',
     'BaseAttributeDelta',
     'AttributeDelta',
+    'ValueBlob',
+    'PendingAttributeDelta',
     'ModelInstanceState',
     'get_model_instance_state',
 )
@@ -124,15 +140,14 @@ class AbstractRevision(
         return attribute_deltas
 
     def get_actors(self) -> Iterable[Model]:
-        seen: Set[Model] = set()
-        for delta in self.get_deltas():
-            actor = delta.get_actor()
-            if actor is None:
-                continue
-            if actor in seen:
-                continue
-            yield actor
-            seen.add(actor)
+        delta_class = get_delta_model()
+        prefetched_deltas = getattr(self, '_prefetched_objects_cache', {}).get(
+            RevisionQuerySet.get_deltas_accessor_name(),
+        )
+        if prefetched_deltas is not None:
+            return collect_generic_objects(prefetched_deltas, delta_class.ACTOR_FIELD_NAME)
+        ct_attname, fk_attname = get_generic_attnames(delta_class, delta_class.ACTOR_FIELD_NAME)
+        return fetch_generic_objects(self.get_deltas().order_by('pk').values_list(ct_attname, fk_attname))
 
     def get_created_at(self) -> datetime.datetime:
         return getattr(self, self.__class__.CREATED_AT_FIELD_NAME)
@@ -168,6 +183,8 @@ class BaseRevision(
     models.Model,
 ):
 
+    objects = RevisionQuerySet.as_manager()
+
     description: _typing.TextField[
         str,
         str,
@@ -329,6 +346,8 @@ class BaseDelta(
     models.Model,
 ):
 
+    objects = DeltaQuerySet.as_manager()
+
     revision: _typing.ForeignKey[
         AbstractRevision,
         AbstractRevision,
@@ -521,26 +540,32 @@ class AbstractObjectDelta(
         abstract = True
 
     def get_attribute_deltas(self) -> _typing.QuerySet['AbstractAttributeDelta']:  # type: ignore[type-arg]
+        prefetched_attribute_deltas = getattr(self, '_prefetched_objects_cache', {}).get(
+            DeltaQuerySet.get_attribute_deltas_accessor_name(),
+        )
+        if prefetched_attribute_deltas is not None:
+            return prefetched_attribute_deltas
         attribute_delta_class = get_attribute_delta_model()
         attribute_deltas = attribute_delta_class.objects.filter(**{
-            attribute_delta_class.PARENT_LINK_FIELD_NAME: self.pk,
+            attribute_delta_class.OBJECT_DELTA_FIELD_NAME: self.pk,
         })
         return attribute_deltas
 
     def get_actors(self) -> Iterable[Model]:
-        seen: Set[Model] = set()
-        actor = self.get_actor()
-        if actor is not None:
-            yield actor
-            seen.add(actor)
-        for attribute_delta in self.get_attribute_deltas():
-            actor = attribute_delta.get_actor()
-            if actor is None:
-                continue
-            if actor in seen:
-                continue
-            yield actor
-            seen.add(actor)
+        prefetched_attribute_deltas = getattr(self, '_prefetched_objects_cache', {}).get(
+            DeltaQuerySet.get_attribute_deltas_accessor_name(),
+        )
+        if prefetched_attribute_deltas is not None:
+            return collect_generic_objects(
+                [self, *sorted(prefetched_attribute_deltas, key=lambda attribute_delta: attribute_delta.pk)],
+                self.__class__.ACTOR_FIELD_NAME,
+            )
+        ct_attname, fk_attname = get_generic_attnames(self.__class__, self.__class__.ACTOR_FIELD_NAME)
+        attribute_deltas = self.get_attribute_deltas().order_by('pk').values_list(ct_attname, fk_attname)
+        return fetch_generic_objects([
+            (getattr(self, ct_attname), getattr(self, fk_attname)),
+            *attribute_deltas,
+        ])
 
 
 class BaseObjectDelta(
@@ -618,7 +643,16 @@ class AbstractAttributeDelta(
         setattr(self, self.__class__.ATTRIBUTE_NAME_FIELD_NAME, attribute_name)
 
     def get_old_value(self) -> Optional[Any]:
-        return getattr(self, self.__class__.OLD_VALUE_FIELD_NAME)
+        old_value = getattr(self, self.__class__.OLD_VALUE_FIELD_NAME)
+        if old_values.is_derived(old_value):
+            old_value = old_values.get_previous_new_value(self) if self.pk is not None else None
+        return field_codecs.decode_attribute_delta_value(
+            self,
+            diffs.resolve_attribute_delta_value(
+                self,
+                values.decode_value(old_value),
+            ),
+        )
 
     def set_old_value(
         self,
@@ -627,7 +661,13 @@ class AbstractAttributeDelta(
         setattr(self, self.__class__.OLD_VALUE_FIELD_NAME, old_value)
 
     def get_new_value(self) -> Optional[Any]:
-        return getattr(self, self.__class__.NEW_VALUE_FIELD_NAME)
+        return field_codecs.decode_attribute_delta_value(
+            self,
+            diffs.resolve_attribute_delta_value(
+                self,
+                values.decode_value(getattr(self, self.__class__.NEW_VALUE_FIELD_NAME)),
+            ),
+        )
 
     def set_new_value(
         self,
@@ -727,6 +767,101 @@ class AttributeDelta(
         swappable = settings.ATTRIBUTE_DELTA_MODEL_ATTNAME
 
 
+class ValueBlob(
+    models.Model,
+):
+
+    digest: _typing.CharField[
+        str,
+        str,
+    ] = models.CharField(
+        verbose_name=_('digest'),
+        max_length=64,
+        primary_key=True,
+    )
+
+    data: _typing.BinaryField[
+        bytes,
+        bytes,
+    ] = models.BinaryField(
+        verbose_name=_('data'),
+        blank=False,
+        null=False,
+    )
+
+    size: _typing.PositiveBigIntegerField[
+        int,
+        int,
+    ] = models.PositiveBigIntegerField(
+        verbose_name=_('size'),
+        blank=False,
+        null=False,
+    )
+
+    created_at: _typing.DateTimeField[
+        datetime.datetime,
+        datetime.datetime,
+    ] = models.DateTimeField(
+        verbose_name=_('created at'),
+        auto_now_add=True,
+        blank=True,
+        null=False,
+    )
+
+    class Meta:
+
+        verbose_name = _('value blob')
+
+        verbose_name_plural = _('value blobs')
+
+        db_table = 'revy__value_blobs'
+
+
+@dataclasses.dataclass(slots=True)
+class PendingAttributeDelta:
+
+    attribute_name: str = dataclasses.field(
+        kw_only=True,
+    )
+
+    action: str = dataclasses.field(
+        kw_only=True,
+    )
+
+    description: str = dataclasses.field(
+        kw_only=True,
+        default='',
+    )
+
+    old_value: Optional[Any] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    new_value: Optional[Any] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    actor: Optional[Model] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    def materialize(
+        self,
+        attribute_delta_class: Type[AbstractAttributeDelta],
+    ) -> AbstractAttributeDelta:
+        attribute_delta = attribute_delta_class()
+        attribute_delta.set_attribute_name(self.attribute_name)
+        attribute_delta.set_action(self.action)
+        attribute_delta.set_description(self.description)
+        attribute_delta.set_old_value(self.old_value)
+        attribute_delta.set_new_value(self.new_value)
+        attribute_delta.set_actor(self.actor)
+        return attribute_delta
+
+
 @dataclasses.dataclass()
 class ModelInstanceState:
 
@@ -820,7 +955,7 @@ class ModelInstanceState:
         ),
     )
 
-    attribute_deltas: List[AbstractAttributeDelta] = dataclasses.field(
+    attribute_deltas: List[PendingAttributeDelta] = dataclasses.field(
         kw_only=True,
         default_factory=list,
         metadata=wrap_metadata(
@@ -836,6 +971,11 @@ class ModelInstanceState:
         ),
     )
 
+    flushed_attribute_delta_count: int = dataclasses.field(
+        kw_only=True,
+        default=0,
+    )
+
     STATE_ATTNAME = '__revy__state'
 
     @classmethod
@@ -857,12 +997,24 @@ class ModelInstanceState:
         state = cls.get_for(instance)
         if state is not None:
             return state
-        return cls(instance)
+        state = cls(instance)
+        model_state = instance.__dict__.get('_state')
+        if model_state is not None and not model_state.adding:
+            state.initialize_fetched()
+        return state
 
     def __post_init__(self) -> None:
         if self.__class__.get_for(self.instance) is None:
             setattr(self.instance, self.__class__.STATE_ATTNAME, self)
 
+    def initialize_fetched(self) -> None:
+        instance_dict = self.instance.__dict__
+        self.is_initialized = True
+        self.is_fetched = True
+        for field in get_tracked_fields(self.instance.__class__).values():
+            if field.attname in instance_dict:
+                self.previous_values[field.attname] = instance_dict[field.attname]
+
     def backup(self) -> Dict[str, Any]:
         snapshot = dict()
         for field in dataclasses.fields(self):
@@ -0,0 +1,209 @@
+import json
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Set,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from django.db.models import (
+    Max,
+    Model,
+    OuterRef,
+    QuerySet,
+    Subquery,
+)
+
+from revy.contrib.django import (
+    diffs,
+    field_codecs,
+    values,
+)
+from revy.contrib.django.conf import settings
+from revy.contrib.django.utils import (
+    get_attribute_delta_model,
+    get_json_encoder_class,
+)
+
+
+if TYPE_CHECKING:
+    from revy.contrib.django.models import AbstractAttributeDelta
+
+
+__all__ = (
+    'MODE_ALWAYS',
+    'MODE_NEVER',
+    'MODE_GAPS',
+    'MODES',
+    'PREVIOUS_NEW_VALUE_ANNOTATION',
+    'is_derived',
+    'derive_old_value',
+    'get_object_attnames',
+    'get_latest_new_values',
+    'get_kept_attribute_delta_ids',
+    'get_previous_new_value',
+    'annotate_previous_new_values',
+)
+
+
+MODE_ALWAYS = 'always'
+
+MODE_NEVER = 'never'
+
+MODE_GAPS = 'gaps'
+
+MODES = (
+    MODE_ALWAYS,
+    MODE_NEVER,
+    MODE_GAPS,
+)
+
+PREVIOUS_NEW_VALUE_ANNOTATION = 'revy_previous_new_value'
+
+
+QuerySetT = TypeVar('QuerySetT', bound=QuerySet)
+
+
+def is_derived(
+    stored_old_value: Any,
+) -> bool:
+    return values.is_derived(stored_old_value)
+
+
+def derive_old_value(
+    attribute_delta: 'AbstractAttributeDelta',
+) -> None:
+    attribute_delta.set_old_value({values.DERIVED_KEY: True})
+
+
+def get_object_attnames(
+    attribute_delta_class: Type['AbstractAttributeDelta'],
+) -> Tuple[str, str]:
+    from revy.contrib.django.aggregates import ObjectSnapshot
+
+    ct_field, fk_field = ObjectSnapshot.get_ct_fk_fields(attribute_delta_class)
+    return ct_field.attname, fk_field.attname
+
+
+def _normalize(
+    value: Any,
+) -> Any:
+    return json.loads(json.dumps(value, cls=get_json_encoder_class()))
+
+
+def _is_stored_as(
+    stored_value: Any,
+    value: Any,
+    codec: field_codecs.Codec,
+) -> bool:
+    stored_value = values.decode_value(stored_value)
+    if diffs.is_diff(stored_value):
+        return isinstance(value, str) and stored_value[diffs.DIFF_KEY]['digest'] == values.get_digest(value.encode())
+    return stored_value == _normalize(codec.encode(value))
+
+
+def get_latest_new_values(
+    instance: Model,
+    field_names: Iterable[str],
+) -> Dict[str, Any]:
+    from django.contrib.contenttypes.models import ContentType
+
+    attribute_delta_class = get_attribute_delta_model()
+    ct_attname, fk_attname = get_object_attnames(attribute_delta_class)
+    attribute_deltas = attribute_delta_class._default_manager.filter(
+        **{
+            ct_attname: ContentType.objects.get_for_model(instance).pk,
+            fk_attname: str(instance.pk),
+            f'{attribute_delta_class.ATTRIBUTE_NAME_FIELD_NAME}__in': list(field_names),
+        },
+    )
+    latest_pks = attribute_deltas.values(
+        attribute_delta_class.ATTRIBUTE_NAME_FIELD_NAME,
+    ).annotate(
+        latest_pk=Max('pk'),
+    ).values(
+        'latest_pk',
+    )
+    return dict(
+        attribute_delta_class._default_manager.filter(
+            pk__in=Subquery(latest_pks),
+        ).values_list(
+            attribute_delta_class.ATTRIBUTE_NAME_FIELD_NAME,
+            attribute_delta_class.NEW_VALUE_FIELD_NAME,
+        ),
+    )
+
+
+def get_kept_attribute_delta_ids(
+    instance: Model,
+    attribute_deltas: Iterable['AbstractAttributeDelta'],
+    is_new: bool,
+) -> Set[int]:
+    if settings.OLD_VALUES != MODE_GAPS or is_new:
+        return set()
+    first_attribute_deltas: Dict[str, 'AbstractAttributeDelta'] = {}
+    for attribute_delta in attribute_deltas:
+        first_attribute_deltas.setdefault(attribute_delta.get_attribute_name(), attribute_delta)
+    if not first_attribute_deltas:
+        return set()
+    latest_new_values = get_latest_new_values(instance, first_attribute_deltas.keys())
+    attribute_codecs = field_codecs.get_field_codecs(instance.__class__)
+    return {
+        id(attribute_delta)
+        for field_name, attribute_delta in first_attribute_deltas.items()
+        if field_name in latest_new_values and not _is_stored_as(
+            latest_new_values[field_name],
+            getattr(attribute_delta, attribute_delta.__class__.OLD_VALUE_FIELD_NAME),
+            attribute_codecs.get(field_name, field_codecs.IDENTITY_CODEC),
+        )
+    }
+
+
+def get_previous_new_value(
+    attribute_delta: 'AbstractAttributeDelta',
+) -> Any:
+    attribute_delta_class = attribute_delta.__class__
+    if hasattr(attribute_delta, PREVIOUS_NEW_VALUE_ANNOTATION):
+        return getattr(attribute_delta, PREVIOUS_NEW_VALUE_ANNOTATION)
+    ct_attname, fk_attname = get_object_attnames(attribute_delta_class)
+    return attribute_delta_class._default_manager.filter(
+        **{
+            ct_attname: getattr(attribute_delta, ct_attname),
+            fk_attname: getattr(attribute_delta, fk_attname),
+            attribute_delta_class.ATTRIBUTE_NAME_FIELD_NAME: attribute_delta.get_attribute_name(),
+            'pk__lt': attribute_delta.pk,
+        },
+    ).order_by(
+        '-pk',
+    ).values_list(
+        attribute_delta_class.NEW_VALUE_FIELD_NAME,
+        flat=True,
+    ).first()
+
+
+def annotate_previous_new_values(
+    queryset: QuerySetT,
+) -> QuerySetT:
+    attribute_delta_class = queryset.model
+    ct_attname, fk_attname = get_object_attnames(attribute_delta_class)
+    previous_new_values = attribute_delta_class._default_manager.filter(
+        **{
+            ct_attname: OuterRef(ct_attname),
+            fk_attname: OuterRef(fk_attname),
+            attribute_delta_class.ATTRIBUTE_NAME_FIELD_NAME: OuterRef(
+                attribute_delta_class.ATTRIBUTE_NAME_FIELD_NAME,
+            ),
+            'pk__lt': OuterRef('pk'),
+        },
+    ).order_by(
+        '-pk',
+    ).values(
+        attribute_delta_class.NEW_VALUE_FIELD_NAME,
+    )[:1]
+    return queryset.annotate(**{
+        PREVIOUS_NEW_VALUE_ANNOTATION: Subquery(previous_new_values),
+    })
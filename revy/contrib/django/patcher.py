@@ -1,27 +1,46 @@
 from contextlib import (
     ExitStack,
+    nullcontext,
     suppress,
 )
 import dataclasses
 import functools
-import inspect
+import threading
+import time
 from typing import (
     Any,
     Callable,
+    Dict,
     Optional,
     TYPE_CHECKING,
     Type,
     cast,
 )
 
-from django.core.exceptions import FieldDoesNotExist
 from django.db import transaction
-from django.db.models import (
-    Field,
-    Model,
-)
+from django.db.models import Model
 from django.db.models.options import Options
 
+from revy.contrib.django import (
+    batching,
+    coalescing,
+    diffs,
+    field_codecs,
+    metrics,
+    old_values,
+    routers,
+    values,
+)
+from revy.contrib.django.conf import settings
+from revy.contrib.django.cost_accounting import account_cost
+from revy.contrib.django.hooks import (
+    HookEvent,
+    hook_registry,
+)
+from revy.contrib.django.policies import (
+    get_diff_field_names,
+    get_tracked_fields,
+)
 from revy.contrib.django.utils import (
     get_attribute_delta_model,
     get_context_class,
@@ -32,7 +51,12 @@ from revy.contrib.django.utils import (
 
 
 if TYPE_CHECKING:
-    from revy.contrib.django.models import AbstractRevision  # noqa
+    from revy.context import ContextSnapshot  # noqa
+    from revy.contrib.django.models import (  # noqa
+        AbstractAttributeDelta,
+        AbstractRevision,
+        ModelInstanceState,
+    )
 
 
 __all__ = (
@@ -60,11 +84,27 @@ class MethodPatchData:
         kw_only=True,
     )
 
+    applied_method: Optional[Callable[..., Any]] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    is_classmethod: bool = dataclasses.field(
+        kw_only=True,
+        default=False,
+    )
+
 
 class Patcher:
 
     PATCH_DATA_ATTNAME = '__revy__patch_data'
 
+    LAZY_INIT_NAME = 'lazy_patched_init'
+
+    lazy_patch_lock = threading.RLock()
+
+    from_db_state = threading.local()
+
     @classmethod
     def get_method_patch_data(
         cls,
@@ -85,21 +125,85 @@ class Patcher:
     ) -> bool:
         return cls.get_method_patch_data(type_, method_name) is not None
 
+    @classmethod
+    def compile_method(
+        cls,
+        method_patch_data: MethodPatchData,
+    ) -> Callable[..., Any]:
+        operation = method_patch_data.method_name
+        before_callbacks = hook_registry.get_before_callbacks(operation)
+        after_callbacks = hook_registry.get_after_callbacks(operation)
+
+        if not before_callbacks and not after_callbacks:
+            return method_patch_data.patched_method
+
+        if method_patch_data.is_classmethod or cls.is_lazy_init(method_patch_data.patched_method):
+            return method_patch_data.patched_method
+
+        model = cast(Type[Model], method_patch_data.type_)
+        patched_method = method_patch_data.patched_method
+        is_flushing = operation in (HookEvent.OPERATION_SAVE_BASE, HookEvent.OPERATION_DELETE)
+
+        from revy.contrib.django.models import ModelInstanceState
+
+        @functools.wraps(patched_method)
+        def instrumented_method(
+            self: Model,
+            *args: Any,
+            **kwargs: Any,
+        ) -> Any:
+
+            state = ModelInstanceState.get_for(self)
+            previous_delta_count = len(state.attribute_deltas) if state is not None else 0
+            previous_flushed_delta_count = state.flushed_attribute_delta_count if state is not None else 0
+
+            event = HookEvent(
+                operation=operation,
+                model=model,
+                instance=self,
+                delta_count=previous_delta_count,
+                started_at=time.perf_counter(),
+            )
+
+            for before_callback in before_callbacks:
+                before_callback(event)
+
+            try:
+                return patched_method(self, *args, **kwargs)
+            except BaseException as exception:
+                event.exception = exception
+                raise
+            finally:
+                event.duration = time.perf_counter() - event.started_at
+                state = ModelInstanceState.get_for(self)
+                if state is None:
+                    event.delta_count = 0
+                elif is_flushing:
+                    event.delta_count = state.flushed_attribute_delta_count - previous_flushed_delta_count
+                else:
+                    event.delta_count = abs(len(state.attribute_deltas) - previous_delta_count)
+                for after_callback in after_callbacks:
+                    after_callback(event)
+
+        return instrumented_method
+
     @classmethod
     def apply_method_patch(
         cls,
         method_patch_data: MethodPatchData,
     ) -> None:
+        applied_method = cls.compile_method(method_patch_data)
         setattr(
             method_patch_data.type_,
             method_patch_data.method_name,
-            method_patch_data.patched_method,
+            classmethod(applied_method) if method_patch_data.is_classmethod else applied_method,
         )
         setattr(
-            method_patch_data.patched_method,
+            applied_method,
             cls.PATCH_DATA_ATTNAME,
             method_patch_data,
         )
+        method_patch_data.applied_method = applied_method
 
     @classmethod
     def unpatch_method(
@@ -108,48 +212,198 @@ class Patcher:
         method_name: str,
     ) -> None:
         method_patch_data = cls.get_method_patch_data(type_, method_name)
-        if method_patch_data is None:
+        if method_patch_data is None or method_patch_data.type_ is not type_:
             return
         setattr(
             method_patch_data.type_,
             method_patch_data.method_name,
-            method_patch_data.original_method,
-        )
-        delattr(
-            method_patch_data.patched_method,
-            cls.PATCH_DATA_ATTNAME,
+            (
+                classmethod(method_patch_data.original_method)
+                if method_patch_data.is_classmethod
+                else method_patch_data.original_method
+            ),
         )
+        if method_patch_data.applied_method is not None:
+            delattr(
+                method_patch_data.applied_method,
+                cls.PATCH_DATA_ATTNAME,
+            )
+            method_patch_data.applied_method = None
 
     @classmethod
-    def patch_model(
+    def recompile_method(
         cls,
-        model: Type[Model],
+        type_: type,
+        method_name: str,
     ) -> None:
+        method_patch_data = cls.get_method_patch_data(type_, method_name)
+        if method_patch_data is None:
+            return
+        if method_patch_data.applied_method is not None:
+            delattr(
+                method_patch_data.applied_method,
+                cls.PATCH_DATA_ATTNAME,
+            )
+        cls.apply_method_patch(method_patch_data)
+
+    @classmethod
+    def is_model_excluded(
+        cls,
+        model: Type[Model],
+    ) -> bool:
+        from revy.contrib.django.models import ValueBlob
+
         excluded_models = (
             get_revision_model(),
             get_delta_model(),
             get_object_delta_model(),
             get_attribute_delta_model(),
+            ValueBlob,
         )
-        if issubclass(model, excluded_models):
+        return issubclass(model, excluded_models)
+
+    @classmethod
+    def patch_model(
+        cls,
+        model: Type[Model],
+    ) -> None:
+        if cls.is_model_excluded(model):
             return
+        cls.patch_model_from_db(model)
         cls.patch_model_init(model)
         cls.patch_model_setattr(model)
         cls.patch_model_save_base(model)
         cls.patch_model_refresh_from_db(model)
         cls.patch_model_delete(model)
 
+    @classmethod
+    def is_lazy_init(
+        cls,
+        method: Callable[..., Any],
+    ) -> bool:
+        code = getattr(method, '__code__', None)
+        return code is not None and code.co_name == cls.LAZY_INIT_NAME
+
+    @classmethod
+    def is_model_patched_lazily(
+        cls,
+        model: Type[Model],
+    ) -> bool:
+        method_patch_data = cls.get_method_patch_data(model, '__init__')
+        if method_patch_data is None:
+            return False
+        return cls.is_lazy_init(method_patch_data.patched_method)
+
+    @classmethod
+    def patch_model_lazily(
+        cls,
+        model: Type[Model],
+    ) -> None:
+
+        if cls.is_method_patched(model, '__init__'):
+            return
+
+        if cls.is_model_excluded(model):
+            return
+
+        cls.patch_model_from_db(model)
+
+        original_init = cast(
+            Callable[..., None],
+            model.__init__,
+        )
+
+        @functools.wraps(original_init)
+        def lazy_patched_init(
+            self: Model,
+            *args: Any,
+            **kwargs: Any,
+        ) -> None:
+            with cls.lazy_patch_lock:
+                method_patch_data = cls.get_method_patch_data(model, '__init__')
+                if method_patch_data is not None and method_patch_data.patched_method is lazy_patched_init:
+                    cls.unpatch_method(model, '__init__')
+                    cls.patch_model(model)
+            return model.__init__(self, *args, **kwargs)
+
+        method_patch_data = MethodPatchData(
+            type_=model,
+            method_name='__init__',
+            original_method=original_init,
+            patched_method=lazy_patched_init,
+        )
+
+        cls.apply_method_patch(method_patch_data)
+
+    @classmethod
+    def recompile_model(
+        cls,
+        model: Type[Model],
+    ) -> None:
+        cls.recompile_method(model, 'from_db')
+        cls.recompile_method(model, '__init__')
+        cls.recompile_method(model, '__setattr__')
+        cls.recompile_method(model, 'save_base')
+        cls.recompile_method(model, 'refresh_from_db')
+        cls.recompile_method(model, 'delete')
+
     @classmethod
     def unpatch_model(
         cls,
         model: Type[Model],
     ) -> None:
+        cls.unpatch_model_from_db(model)
         cls.unpatch_model_init(model)
         cls.unpatch_model_setattr(model)
         cls.unpatch_model_save_base(model)
         cls.unpatch_model_refresh_from_db(model)
         cls.unpatch_model_delete(model)
 
+    @classmethod
+    def patch_model_from_db(
+        cls,
+        model: Type[Model],
+    ) -> None:
+
+        if cls.is_method_patched(model, 'from_db'):
+            return
+
+        from_db_state = cls.from_db_state
+
+        original_from_db = cast(
+            Callable[..., Model],
+            getattr(model.from_db, '__func__'),
+        )
+
+        @functools.wraps(original_from_db)
+        def patched_from_db(
+            model_class: Type[Model],
+            *args: Any,
+            **kwargs: Any,
+        ) -> Model:
+            from_db_state.is_active = True
+            try:
+                return original_from_db(model_class, *args, **kwargs)
+            finally:
+                from_db_state.is_active = False
+
+        method_patch_data = MethodPatchData(
+            type_=model,
+            method_name='from_db',
+            original_method=original_from_db,
+            patched_method=patched_from_db,
+            is_classmethod=True,
+        )
+
+        cls.apply_method_patch(method_patch_data)
+
+    @classmethod
+    def unpatch_model_from_db(
+        cls,
+        model: Type[Model],
+    ) -> None:
+        cls.unpatch_method(model, 'from_db')
+
     @classmethod
     def patch_model_init(
         cls,
@@ -163,6 +417,8 @@ class Patcher:
 
         context_class = get_context_class()
 
+        from_db_state = cls.from_db_state
+
         original_init = cast(
             Callable[..., None],
             model.__init__,
@@ -175,16 +431,12 @@ class Patcher:
             **kwargs: Any,
         ) -> None:
 
-            if context_class.is_disabled():
-                return original_init(self, *args, **kwargs)
+            is_from_db = getattr(from_db_state, 'is_active', False)
+            if is_from_db:
+                from_db_state.is_active = False
 
-            current_frame = inspect.currentframe()
-            previous_frame = current_frame.f_back if current_frame else None
-            caller_name = previous_frame.f_code.co_name if previous_frame else None
-            caller_locals = previous_frame.f_locals if previous_frame else dict()
-            caller_class = caller_locals.get('cls', self.__class__)
-            caller_class_is_model = inspect.isclass(caller_class) and issubclass(caller_class, Model)
-            caller_class_method_is_from_db = caller_class_is_model and caller_name == 'from_db'
+            if context_class.get_snapshot().is_disabled:
+                return original_init(self, *args, **kwargs)
 
             state = get_model_instance_state(self)
 
@@ -192,12 +444,12 @@ class Patcher:
 
             state.is_initialized = False
 
-            state.is_new = not caller_class_method_is_from_db
+            state.is_new = not is_from_db
 
             state.is_being_saved = False
             state.is_saved = False
 
-            state.is_being_fetched = caller_class_method_is_from_db
+            state.is_being_fetched = is_from_db
             state.is_fetched = False
 
             state.is_being_deleted = False
@@ -226,6 +478,90 @@ class Patcher:
     ) -> None:
         cls.unpatch_method(model, '__init__')
 
+    @classmethod
+    def record_attribute_delta(
+        cls,
+        context_snapshot: 'ContextSnapshot',
+        state: 'ModelInstanceState',
+        field_attname: str,
+        field_default: Any,
+        old_value: Any,
+        new_value: Any,
+        is_initial: bool,
+        is_caused_by_system: bool,
+    ) -> None:
+
+        from revy.contrib.django.models import PendingAttributeDelta
+
+        attribute_delta_class = get_attribute_delta_model()
+
+        previous_attribute_delta_indexes = state.field_name_to_attribute_delta_index_mapping.get(
+            field_attname,
+            [],
+        )
+
+        previous_attribute_delta_index: Optional[int] = None
+        with suppress(IndexError):
+            previous_attribute_delta_index = previous_attribute_delta_indexes[-1]
+
+        previous_attribute_delta = (
+            state.attribute_deltas[previous_attribute_delta_index]
+            if previous_attribute_delta_index is not None
+            else None
+        )
+
+        previous_actor = (
+            previous_attribute_delta.actor
+            if previous_attribute_delta is not None
+            else None
+        )
+
+        actor = None if is_caused_by_system else context_snapshot.actor
+
+        is_first_delta = state.is_new and len(previous_attribute_delta_indexes) == 0
+
+        action = (
+            attribute_delta_class.ACTION_SET
+            if is_first_delta or new_value not in (None, False, '')
+            else attribute_delta_class.ACTION_UNSET
+        )
+
+        description = context_snapshot.attribute_delta_description
+
+        was_default = state.is_new
+        was_default &= previous_actor is None
+        was_default &= (
+            field_default in [previous_attribute_delta.new_value, None]
+            if previous_attribute_delta is not None
+            else False
+        )
+
+        was_caused_by_system = state.is_initialized and previous_actor is None
+        was_caused_by_system &= not is_initial
+
+        should_discard_new_attribute_delta = previous_attribute_delta is not None
+        should_discard_new_attribute_delta &= (previous_actor is actor) or was_caused_by_system
+        should_discard_new_attribute_delta |= was_default
+
+        if should_discard_new_attribute_delta:
+            assert previous_attribute_delta is not None  # noqa
+            previous_attribute_delta.action = action
+            previous_attribute_delta.description = description
+            previous_attribute_delta.new_value = new_value
+            return
+
+        state.attribute_deltas.append(PendingAttributeDelta(
+            attribute_name=field_attname,
+            action=action,
+            description=description,
+            old_value=old_value,
+            new_value=new_value,
+            actor=actor,
+        ))
+        state.field_name_to_attribute_delta_index_mapping[field_attname].append(
+            len(state.attribute_deltas) - 1,
+        )
+
     @classmethod
     def patch_model_setattr(
         cls,
@@ -244,6 +580,10 @@ class Patcher:
             model.__setattr__,
         )
 
+        tracked_fields = get_tracked_fields(model)
+
+        attribute_codecs = field_codecs.get_field_codecs(model)
+
         @functools.wraps(original_setattr)
         def patched_setattr(
             self: Model,
@@ -251,20 +591,13 @@ class Patcher:
             value: Any,
         ) -> None:
 
-            if context_class.is_disabled():
+            context_snapshot = context_class.get_snapshot()
+            if context_snapshot.is_disabled:
                 return original_setattr(self, attname, value)
 
-            meta = cast(Options, model._meta)  # noqa
-
-            field: Optional[Field] = None
-            with suppress(FieldDoesNotExist):
-                field = cast(Field, meta.get_field(attname))
+            field = tracked_fields.get(attname)
             if field is None:
                 return original_setattr(self, attname, value)
-            if field.one_to_many or field.many_to_many:
-                return original_setattr(self, attname, value)
-            if field.column is None:
-                return original_setattr(self, attname, value)
 
             new_value = value
             if field.is_relation and isinstance(value, Model):
@@ -284,7 +617,7 @@ class Patcher:
             is_caused_by_system |= state.is_being_deleted
 
             old_value = state.previous_values.get(field.attname)
-            is_changed = old_value != new_value
+            is_changed = field_codecs.is_value_changed(field, attribute_codecs[attname], old_value, new_value)
             if is_changed:
                 state.previous_values[field.attname] = new_value
 
@@ -296,84 +629,16 @@ class Patcher:
             if not is_changed:
                 return
 
-            attribute_delta_class = get_attribute_delta_model()
-
-            with context_class():
-
-                if is_caused_by_system:
-                    context_class.set_actor(None)
-
-                previous_attribute_delta_indexes = state.field_name_to_attribute_delta_index_mapping.get(
-                    field.attname,
-                    [],
-                )
-
-                previous_attribute_delta_index: Optional[int] = None
-                with suppress(IndexError):
-                    previous_attribute_delta_index = previous_attribute_delta_indexes[-1]
-
-                previous_attribute_delta = (
-                    state.attribute_deltas[previous_attribute_delta_index]
-                    if previous_attribute_delta_index is not None
-                    else None
-                )
-
-                previous_actor = (
-                    previous_attribute_delta.get_actor()
-                    if previous_attribute_delta is not None
-                    else None
-                )
-
-                actor = context_class.get_actor()
-
-                is_first_delta = state.is_new and len(previous_attribute_delta_indexes) == 0
-
-                action = (
-                    attribute_delta_class.ACTION_SET
-                    if is_first_delta or new_value not in (None, False, '')
-                    else attribute_delta_class.ACTION_UNSET
-                )
-
-                description = context_class.get_attribute_delta_description()
-
-                was_default = state.is_new
-                was_default &= previous_actor is None
-                was_default &= (
-                    field.default in [previous_attribute_delta.get_new_value(), None]
-                    if previous_attribute_delta is not None
-                    else False
-                )
-
-                was_caused_by_system = state.is_initialized and previous_actor is None
-                was_caused_by_system &= not is_initial
-
-                should_discard_new_attribute_delta = previous_attribute_delta is not None
-                should_discard_new_attribute_delta &= (previous_actor is actor) or was_caused_by_system
-                should_discard_new_attribute_delta |= was_default
-
-                concrete_attribute_delta = (
-                    previous_attribute_delta
-                    if should_discard_new_attribute_delta
-                    else attribute_delta_class()
-                )
-
-                assert concrete_attribute_delta is not None  # noqa
-
-                concrete_attribute_delta.set_action(action)
-                concrete_attribute_delta.set_description(description)
-                concrete_attribute_delta.set_new_value(new_value)
-
-                if not should_discard_new_attribute_delta:
-
-                    concrete_attribute_delta.set_actor(actor)
-                    concrete_attribute_delta.set_attribute_name(field.attname)
-                    concrete_attribute_delta.set_old_value(old_value)
-
-                    state.attribute_deltas.append(concrete_attribute_delta)
-                    attribute_delta_index = len(state.attribute_deltas) - 1
-                    state.field_name_to_attribute_delta_index_mapping[field.attname].append(
-                        attribute_delta_index,
-                    )
+            cls.record_attribute_delta(
+                context_snapshot,
+                state,
+                field.attname,
+                field.default,
+                old_value,
+                new_value,
+                is_initial,
+                is_caused_by_system,
+            )
 
         method_patch_data = MethodPatchData(
             type_=model,
@@ -391,6 +656,27 @@ class Patcher:
     ) -> None:
         cls.unpatch_method(model, '__setattr__')
 
+    @classmethod
+    def compile_attribute_delta_encoder(
+        cls,
+        model: Type[Model],
+    ) -> Callable[['AbstractAttributeDelta'], None]:
+
+        attribute_codecs = field_codecs.get_field_codecs(model)
+        diff_field_names = get_diff_field_names(model)
+
+        def encode_attribute_delta(
+            attribute_delta: 'AbstractAttributeDelta',
+        ) -> None:
+            attribute_name = attribute_delta.get_attribute_name()
+            codec = attribute_codecs.get(attribute_name)
+            if codec is not None and codec is not field_codecs.IDENTITY_CODEC:
+                field_codecs.encode_attribute_delta(attribute_delta, codec)
+            if diff_field_names and attribute_name in diff_field_names:
+                diffs.encode_attribute_delta(attribute_delta)
+
+        return encode_attribute_delta
+
     @classmethod
     def patch_model_save_base(
         cls,
@@ -409,6 +695,8 @@ class Patcher:
             model.save_base,
         )
 
+        encode_attribute_delta = cls.compile_attribute_delta_encoder(model)
+
         @functools.wraps(original_save_base)
         def patched_save_base(
             self: Model,
@@ -416,7 +704,8 @@ class Patcher:
             **kwargs: Any,
         ) -> None:
 
-            if context_class.is_disabled():
+            context_snapshot = context_class.get_snapshot()
+            if context_snapshot.is_disabled:
                 return original_save_base(self, *args, **kwargs)
 
             state = get_model_instance_state(self)
@@ -429,43 +718,152 @@ class Patcher:
             was_new = state.is_new
             state.is_being_saved = True
 
-            with ExitStack() as exit_stack, transaction.atomic():
+            batch = context_snapshot.batch
+            using = routers.get_instance_database(self, kwargs.get('using', args[3] if len(args) > 3 else None))
+
+            with ExitStack() as exit_stack, (transaction.atomic(using=using) if batch is None else nullcontext()):
 
                 exit_stack.callback(restore_state)
                 original_save_base(self, *args, **kwargs)
                 exit_stack.pop_all()
 
-                revision = context_class.get_revision()
-                if revision is None:
-                    revision_class = get_revision_model()
-                    revision = revision_class()
-                    revision.set_description(context_class.get_revision_description())
-                    revision.save()
-                revision = cast('AbstractRevision', revision)
-
                 object_delta_class = get_object_delta_model()
 
-                action = (
-                    object_delta_class.ACTION_CREATE
-                    if was_new
-                    else object_delta_class.ACTION_UPDATE
-                )
-
-                object_delta = object_delta_class()
-                object_delta.set_revision(revision)
-                object_delta.set_actor(context_class.get_actor())
-                object_delta.set_action(action)
-                object_delta.set_description(context_class.get_object_delta_description())
-                object_delta.set_object(self)
-                object_delta.save()
-
-                for attribute_delta in state.attribute_deltas:
-                    attribute_delta.set_revision(revision)
-                    attribute_delta.set_object_delta(object_delta)
-                    attribute_delta.set_object(self)
-                    attribute_delta.save()
-                state.attribute_deltas.clear()
-                state.field_name_to_attribute_delta_index_mapping.clear()
+                if not was_new and not state.attribute_deltas:
+                    if settings.METRICS:
+                        metrics.record_suppressed_write(self.__class__)
+                elif batch is not None:
+                    attribute_delta_class = get_attribute_delta_model()
+                    attribute_deltas = [
+                        pending_attribute_delta.materialize(attribute_delta_class)
+                        for pending_attribute_delta in state.attribute_deltas
+                    ]
+                    is_old_value_kept = settings.OLD_VALUES == old_values.MODE_ALWAYS
+                    is_old_value_kept |= settings.OLD_VALUES == old_values.MODE_GAPS and not was_new
+                    for attribute_delta in attribute_deltas:
+                        batching.set_generic_object(attribute_delta, attribute_delta_class.OBJECT_FIELD_NAME, self)
+                        encode_attribute_delta(attribute_delta)
+                        if not is_old_value_kept:
+                            old_values.derive_old_value(attribute_delta)
+                        if settings.VALUE_STORE:
+                            values.encode_attribute_delta(attribute_delta)
+                    object_delta = object_delta_class()
+                    object_delta.set_actor(context_snapshot.actor)
+                    object_delta.set_action(
+                        object_delta_class.ACTION_CREATE
+                        if was_new
+                        else object_delta_class.ACTION_UPDATE
+                    )
+                    object_delta.set_description(context_snapshot.object_delta_description)
+                    batching.set_generic_object(object_delta, object_delta_class.OBJECT_FIELD_NAME, self)
+                    batching.add_to_batch(batch, self.__class__, object_delta, attribute_deltas)
+                    state.flushed_attribute_delta_count += len(attribute_deltas)
+                    state.attribute_deltas.clear()
+                    state.field_name_to_attribute_delta_index_mapping.clear()
+                else:
+                    current_revision = context_class.get_revision()
+                    audit_using = routers.get_audit_database()
+
+                    object_delta = object_delta_class()
+                    object_delta.set_actor(context_snapshot.actor)
+                    object_delta.set_action(
+                        object_delta_class.ACTION_CREATE
+                        if was_new
+                        else object_delta_class.ACTION_UPDATE
+                    )
+                    object_delta.set_description(context_snapshot.object_delta_description)
+                    batching.set_generic_object(object_delta, object_delta_class.OBJECT_FIELD_NAME, self)
+                    object_key = coalescing.get_object_key(self)
+
+                    attribute_delta_class = get_attribute_delta_model()
+                    attribute_deltas = [
+                        pending_attribute_delta.materialize(attribute_delta_class)
+                        for pending_attribute_delta in state.attribute_deltas
+                    ]
+                    for attribute_delta in attribute_deltas:
+                        batching.set_generic_object(attribute_delta, attribute_delta_class.OBJECT_FIELD_NAME, self)
+
+                    def record_save() -> None:
+                        with account_cost(context_snapshot.cost_account, audit_using):
+
+                            flush_started_at = time.perf_counter()
+
+                            revision = current_revision
+                            is_revision_created = revision is None
+                            if revision is None:
+                                revision_class = get_revision_model()
+                                revision = revision_class()
+                                revision.set_description(context_snapshot.revision_description)
+                                revision.save(using=audit_using)
+                            revision = cast('AbstractRevision', revision)
+
+                            coalesced_object_delta = (
+                                coalescing.get_coalesced_object_delta(revision, object_key, audit_using)
+                                if context_snapshot.is_coalescing
+                                else None
+                            )
+                            coalesced_old_values = (
+                                coalescing.get_old_values(attribute_deltas)
+                                if context_snapshot.is_coalescing
+                                else {}
+                            )
+
+                            replaced_attribute_deltas: Dict[int, 'AbstractAttributeDelta'] = {}
+                            if coalesced_object_delta is not None:
+                                saved_object_delta = coalesced_object_delta.object_delta
+                                replaced_attribute_deltas = coalescing.merge_attribute_deltas(
+                                    coalesced_object_delta,
+                                    attribute_deltas,
+                                )
+                            else:
+                                saved_object_delta = object_delta
+                                saved_object_delta.set_revision(revision)
+                                saved_object_delta.save(using=audit_using)
+
+                            kept_attribute_delta_ids = (
+                                old_values.get_kept_attribute_delta_ids(self, attribute_deltas, was_new)
+                                if settings.OLD_VALUES != old_values.MODE_ALWAYS
+                                else None
+                            )
+
+                            for attribute_delta in attribute_deltas:
+                                attribute_delta.set_revision(revision)
+                                attribute_delta.set_object_delta(saved_object_delta)
+                                encode_attribute_delta(attribute_delta)
+                                if (
+                                    kept_attribute_delta_ids is not None
+                                    and id(attribute_delta) not in kept_attribute_delta_ids
+                                ):
+                                    old_values.derive_old_value(attribute_delta)
+                                if settings.VALUE_STORE:
+                                    values.encode_attribute_delta(attribute_delta)
+                                replaced_attribute_delta = replaced_attribute_deltas.get(id(attribute_delta))
+                                if replaced_attribute_delta is not None:
+                                    coalescing.replace_attribute_delta(replaced_attribute_delta, attribute_delta)
+                                else:
+                                    attribute_delta.save(using=audit_using)
+                            if context_snapshot.is_coalescing:
+                                coalescing.update_coalesced_object_delta(
+                                    revision,
+                                    object_key,
+                                    saved_object_delta,
+                                    attribute_deltas,
+                                    replaced_attribute_deltas,
+                                    coalesced_old_values,
+                                )
+                            if settings.METRICS:
+                                metrics.record_flush(
+                                    self.__class__,
+                                    'save',
+                                    is_revision_created,
+                                    attribute_deltas,
+                                    time.perf_counter() - flush_started_at,
+                                )
+
+                    routers.run_coupled(record_save, using, audit_using)
+                    state.flushed_attribute_delta_count += len(attribute_deltas)
+                    state.attribute_deltas.clear()
+                    state.field_name_to_attribute_delta_index_mapping.clear()
 
                 state.is_new = False
 
@@ -519,7 +917,7 @@ class Patcher:
             **kwargs: Any,
         ) -> None:
 
-            if context_class.is_disabled():
+            if context_class.get_snapshot().is_disabled:
                 return original_refresh_from_db(self, *args, **kwargs)
 
             state = get_model_instance_state(self)
@@ -536,9 +934,6 @@ class Patcher:
                 original_refresh_from_db(self, *args, **kwargs)
                 exit_stack.pop_all()
 
-                for attribute_delta in state.attribute_deltas:
-                    attribute_delta.set_object(self)
-
                 state.is_new = False
 
                 state.is_being_saved = False
@@ -584,6 +979,8 @@ class Patcher:
             model.delete,
         )
 
+        encode_attribute_delta = cls.compile_attribute_delta_encoder(model)
+
         @functools.wraps(original_delete)
         def patched_delete(
             self: Model,
@@ -591,7 +988,8 @@ class Patcher:
             **kwargs: Any,
         ) -> None:
 
-            if context_class.is_disabled():
+            context_snapshot = context_class.get_snapshot()
+            if context_snapshot.is_disabled:
                 return original_delete(self, *args, **kwargs)
 
             state = get_model_instance_state(self)
@@ -601,39 +999,107 @@ class Patcher:
             def restore_state() -> None:
                 state.restore(snapshot)
 
+            is_caused_by_system = not state.is_initialized
+            is_caused_by_system |= state.is_being_saved
+            is_caused_by_system |= state.is_being_fetched
+            is_caused_by_system |= state.is_being_deleted
+
             state.is_being_deleted = True
 
-            with ExitStack() as exit_stack, transaction.atomic():
+            using = routers.get_instance_database(self, kwargs.get('using', args[0] if args else None))
+
+            with ExitStack() as exit_stack, transaction.atomic(using=using):
 
                 exit_stack.callback(restore_state)
 
-                revision = context_class.get_revision()
-                if revision is None:
-                    revision_class = get_revision_model()
-                    revision = revision_class()
-                    revision.set_description(context_class.get_revision_description())
-                    revision.save()
-                revision = cast('AbstractRevision', revision)
+                batch = context_snapshot.batch
 
                 object_delta_class = get_object_delta_model()
                 object_delta = object_delta_class()
-                object_delta.set_revision(revision)
-                object_delta.set_actor(context_class.get_actor())
+                object_delta.set_actor(None if is_caused_by_system else context_snapshot.actor)
                 object_delta.set_action(object_delta_class.ACTION_DELETE)
-                object_delta.set_description(context_class.get_object_delta_description())
-                object_delta.set_object(self)
-                object_delta.save()
-
-                for attribute_delta in state.attribute_deltas:
-                    attribute_delta.set_revision(revision)
-                    attribute_delta.set_object(self)
-                    attribute_delta.save()
+                object_delta.set_description(context_snapshot.object_delta_description)
+                batching.set_generic_object(object_delta, object_delta_class.OBJECT_FIELD_NAME, self)
+
+                attribute_delta_class = get_attribute_delta_model()
+                attribute_deltas = [
+                    pending_attribute_delta.materialize(attribute_delta_class)
+                    for pending_attribute_delta in state.attribute_deltas
+                ]
+
+                if batch is not None:
+                    is_old_value_kept = settings.OLD_VALUES == old_values.MODE_ALWAYS
+                    is_old_value_kept |= settings.OLD_VALUES == old_values.MODE_GAPS and not state.is_new
+                    for attribute_delta in attribute_deltas:
+                        batching.set_generic_object(attribute_delta, attribute_delta_class.OBJECT_FIELD_NAME, self)
+                        encode_attribute_delta(attribute_delta)
+                        if not is_old_value_kept:
+                            old_values.derive_old_value(attribute_delta)
+                        if settings.VALUE_STORE:
+                            values.encode_attribute_delta(attribute_delta)
+                else:
+                    current_revision = context_class.get_revision()
+                    audit_using = routers.get_audit_database()
+                    object_key = coalescing.get_object_key(self)
+
+                    kept_attribute_delta_ids = (
+                        old_values.get_kept_attribute_delta_ids(self, attribute_deltas, state.is_new)
+                        if settings.OLD_VALUES != old_values.MODE_ALWAYS
+                        else None
+                    )
+
+                    for attribute_delta in attribute_deltas:
+                        batching.set_generic_object(attribute_delta, attribute_delta_class.OBJECT_FIELD_NAME, self)
+                        encode_attribute_delta(attribute_delta)
+                        if kept_attribute_delta_ids is not None and id(attribute_delta) not in kept_attribute_delta_ids:
+                            old_values.derive_old_value(attribute_delta)
+
+                    def record_delete() -> None:
+                        with account_cost(context_snapshot.cost_account, audit_using):
+
+                            flush_started_at = time.perf_counter()
+
+                            revision = current_revision
+                            is_revision_created = revision is None
+                            if revision is None:
+                                revision_class = get_revision_model()
+                                revision = revision_class()
+                                revision.set_description(context_snapshot.revision_description)
+                                revision.save(using=audit_using)
+                            revision = cast('AbstractRevision', revision)
+
+                            object_delta.set_revision(revision)
+                            object_delta.save(using=audit_using)
+
+                            if context_snapshot.is_coalescing:
+                                coalescing.discard_coalesced_object_delta(revision, object_key)
+
+                            for attribute_delta in attribute_deltas:
+                                attribute_delta.set_revision(revision)
+                                if settings.VALUE_STORE:
+                                    values.encode_attribute_delta(attribute_delta)
+                                attribute_delta.save(using=audit_using)
+                            if settings.METRICS:
+                                metrics.record_flush(
+                                    self.__class__,
+                                    'delete',
+                                    is_revision_created,
+                                    attribute_deltas,
+                                    time.perf_counter() - flush_started_at,
+                                )
+
+                    routers.run_coupled(record_delete, using, audit_using)
+
+                state.flushed_attribute_delta_count += len(attribute_deltas)
                 state.attribute_deltas.clear()
                 state.field_name_to_attribute_delta_index_mapping.clear()
 
                 original_delete(self, *args, **kwargs)
                 exit_stack.pop_all()
 
+                if batch is not None:
+                    batching.add_to_batch(batch, self.__class__, object_delta, attribute_deltas)
+
                 state.is_new = False
 
                 state.is_being_saved = False
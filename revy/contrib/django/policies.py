@@ -0,0 +1,139 @@
+import functools
+from typing import (
+    Dict,
+    FrozenSet,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    cast,
+)
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import (
+    Field,
+    Model,
+)
+from django.db.models.options import Options
+from django.utils.module_loading import import_string
+
+from revy.contrib.django.conf import settings
+
+
+__all__ = (
+    'get_model_field_policy',
+    'get_model_field_policy_key',
+    'get_field_type_policies',
+    'get_field_type_policies_key',
+    'is_field_tracked',
+    'get_tracked_fields',
+    'get_diff_field_names',
+    'clear_caches',
+)
+
+
+def get_model_field_policy(
+    model: Type[Model],
+) -> Mapping[str, Sequence[str]]:
+    label_lower = cast(Options, model._meta).label_lower  # noqa
+    for model_label, policy in settings.MODEL_FIELDS.items():
+        if model_label.lower() == label_lower:
+            return policy
+    return {}
+
+
+def get_model_field_policy_key(
+    model: Type[Model],
+) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    return tuple(
+        (key, tuple(field_names))
+        for key, field_names in sorted(get_model_field_policy(model).items())
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_field_type_policies() -> Tuple[Tuple[type, bool], ...]:
+    policies = []
+    for field_class_path, is_tracked in settings.FIELD_TYPE_POLICIES.items():
+        try:
+            field_class = import_string(field_class_path)
+        except ImportError:
+            raise ImproperlyConfigured(
+                f"{settings.FIELD_TYPE_POLICIES_ATTNAME} refers to field class '{field_class_path}' "
+                f"that could not be imported",
+            )
+        policies.append((field_class, bool(is_tracked)))
+    return tuple(policies)
+
+
+def get_field_type_policies_key() -> Tuple[Tuple[str, bool], ...]:
+    return tuple(
+        (field_class_path, bool(is_tracked))
+        for field_class_path, is_tracked in sorted(settings.FIELD_TYPE_POLICIES.items())
+    )
+
+
+def _get_field_type_policy(
+    field: Field,
+) -> Optional[bool]:
+    policies = dict(get_field_type_policies())
+    for field_class in type(field).__mro__:
+        if field_class in policies:
+            return policies[field_class]
+    return None
+
+
+def is_field_tracked(
+    model: Type[Model],
+    field: Field,
+) -> bool:
+    if field.one_to_many or field.many_to_many:
+        return False
+    if getattr(field, 'column', None) is None:
+        return False
+    if field.primary_key:
+        return True
+    field_names = {field.name, field.attname}
+    policy = get_model_field_policy(model)
+    included_field_names = policy.get('include')
+    if included_field_names is not None:
+        return not field_names.isdisjoint(included_field_names)
+    if not field_names.isdisjoint(policy.get('exclude', ())):
+        return False
+    field_type_policy = _get_field_type_policy(field)
+    if field_type_policy is not None:
+        return field_type_policy
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def get_tracked_fields(
+    model: Type[Model],
+) -> Mapping[str, Field]:
+    options = cast(Options, model._meta)  # noqa
+    tracked_fields: Dict[str, Field] = {}
+    for field in options.get_fields():
+        if not isinstance(field, Field) or not is_field_tracked(model, field):
+            continue
+        tracked_fields[field.name] = field
+        tracked_fields[field.attname] = field
+    return tracked_fields
+
+
+@functools.lru_cache(maxsize=None)
+def get_diff_field_names(
+    model: Type[Model],
+) -> FrozenSet[str]:
+    diff_field_names = get_model_field_policy(model).get('diff', ())
+    return frozenset(
+        field.attname
+        for field in set(get_tracked_fields(model).values())
+        if field.name in diff_field_names or field.attname in diff_field_names
+    )
+
+
+def clear_caches() -> None:
+    get_field_type_policies.cache_clear()
+    get_tracked_fields.cache_clear()
+    get_diff_field_names.cache_clear()
@@ -0,0 +1,378 @@
+from collections import defaultdict
+import functools
+import operator
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.db import (
+    connections,
+    models,
+)
+from django.db.models import (
+    Field,
+    Model,
+    Prefetch,
+)
+from django.db.models.base import (
+    DEFERRED,
+    ModelState,
+)
+from django.db.models.fields.related import ForeignKey
+from django.db.models.options import Options
+from django.db.models.query import (
+    ModelIterable,
+    get_related_populators,
+)
+from django.db.models.signals import (
+    post_init,
+    pre_init,
+)
+
+from revy.contrib.django.utils import (
+    get_attribute_delta_model,
+    get_delta_model,
+)
+
+
+__all__ = (
+    'get_generic_attnames',
+    'fetch_generic_objects',
+    'collect_generic_objects',
+    'get_table_estimate',
+    'estimate_count',
+    'DeltaQuerySet',
+    'RevisionQuerySet',
+    'is_constructed_plainly',
+    'construct_untracked',
+    'UntrackedModelIterable',
+    'untracked',
+    'UntrackedQuerySetMixin',
+    'UntrackedQuerySet',
+)
+
+
+GenericKey = Tuple[int, str]
+
+
+QuerySetT = TypeVar('QuerySetT', bound=models.QuerySet)
+
+
+def get_generic_attnames(
+    model: Type[Model],
+    generic_foreign_key_name: str,
+) -> Tuple[str, str]:
+    options = cast(Options, model._meta)  # noqa
+    generic_foreign_key = cast(GenericForeignKey, options.get_field(generic_foreign_key_name))
+    ct_field = options.get_field(generic_foreign_key.ct_field)
+    fk_field = options.get_field(generic_foreign_key.fk_field)
+    return cast(str, getattr(ct_field, 'attname')), cast(str, getattr(fk_field, 'attname'))
+
+
+def fetch_generic_objects(
+    keys: Iterable[Tuple[Optional[int], Optional[Any]]],
+) -> List[Model]:
+    from django.contrib.contenttypes.models import ContentType
+
+    ordered_keys: Dict[GenericKey, None] = {}
+    for content_type_id, object_id in keys:
+        if content_type_id is None or object_id is None:
+            continue
+        ordered_keys[(content_type_id, str(object_id))] = None
+
+    object_ids_by_content_type_id: DefaultDict[int, List[str]] = defaultdict(list)
+    for content_type_id, object_id in ordered_keys:
+        object_ids_by_content_type_id[content_type_id].append(object_id)
+
+    objects: Dict[GenericKey, Model] = {}
+    for content_type_id, object_ids in object_ids_by_content_type_id.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        pk_field = cast(Options, model._meta).pk  # noqa
+        assert pk_field is not None  # noqa
+        for obj in model._base_manager.filter(pk__in=[pk_field.to_python(object_id) for object_id in object_ids]):
+            objects[(content_type_id, str(obj.pk))] = obj
+
+    return [objects[key] for key in ordered_keys if key in objects]
+
+
+def collect_generic_objects(
+    instances: Iterable[Model],
+    generic_foreign_key_name: str,
+) -> List[Model]:
+    instances = list(instances)
+    if not instances:
+        return []
+    model = instances[0].__class__
+    generic_foreign_key = cast(GenericForeignKey, cast(Options, model._meta).get_field(generic_foreign_key_name))  # noqa
+    if not all(generic_foreign_key.is_cached(instance) for instance in instances):
+        ct_attname, fk_attname = get_generic_attnames(model, generic_foreign_key_name)
+        return fetch_generic_objects(
+            (getattr(instance, ct_attname), getattr(instance, fk_attname))
+            for instance in instances
+        )
+    objects: Dict[Tuple[type, Any], Model] = {}
+    for instance in instances:
+        obj = generic_foreign_key.get_cached_value(instance)
+        if obj is not None:
+            objects.setdefault((obj.__class__, obj.pk), obj)
+    return list(objects.values())
+
+
+def get_table_estimate(
+    queryset: models.QuerySet,
+) -> Optional[int]:
+    connection = connections[queryset.db]
+    db_table = cast(Options, queryset.model._meta).db_table  # noqa
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)'
+    elif connection.vendor == 'mysql':
+        sql = 'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s'
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [connection.ops.quote_name(db_table) if connection.vendor == 'postgresql' else db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def estimate_count(
+    queryset: models.QuerySet,
+    limit: int,
+) -> Tuple[int, bool]:
+    if not queryset.query.has_filters():
+        table_estimate = get_table_estimate(queryset)
+        if table_estimate is not None and table_estimate > limit:
+            return table_estimate, False
+    count = queryset.order_by()[:limit + 1].count()
+    if count > limit:
+        return limit, False
+    return count, True
+
+
+class DeltaQuerySet(models.QuerySet):
+
+    @classmethod
+    def get_attribute_deltas_accessor_name(cls) -> str:
+        attribute_delta_class = get_attribute_delta_model()
+        options = cast(Options, attribute_delta_class._meta)  # noqa
+        object_delta_field = cast(ForeignKey, options.get_field(attribute_delta_class.OBJECT_DELTA_FIELD_NAME))
+        return cast(str, object_delta_field.remote_field.get_accessor_name())
+
+    def for_object(
+        self: QuerySetT,
+        instance: Model,
+    ) -> QuerySetT:
+        from django.contrib.contenttypes.models import ContentType
+
+        ct_attname, fk_attname = get_generic_attnames(self.model, getattr(self.model, 'OBJECT_FIELD_NAME'))
+        return self.filter(**{
+            ct_attname: ContentType.objects.get_for_model(instance).pk,
+            fk_attname: str(instance.pk),
+        })
+
+    def prefetch_attribute_deltas(
+        self: QuerySetT,
+        queryset: Optional[models.QuerySet] = None,
+    ) -> QuerySetT:
+        if queryset is None:
+            queryset = get_attribute_delta_model()._default_manager.order_by('pk')
+        return self.prefetch_related(
+            Prefetch(
+                DeltaQuerySet.get_attribute_deltas_accessor_name(),
+                queryset=queryset,
+            ),
+        )
+
+    def prefetch_actors(self: QuerySetT) -> QuerySetT:
+        return self.prefetch_related(getattr(self.model, 'ACTOR_FIELD_NAME'))
+
+    def prefetch_contents(self: QuerySetT) -> QuerySetT:
+        return self.prefetch_related(getattr(self.model, 'OBJECT_FIELD_NAME'))
+
+
+class RevisionQuerySet(models.QuerySet):
+
+    @classmethod
+    def get_deltas_accessor_name(cls) -> str:
+        delta_class = get_delta_model()
+        options = cast(Options, delta_class._meta)  # noqa
+        revision_field = cast(ForeignKey, options.get_field(delta_class.REVISION_FIELD_NAME))
+        return cast(str, revision_field.remote_field.get_accessor_name())
+
+    def prefetch_deltas(
+        self,
+        actors: bool = False,
+        contents: bool = False,
+    ) -> 'RevisionQuerySet':
+        delta_class = get_delta_model()
+        deltas = cast(DeltaQuerySet, delta_class._default_manager.all())
+        if actors:
+            deltas = deltas.prefetch_actors()
+        if contents:
+            deltas = deltas.prefetch_contents()
+        return self.prefetch_related(
+            Prefetch(
+                RevisionQuerySet.get_deltas_accessor_name(),
+                queryset=deltas,
+            ),
+        )
+
+    def prefetch_actors(self) -> 'RevisionQuerySet':
+        return self.prefetch_deltas(actors=True)
+
+    def prefetch_contents(self) -> 'RevisionQuerySet':
+        return self.prefetch_deltas(contents=True)
+
+
+def is_constructed_plainly(
+    model: Type[Model],
+) -> bool:
+    from revy.contrib.django.patcher import Patcher
+
+    init = model.__init__
+    while True:
+        method_patch_data = getattr(init, Patcher.PATCH_DATA_ATTNAME, None)
+        if method_patch_data is None:
+            break
+        init = method_patch_data.original_method
+    from_db = getattr(model.from_db, '__func__', None)
+    method_patch_data = getattr(from_db, Patcher.PATCH_DATA_ATTNAME, None)
+    if method_patch_data is not None:
+        from_db = method_patch_data.original_method
+    return init is Model.__init__ and from_db is getattr(Model.from_db, '__func__')
+
+
+def construct_untracked(
+    model: Type[Model],
+    db: str,
+    field_names: List[str],
+    values: Sequence[Any],
+) -> Model:
+    concrete_fields = cast(Options, model._meta).concrete_fields  # noqa
+    if len(values) != len(concrete_fields):
+        values_iter = iter(values)
+        values = [
+            next(values_iter) if field.attname in field_names else DEFERRED
+            for field in concrete_fields
+        ]
+    pre_init.send(sender=model, args=values, kwargs={})
+    instance = model.__new__(model)
+    instance_dict = instance.__dict__
+    model_state = ModelState()
+    model_state.adding = False
+    model_state.db = db
+    instance_dict['_state'] = model_state
+    for value, field in zip(values, concrete_fields):
+        if value is not DEFERRED:
+            instance_dict[field.attname] = value
+    post_init.send(sender=model, instance=instance)
+    return instance
+
+
+class UntrackedModelIterable(ModelIterable):
+
+    def __iter__(self) -> Iterator[Model]:
+        from revy.contrib.django.utils import get_context_class
+
+        queryset = self.queryset
+        db = queryset.db
+        compiler = queryset.query.get_compiler(using=db)
+        results = compiler.execute_sql(
+            chunked_fetch=self.chunked_fetch,
+            chunk_size=self.chunk_size,
+        )
+        select, klass_info, annotation_col_map = (
+            compiler.select,
+            compiler.klass_info,
+            compiler.annotation_col_map,
+        )
+        model = klass_info['model']
+        select_fields = klass_info['select_fields']
+        model_fields_start, model_fields_end = select_fields[0], select_fields[-1] + 1
+        init_list = [
+            column[0].target.attname
+            for column in select[model_fields_start:model_fields_end]
+        ]
+        related_populators = get_related_populators(klass_info, select, db)  # type: ignore[call-arg]
+        known_related_objects = [
+            (
+                field,
+                related_objects,
+                operator.attrgetter(*[
+                    field.attname
+                    if from_field == 'self'
+                    else cast(Field, cast(Options, queryset.model._meta).get_field(from_field)).attname  # noqa
+                    for from_field in field.from_fields
+                ]),
+            )
+            for field, related_objects in getattr(queryset, '_known_related_objects').items()
+        ]
+
+        context_class = get_context_class()
+
+        construct: Callable[[List[str], Sequence[Any]], Model]
+        if is_constructed_plainly(model):
+            construct = functools.partial(construct_untracked, model, db)
+        else:
+
+            def construct(
+                field_names: List[str],
+                values: Sequence[Any],
+            ) -> Model:
+                with context_class.as_disabled():
+                    return model.from_db(db, field_names, values)
+
+        for row in compiler.results_iter(results):
+            instance = construct(init_list, row[model_fields_start:model_fields_end])
+            if related_populators:
+                with context_class.as_disabled():
+                    for related_populator in related_populators:
+                        related_populator.populate(row, instance)
+            for attname, column_position in annotation_col_map.items():
+                setattr(instance, attname, row[column_position])
+            for field, related_objects, get_related_object_id in known_related_objects:
+                if field.is_cached(instance):
+                    continue
+                related_object = related_objects.get(get_related_object_id(instance))
+                if related_object is not None:
+                    setattr(instance, field.name, related_object)
+            yield instance
+
+
+def untracked(
+    queryset: QuerySetT,
+) -> QuerySetT:
+    queryset = queryset.all()
+    if queryset._iterable_class is ModelIterable:  # noqa
+        queryset._iterable_class = UntrackedModelIterable  # noqa
+    return queryset
+
+
+class UntrackedQuerySetMixin:
+
+    def untracked(self) -> models.QuerySet:
+        return untracked(cast(models.QuerySet, self))
+
+
+class UntrackedQuerySet(
+    UntrackedQuerySetMixin,
+    models.QuerySet,
+):
+    ...
@@ -0,0 +1,116 @@
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Type,
+)
+
+from django.apps import apps
+from django.db import (
+    router,
+    transaction,
+)
+from django.db.models import Model
+
+from revy.contrib.django.conf import settings
+from revy.contrib.django.utils import get_object_delta_model
+
+
+__all__ = (
+    'is_audit_model',
+    'get_audit_database',
+    'get_instance_database',
+    'run_coupled',
+    'AuditRouter',
+)
+
+
+def is_audit_model(
+    model: Type[Model],
+) -> bool:
+    from revy.contrib.django.models import (
+        AbstractDelta,
+        AbstractRevision,
+        ValueBlob,
+    )
+
+    return issubclass(model, (AbstractRevision, AbstractDelta, ValueBlob))
+
+
+def get_audit_database() -> str:
+    if settings.DATABASE is not None:
+        return settings.DATABASE
+    return router.db_for_write(get_object_delta_model())
+
+
+def get_instance_database(
+    instance: Model,
+    using: Optional[str] = None,
+) -> str:
+    return using or router.db_for_write(instance.__class__, instance=instance)
+
+
+def run_coupled(
+    function: Callable[[], None],
+    using: str,
+    audit_using: str,
+) -> None:
+    if using == audit_using:
+        function()
+        return
+
+    def run() -> None:
+        with transaction.atomic(using=audit_using):
+            function()
+
+    transaction.on_commit(run, using=using)
+
+
+class AuditRouter:
+
+    def db_for_read(
+        self,
+        model: Type[Model],
+        **hints: Any,
+    ) -> Optional[str]:
+        if settings.DATABASE is not None and is_audit_model(model):
+            return settings.DATABASE
+        return None
+
+    def db_for_write(
+        self,
+        model: Type[Model],
+        **hints: Any,
+    ) -> Optional[str]:
+        if settings.DATABASE is not None and is_audit_model(model):
+            return settings.DATABASE
+        return None
+
+    def allow_relation(
+        self,
+        obj1: Model,
+        obj2: Model,
+        **hints: Any,
+    ) -> Optional[bool]:
+        if settings.DATABASE is None:
+            return None
+        if is_audit_model(obj1.__class__) or is_audit_model(obj2.__class__):
+            return True
+        return None
+
+    def allow_migrate(
+        self,
+        db: str,
+        app_label: str,
+        model_name: Optional[str] = None,
+        **hints: Any,
+    ) -> Optional[bool]:
+        if settings.DATABASE is None or model_name is None:
+            return None
+        try:
+            model = apps.get_model(app_label, model_name)
+        except LookupError:
+            return None
+        if is_audit_model(model):
+            return db == settings.DATABASE
+        return None
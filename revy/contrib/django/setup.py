@@ -1,6 +1,8 @@
 from contextlib import suppress
 from typing import (
     Any,
+    Dict,
+    Hashable,
     List,
     Type,
     cast,
@@ -8,17 +10,65 @@ from typing import (
 
 from django.apps import apps
 from django.db.models import Model
+from django.utils.module_loading import import_string
 
+from revy.context import Context
+
+from revy.contrib.django import (
+    field_codecs,
+    policies,
+)
 from revy.contrib.django.conf import settings
 from revy.contrib.django.patcher import Patcher
+from revy.contrib.django.utils import (
+    clear_registry,
+    get_registry,
+    load_registry,
+)
+from revy.globals import set_global_storage
 
 
 __all__ = (
     'setup',
+    'teardown',
+    'recompile',
 )
 
 
-_PATCHED_MODELS: List[Type[Model]] = []
+_PATCHED_MODELS: Dict[Type[Model], Hashable] = {}
+
+
+def _get_models() -> List[Type[Model]]:
+    if '*' in settings.MODELS:
+        return apps.get_models(
+            include_auto_created=settings.INCLUDE_AUTO_CREATED_MODELS,
+        )
+    return [
+        cast(Type[Model], apps.get_model(model_name))
+        for model_name in settings.MODELS
+    ]
+
+
+def _get_model_signature(
+    model: Type[Model],
+    global_signature: Hashable,
+) -> Hashable:
+    return (
+        global_signature,
+        policies.get_model_field_policy_key(model),
+    )
+
+
+def _setup_storage() -> None:
+    storage_class = import_string(settings.STORAGE)
+    if type(Context._storage) is not storage_class:
+        set_global_storage(storage_class())
+
+
+def teardown() -> None:
+    for patched_model in reversed(_PATCHED_MODELS):
+        Patcher.unpatch_model(patched_model)
+    _PATCHED_MODELS.clear()
 
 
 def setup(
@@ -28,24 +78,59 @@ def setup(
     setting = kwargs.get('setting', '')
     if setting and not setting.startswith('REVY_'):
         return
-    for patched_model in _PATCHED_MODELS:
-        Patcher.unpatch_model(patched_model)
-    _PATCHED_MODELS.clear()
+    if setting:
+        settings.reload()
     is_revy_installed = False
     with suppress(LookupError):
         revy_app_config = apps.get_app_config('revy')
         is_revy_installed = revy_app_config is not None
     if not is_revy_installed:
+        policies.clear_caches()
+        field_codecs.clear_caches()
+        teardown()
+        clear_registry()
         return
-    models: List[Type[Model]] = []
-    if '*' in settings.MODELS:
-        models = apps.get_models(
-            include_auto_created=settings.INCLUDE_AUTO_CREATED_MODELS,
-        )
-    else:
-        for model_name in settings.MODELS:
-            model = cast(Type[Model], apps.get_model(model_name))
-            models.append(model)
-    for model in models:
-        Patcher.patch_model(model)
-        _PATCHED_MODELS.append(model)
+    _setup_storage()
+    load_registry()
+
+    global_signature = (
+        settings.LAZY_PATCHING,
+        get_registry(),
+        policies.get_field_type_policies_key(),
+    )
+    signatures = {
+        model: _get_model_signature(model, global_signature)
+        for model in _get_models()
+    }
+    stale_models = [
+        patched_model
+        for patched_model, signature in _PATCHED_MODELS.items()
+        if signatures.get(patched_model) != signature
+    ]
+    stale_bases = tuple(stale_models)
+    stale_models.extend(
+        model
+        for model in signatures
+        if model in _PATCHED_MODELS and model not in stale_bases and issubclass(model, stale_bases)
+    )
+    if not stale_models and len(signatures) == len(_PATCHED_MODELS):
+        return
+
+    policies.clear_caches()
+    field_codecs.clear_caches()
+    for stale_model in reversed(stale_models):
+        Patcher.unpatch_model(stale_model)
+        del _PATCHED_MODELS[stale_model]
+    for model, signature in signatures.items():
+        if model in _PATCHED_MODELS:
+            continue
+        if settings.LAZY_PATCHING:
+            Patcher.patch_model_lazily(model)
+        else:
+            Patcher.patch_model(model)
+        _PATCHED_MODELS[model] = signature
+
+
+def recompile() -> None:
+    for patched_model in _PATCHED_MODELS:
+        Patcher.recompile_model(patched_model)
@@ -0,0 +1,385 @@
+import dataclasses
+import datetime
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    cast,
+)
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import (
+    Avg,
+    Count,
+    Field,
+    Model,
+    QuerySet,
+    TextField,
+)
+from django.db.models.functions import (
+    Cast,
+    Length,
+    Trunc,
+)
+from django.db.models.options import Options
+from django.utils import timezone
+
+from revy.contrib.django.routers import get_audit_database
+from revy.contrib.django.utils import (
+    get_attribute_delta_model,
+    get_object_delta_model,
+)
+
+
+__all__ = (
+    'BUCKET_SIZES',
+    'FieldStats',
+    'ModelStats',
+    'WriteRateBucket',
+    'HotObject',
+    'HistoryStats',
+    'collect_stats',
+)
+
+
+BUCKET_SIZES = {
+    'minute': datetime.timedelta(minutes=1),
+    'hour': datetime.timedelta(hours=1),
+    'day': datetime.timedelta(days=1),
+}
+
+
+@dataclasses.dataclass()
+class FieldStats:
+
+    field_name: str = dataclasses.field(
+        kw_only=True,
+    )
+
+    attribute_delta_count: int = dataclasses.field(
+        kw_only=True,
+        default=0,
+    )
+
+    average_old_value_size: Optional[float] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    average_new_value_size: Optional[float] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+
+@dataclasses.dataclass()
+class ModelStats:
+
+    model_label: str = dataclasses.field(
+        kw_only=True,
+    )
+
+    object_delta_count: int = dataclasses.field(
+        kw_only=True,
+        default=0,
+    )
+
+    attribute_delta_count: int = dataclasses.field(
+        kw_only=True,
+        default=0,
+    )
+
+    fields: List[FieldStats] = dataclasses.field(
+        kw_only=True,
+        default_factory=list,
+    )
+
+
+@dataclasses.dataclass()
+class WriteRateBucket:
+
+    started_at: datetime.datetime = dataclasses.field(
+        kw_only=True,
+    )
+
+    object_delta_count: int = dataclasses.field(
+        kw_only=True,
+        default=0,
+    )
+
+    attribute_delta_count: int = dataclasses.field(
+        kw_only=True,
+        default=0,
+    )
+
+
+@dataclasses.dataclass()
+class HotObject:
+
+    model_label: str = dataclasses.field(
+        kw_only=True,
+    )
+
+    object_id: Optional[str] = dataclasses.field(
+        kw_only=True,
+    )
+
+    object_delta_count: int = dataclasses.field(
+        kw_only=True,
+        default=0,
+    )
+
+
+@dataclasses.dataclass()
+class HistoryStats:
+
+    since: Optional[datetime.datetime] = dataclasses.field(
+        kw_only=True,
+        default=None,
+    )
+
+    bucket: str = dataclasses.field(
+        kw_only=True,
+    )
+
+    models: List[ModelStats] = dataclasses.field(
+        kw_only=True,
+        default_factory=list,
+    )
+
+    write_rate: List[WriteRateBucket] = dataclasses.field(
+        kw_only=True,
+        default_factory=list,
+    )
+
+    hot_objects: List[HotObject] = dataclasses.field(
+        kw_only=True,
+        default_factory=list,
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+def _get_ct_fk_attnames(
+    delta_model: Type[Model],
+    generic_fk_field_name: str,
+) -> Tuple[str, str]:
+    options = cast(Options, delta_model._meta)  # noqa
+    generic_fk_field = cast(
+        GenericForeignKey,
+        options.get_field(generic_fk_field_name),
+    )
+    ct_field = cast(Field, options.get_field(generic_fk_field.ct_field))
+    fk_field = cast(Field, options.get_field(generic_fk_field.fk_field))
+    return ct_field.attname, fk_field.attname
+
+
+def _get_model_label(
+    content_type_id: Optional[int],
+    using: str,
+) -> str:
+    if content_type_id is None:
+        return ''
+    content_type = ContentType.objects.db_manager(using).get_for_id(  # type: ignore[attr-defined]
+        content_type_id,
+    )
+    return f'{content_type.app_label}.{content_type.model}'
+
+
+def _filter_since(
+    queryset: QuerySet,
+    created_at_field_name: str,
+    since: Optional[datetime.datetime],
+) -> QuerySet:
+    if since is None:
+        return queryset
+    return queryset.filter(**{
+        f'{created_at_field_name}__gte': since,
+    })
+
+
+def _get_value_size(
+    field_name: str,
+) -> Length:
+    return Length(Cast(field_name, output_field=TextField()))
+
+
+def collect_stats(
+    since: Optional[datetime.datetime] = None,
+    bucket: str = 'hour',
+    buckets: int = 24,
+    hot_objects_limit: int = 10,
+    using: Optional[str] = None,
+) -> HistoryStats:
+    if bucket not in BUCKET_SIZES:
+        raise ValueError(f'bucket must be one of: {", ".join(BUCKET_SIZES.keys())}')
+    if buckets < 1:
+        raise ValueError('buckets must be a positive integer')
+    if hot_objects_limit < 1:
+        raise ValueError('hot_objects_limit must be a positive integer')
+
+    using = using or get_audit_database()
+
+    object_delta_model = get_object_delta_model()
+    attribute_delta_model = get_attribute_delta_model()
+
+    object_deltas = _filter_since(
+        object_delta_model._default_manager.using(using),
+        object_delta_model.CREATED_AT_FIELD_NAME,
+        since,
+    )
+    attribute_deltas = _filter_since(
+        attribute_delta_model._default_manager.using(using),
+        attribute_delta_model.CREATED_AT_FIELD_NAME,
+        since,
+    )
+
+    obj_ct_attname, obj_fk_attname = _get_ct_fk_attnames(
+        object_delta_model,
+        object_delta_model.OBJECT_FIELD_NAME,
+    )
+    att_ct_attname, _ = _get_ct_fk_attnames(
+        attribute_delta_model,
+        attribute_delta_model.OBJECT_FIELD_NAME,
+    )
+
+    models: Dict[Optional[int], ModelStats] = {}
+
+    def get_model_stats(
+        content_type_id: Optional[int],
+    ) -> ModelStats:
+        if content_type_id not in models:
+            models[content_type_id] = ModelStats(
+                model_label=_get_model_label(content_type_id, using),
+            )
+        return models[content_type_id]
+
+    object_delta_counts = object_deltas.order_by().values(
+        obj_ct_attname,
+    ).annotate(
+        count=Count('pk'),
+    ).values_list(
+        obj_ct_attname,
+        'count',
+    )
+    for content_type_id, count in object_delta_counts:
+        get_model_stats(content_type_id).object_delta_count = count
+
+    field_stats = attribute_deltas.order_by().values(
+        att_ct_attname,
+        attribute_delta_model.ATTRIBUTE_NAME_FIELD_NAME,
+    ).annotate(
+        count=Count('pk'),
+        old_value_size=Avg(_get_value_size(attribute_delta_model.OLD_VALUE_FIELD_NAME)),
+        new_value_size=Avg(_get_value_size(attribute_delta_model.NEW_VALUE_FIELD_NAME)),
+    ).values_list(
+        att_ct_attname,
+        attribute_delta_model.ATTRIBUTE_NAME_FIELD_NAME,
+        'count',
+        'old_value_size',
+        'new_value_size',
+    )
+    for content_type_id, field_name, count, old_value_size, new_value_size in field_stats:
+        model_stats = get_model_stats(content_type_id)
+        model_stats.attribute_delta_count += count
+        model_stats.fields.append(
+            FieldStats(
+                field_name=field_name,
+                attribute_delta_count=count,
+                average_old_value_size=old_value_size,
+                average_new_value_size=new_value_size,
+            ),
+        )
+
+    for model_stats in models.values():
+        model_stats.fields.sort(key=lambda field: -field.attribute_delta_count)
+
+    window_started_at = timezone.now() - BUCKET_SIZES[bucket] * buckets
+    if since is not None and since > window_started_at:
+        window_started_at = since
+
+    write_rate: Dict[datetime.datetime, WriteRateBucket] = {}
+
+    def get_write_rate_bucket(
+        started_at: datetime.datetime,
+    ) -> WriteRateBucket:
+        if started_at not in write_rate:
+            write_rate[started_at] = WriteRateBucket(started_at=started_at)
+        return write_rate[started_at]
+
+    object_delta_rate = _filter_since(
+        object_delta_model._default_manager.using(using),
+        object_delta_model.CREATED_AT_FIELD_NAME,
+        window_started_at,
+    ).order_by().annotate(
+        bucket=Trunc(object_delta_model.CREATED_AT_FIELD_NAME, bucket),
+    ).values(
+        'bucket',
+    ).annotate(
+        count=Count('pk'),
+    ).values_list(
+        'bucket',
+        'count',
+    )
+    for started_at, count in object_delta_rate:
+        get_write_rate_bucket(started_at).object_delta_count = count
+
+    attribute_delta_rate = _filter_since(
+        attribute_delta_model._default_manager.using(using),
+        attribute_delta_model.CREATED_AT_FIELD_NAME,
+        window_started_at,
+    ).order_by().annotate(
+        bucket=Trunc(attribute_delta_model.CREATED_AT_FIELD_NAME, bucket),
+    ).values(
+        'bucket',
+    ).annotate(
+        count=Count('pk'),
+    ).values_list(
+        'bucket',
+        'count',
+    )
+    for started_at, count in attribute_delta_rate:
+        get_write_rate_bucket(started_at).attribute_delta_count = count
+
+    hot_objects = _filter_since(
+        object_delta_model._default_manager.using(using),
+        object_delta_model.CREATED_AT_FIELD_NAME,
+        window_started_at,
+    ).order_by().values(
+        obj_ct_attname,
+        obj_fk_attname,
+    ).annotate(
+        count=Count('pk'),
+    ).order_by(
+        '-count',
+    ).values_list(
+        obj_ct_attname,
+        obj_fk_attname,
+        'count',
+    )[:hot_objects_limit]
+
+    return HistoryStats(
+        since=since,
+        bucket=bucket,
+        models=sorted(
+            models.values(),
+            key=lambda model: -(model.object_delta_count + model.attribute_delta_count),
+        ),
+        write_rate=[
+            write_rate[started_at]
+            for started_at in sorted(write_rate.keys())
+        ],
+        hot_objects=[
+            HotObject(
+                model_label=_get_model_label(content_type_id, using),
+                object_id=object_id,
+                object_delta_count=count,
+            )
+            for content_type_id, object_id, count in hot_objects
+        ],
+    )
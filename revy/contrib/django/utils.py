@@ -1,5 +1,7 @@
+import dataclasses
 from json import JSONEncoder
 from typing import (
+    Optional,
     TYPE_CHECKING,
     Type,
     cast,
@@ -22,6 +24,11 @@ if TYPE_CHECKING:
 
 
 __all__ = (
+    'Registry',
+    'build_registry',
+    'load_registry',
+    'clear_registry',
+    'get_registry',
     'get_revision_model',
     'get_delta_model',
     'get_object_delta_model',
@@ -55,7 +62,7 @@ def _get_swappable_model(
     return model
 
 
-def get_revision_model() -> Type['AbstractRevision']:
+def _resolve_revision_model() -> Type['AbstractRevision']:
     from revy.contrib.django.conf import settings
     return cast(
         Type['AbstractRevision'],
@@ -66,7 +73,7 @@ def get_revision_model() -> Type['AbstractRevision']:
     )
 
 
-def get_delta_model() -> Type['AbstractDelta']:
+def _resolve_delta_model() -> Type['AbstractDelta']:
     from revy.contrib.django.conf import settings
     return cast(
         Type['AbstractDelta'],
@@ -77,7 +84,7 @@ def get_delta_model() -> Type['AbstractDelta']:
     )
 
 
-def get_object_delta_model() -> Type['AbstractObjectDelta']:
+def _resolve_object_delta_model() -> Type['AbstractObjectDelta']:
     from revy.contrib.django.conf import settings
     return cast(
         Type['AbstractObjectDelta'],
@@ -88,7 +95,7 @@ def get_object_delta_model() -> Type['AbstractObjectDelta']:
     )
 
 
-def get_attribute_delta_model() -> Type['AbstractAttributeDelta']:
+def _resolve_attribute_delta_model() -> Type['AbstractAttributeDelta']:
     from revy.contrib.django.conf import settings
     return cast(
         Type['AbstractAttributeDelta'],
@@ -99,7 +106,7 @@ def get_attribute_delta_model() -> Type['AbstractAttributeDelta']:
     )
 
 
-def get_json_encoder_class() -> Type[JSONEncoder]:
+def _resolve_json_encoder_class() -> Type[JSONEncoder]:
     from revy.contrib.django.conf import settings
     return cast(
         Type[JSONEncoder],
@@ -107,9 +114,102 @@ def get_json_encoder_class() -> Type[JSONEncoder]:
     )
 
 
-def get_context_class() -> Type['Context']:
+def _resolve_context_class() -> Type['Context']:
     from revy.contrib.django.conf import settings
     return cast(
         Type['Context'],
         import_string(settings.CONTEXT_CLASS),
     )
+
+
+@dataclasses.dataclass(frozen=True)
+class Registry:
+
+    revision_model: Type['AbstractRevision'] = dataclasses.field(
+        kw_only=True,
+    )
+
+    delta_model: Type['AbstractDelta'] = dataclasses.field(
+        kw_only=True,
+    )
+
+    object_delta_model: Type['AbstractObjectDelta'] = dataclasses.field(
+        kw_only=True,
+    )
+
+    attribute_delta_model: Type['AbstractAttributeDelta'] = dataclasses.field(
+        kw_only=True,
+    )
+
+    json_encoder_class: Type[JSONEncoder] = dataclasses.field(
+        kw_only=True,
+    )
+
+    context_class: Type['Context'] = dataclasses.field(
+        kw_only=True,
+    )
+
+
+_registry: Optional[Registry] = None
+
+
+def build_registry() -> Registry:
+    return Registry(
+        revision_model=_resolve_revision_model(),
+        delta_model=_resolve_delta_model(),
+        object_delta_model=_resolve_object_delta_model(),
+        attribute_delta_model=_resolve_attribute_delta_model(),
+        json_encoder_class=_resolve_json_encoder_class(),
+        context_class=_resolve_context_class(),
+    )
+
+
+def load_registry() -> Registry:
+    global _registry
+    _registry = build_registry()
+    return _registry
+
+
+def clear_registry() -> None:
+    global _registry
+    _registry = None
+
+
+def get_registry() -> Optional[Registry]:
+    return _registry
+
+
+def get_revision_model() -> Type['AbstractRevision']:
+    if _registry is not None:
+        return _registry.revision_model
+    return _resolve_revision_model()
+
+
+def get_delta_model() -> Type['AbstractDelta']:
+    if _registry is not None:
+        return _registry.delta_model
+    return _resolve_delta_model()
+
+
+def get_object_delta_model() -> Type['AbstractObjectDelta']:
+    if _registry is not None:
+        return _registry.object_delta_model
+    return _resolve_object_delta_model()
+
+
+def get_attribute_delta_model() -> Type['AbstractAttributeDelta']:
+    if _registry is not None:
+        return _registry.attribute_delta_model
+    return _resolve_attribute_delta_model()
+
+
+def get_json_encoder_class() -> Type[JSONEncoder]:
+    if _registry is not None:
+        return _registry.json_encoder_class
+    return _resolve_json_encoder_class()
+
+
+def get_context_class() -> Type['Context']:
+    if _registry is not None:
+        return _registry.context_class
+    return _resolve_context_class()
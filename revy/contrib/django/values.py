@@ -0,0 +1,110 @@
+import functools
+import hashlib
+import json
+import zlib
+from typing import (
+    Any,
+    Optional,
+    TYPE_CHECKING,
+)
+
+from revy.contrib.django.conf import settings
+from revy.contrib.django.routers import get_audit_database
+from revy.contrib.django.utils import get_json_encoder_class
+
+
+if TYPE_CHECKING:
+    from revy.contrib.django.models import AbstractAttributeDelta
+
+
+__all__ = (
+    'REFERENCE_KEY',
+    'DERIVED_KEY',
+    'is_reference',
+    'is_derived',
+    'get_digest',
+    'load_text',
+    'encode_value',
+    'decode_value',
+    'encode_attribute_delta',
+)
+
+
+REFERENCE_KEY = '__revy__value_blob__'
+
+DERIVED_KEY = '__revy__derived__'
+
+LOADED_TEXT_CACHE_SIZE = 256
+
+
+def is_reference(
+    value: Any,
+) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(REFERENCE_KEY), str)
+
+
+def is_derived(
+    value: Any,
+) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and value.get(DERIVED_KEY) is True
+
+
+def get_digest(
+    data: bytes,
+) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@functools.lru_cache(maxsize=LOADED_TEXT_CACHE_SIZE)
+def load_text(
+    digest: str,
+) -> str:
+    from revy.contrib.django.models import ValueBlob
+    data = ValueBlob.objects.using(get_audit_database()).filter(pk=digest).values_list('data', flat=True).get()
+    return zlib.decompress(bytes(data)).decode()
+
+
+def encode_value(
+    value: Any,
+    using: Optional[str] = None,
+) -> Any:
+    if value is None or is_reference(value) or is_derived(value):
+        return value
+    data = json.dumps(value, cls=get_json_encoder_class()).encode()
+    if len(data) < settings.VALUE_STORE_THRESHOLD:
+        return value
+    from revy.contrib.django.models import ValueBlob
+    digest = get_digest(data)
+    value_blob = ValueBlob(
+        digest=digest,
+        data=zlib.compress(data),
+        size=len(data),
+    )
+    ValueBlob.objects.using(using or get_audit_database()).bulk_create(
+        [value_blob],
+        ignore_conflicts=True,
+    )
+    return {REFERENCE_KEY: digest}
+
+
+def decode_value(
+    value: Any,
+) -> Any:
+    if not is_reference(value):
+        return value
+    return json.loads(load_text(value[REFERENCE_KEY]))
+
+
+def encode_attribute_delta(
+    attribute_delta: 'AbstractAttributeDelta',
+) -> None:
+    using = get_audit_database()
+    for field_name in (
+        attribute_delta.__class__.OLD_VALUE_FIELD_NAME,
+        attribute_delta.__class__.NEW_VALUE_FIELD_NAME,
+    ):
+        setattr(
+            attribute_delta,
+            field_name,
+            encode_value(getattr(attribute_delta, field_name), using),
+        )
@@ -0,0 +1,24 @@
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+)
+
+from revy.contrib.django.metrics import metrics_registry
+
+
+__all__ = (
+    'METRICS_CONTENT_TYPE',
+    'metrics',
+)
+
+
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics(
+    request: HttpRequest,
+) -> HttpResponse:
+    return HttpResponse(
+        metrics_registry.render(),
+        content_type=METRICS_CONTENT_TYPE,
+    )
@@ -0,0 +1,56 @@
+from typing import Optional
+
+
+__all__ = (
+    'CostAccount',
+)
+
+
+class CostAccount:
+
+    parent: Optional['CostAccount']
+
+    statements: int
+
+    rows: int
+
+    duration: float
+
+    def __init__(
+        self,
+        parent: Optional['CostAccount'] = None,
+    ) -> None:
+        self.parent = parent
+        self.statements = 0
+        self.rows = 0
+        self.duration = 0.0
+
+    def add(
+        self,
+        statements: int = 0,
+        rows: int = 0,
+        duration: float = 0.0,
+    ) -> None:
+        cost_account: Optional[CostAccount] = self
+        while cost_account is not None:
+            cost_account.statements += statements
+            cost_account.rows += rows
+            cost_account.duration += duration
+            cost_account = cost_account.parent
+
+    def get_root(self) -> 'CostAccount':
+        cost_account = self
+        while cost_account.parent is not None:
+            cost_account = cost_account.parent
+        return cost_account
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.rows = 0
+        self.duration = 0.0
+
+    def __str__(self) -> str:
+        return f'{self.statements} queries / {self.rows} rows / {self.duration * 1000:.0f} ms'
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}: {self}>'
@@ -1,9 +1,24 @@
-from revy.storages import ASGIRefLocalStorage
+from revy.storages import (
+    ASGIRefLocalStorage,
+    Storage,
+)
 
 
 __all__ = (
     'global_storage',
+    'set_global_storage',
 )
 
 
-global_storage = ASGIRefLocalStorage()
+global_storage: Storage = ASGIRefLocalStorage()
+
+
+def set_global_storage(
+    storage: Storage,
+) -> None:
+    global global_storage
+    import revy
+    from revy.context import Context
+    global_storage = storage
+    revy.global_storage = storage
+    Context._storage = storage
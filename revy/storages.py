@@ -1,10 +1,19 @@
 import abc
+import copy
+from contextvars import ContextVar
 from typing import (
+    Any,
+    Optional,
     TYPE_CHECKING,
     Type,
+    cast,
 )
 
 import stackholm
+from stackholm import (
+    OptimizedListState,
+    State,
+)
 
 
 if TYPE_CHECKING:
@@ -14,6 +23,7 @@ if TYPE_CHECKING:
 __all__ = (
     'Storage',
     'ASGIRefLocalStorage',
+    'ContextVarStorage',
 )
 
 
@@ -33,3 +43,96 @@ class ASGIRefLocalStorage(
     stackholm.ASGIRefLocalStorage,
 ):
     ...
+
+
+class ContextVarStorage(
+    Storage,
+    stackholm.ContextVarStorage,
+):
+
+    _context_var: ContextVar[Optional[State]]  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        *args: Any,
+        context_var: Optional[ContextVar[Optional[State]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            cast(ContextVar[State], context_var or ContextVar(f'revy_state_{id(self)}', default=None)),
+            *args,
+            **kwargs,
+        )
+
+    def get_state(self) -> State:
+        state = self._context_var.get()
+        if state is None:
+            state = self.__class__.get_state_class()()
+            self._context_var.set(state)
+        return state
+
+    def set_state(
+        self,
+        state: State,
+    ) -> None:
+        self._context_var.set(state)
+
+    def copy_state(self) -> OptimizedListState:
+        state = cast(OptimizedListState, self.get_state())
+        state_copy = cast(OptimizedListState, copy.copy(state))
+        state_copy.contexts = list(state.contexts)
+        state_copy.checkpoint_sequences = dict(state.checkpoint_sequences)
+        state_copy.checkpoint_indexes = {
+            key: list(indexes)
+            for key, indexes in state.checkpoint_indexes.items()
+        }
+        state_copy.checkpoint_optimization_mapping = {
+            key: dict(mapping)
+            for key, mapping in state.checkpoint_optimization_mapping.items()
+        }
+        return state_copy
+
+    def push_context(
+        self,
+        context: stackholm.Context,
+    ) -> int:
+        state = self.copy_state()
+        index = state.push_context(context)
+        self.set_state(state)
+        return index
+
+    def pop_context(
+        self,
+        index: int = -1,
+    ) -> Optional[stackholm.Context]:
+        state = self.copy_state()
+        context = state.pop_context(index)
+        self.set_state(state)
+        return context
+
+    def add_checkpoint(
+        self,
+        key: str,
+        context_index: int,
+    ) -> None:
+        state = self.copy_state()
+        state.add_checkpoint(key, context_index)
+        self.set_state(state)
+
+    def remove_checkpoint(
+        self,
+        key: str,
+        context_index: int,
+    ) -> None:
+        state = self.copy_state()
+        state.remove_checkpoint(key, context_index)
+        self.set_state(state)
+
+    def get_last_context(self) -> Optional[stackholm.Context]:
+        return self.get_state().get_last_context()
+
+    def get_nearest_checkpoint(
+        self,
+        key: str,
+    ) -> Optional[stackholm.Context]:
+        return self.get_state().get_nearest_checkpoint(key)
@@ -1,3 +1,23 @@
 from django.contrib import admin
+from ledger.models import (
+    Account,
+    Transaction,
+)
 
-# Register your models here.
+from revy.contrib.django.admin import HistoryAdminMixin
+
+
+@admin.register(Account)
+class AccountAdmin(
+    HistoryAdminMixin,
+    admin.ModelAdmin,
+):
+    pass
+
+
+@admin.register(Transaction)
+class TransactionAdmin(
+    HistoryAdminMixin,
+    admin.ModelAdmin,
+):
+    pass
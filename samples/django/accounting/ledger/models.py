@@ -80,3 +80,13 @@ class Transaction(models.Model):
         if self.local_amount != local_amount:
             with revy.Context.via_attribute_delta_description('Corrected by system.'):
                 self.local_amount = local_amount
+
+
+class Memo(models.Model):
+
+    text = models.CharField(  # type: ignore
+        max_length=255,
+        blank=True,
+        null=True,
+        default=None,
+    )
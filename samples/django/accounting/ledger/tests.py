@@ -1,25 +1,84 @@
+import dataclasses
+import datetime
 import decimal
+import json
+import threading
 from typing import (
     Callable,
+    List,
     Optional,
     cast,
 )
+from unittest import mock
 
+from django.contrib import admin
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import (
+    F,
+    Field,
+)
 from django.db.models.options import Options
-from django.test import TestCase
+from django.db.transaction import atomic
+from django.test import (
+    RequestFactory,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
 from ledger.models import (
     Account,
+    Memo,
     Transaction,
 )
 
 import revy
 import revy.abc
-from revy.contrib.django.models import AbstractRevision
+from revy.contrib.django.admin import CURSOR_VAR
+from revy.contrib.django.aggregates import ObjectSnapshot
+from revy.contrib.django.history import (
+    object_history,
+    paginate_keyset,
+)
+from revy.contrib.django.hooks import (
+    HookEvent,
+    hook_registry,
+)
+from revy.contrib.django import (
+    diffs,
+    field_codecs,
+    metrics,
+    old_values,
+    values,
+)
+from revy.contrib.django.models import (
+    AbstractObjectDelta,
+    AbstractRevision,
+    ModelInstanceState,
+    PendingAttributeDelta,
+    ValueBlob,
+    get_model_instance_state,
+)
+from revy.contrib.django.patcher import Patcher
+from revy.contrib.django.querysets import (
+    DeltaQuerySet,
+    RevisionQuerySet,
+    UntrackedQuerySet,
+    untracked,
+)
+from revy.contrib.django.stats import collect_stats
+from revy.contrib.django.views import metrics as metrics_view
 from revy.contrib.django.utils import (
+    Registry,
     get_attribute_delta_model,
+    get_context_class,
     get_delta_model,
+    get_json_encoder_class,
     get_object_delta_model,
+    get_registry,
     get_revision_model,
 )
 
@@ -239,3 +298,1071 @@ class LedgerTestCase(TestCase):
 
             self.assertEqual(Revision.objects.count(), 1)
             self.assertEqual(ObjectDelta.objects.filter(revision=lazy_revision).count(), object_delta_counter)
+
+    def test_collect_stats(self) -> None:
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0001')
+            account.code = 'E.0002'
+            account.save()
+
+        stats = collect_stats(bucket='day', hot_objects_limit=1)
+
+        account_stats = next(
+            model_stats
+            for model_stats in stats.models
+            if model_stats.model_label == 'ledger.account'
+        )
+        self.assertEqual(account_stats.object_delta_count, 2)
+        self.assertEqual(account_stats.attribute_delta_count, ACCOUNT_MODEL_FIELDS_COUNT + 1)
+
+        code_stats = next(
+            field_stats
+            for field_stats in account_stats.fields
+            if field_stats.field_name == 'code'
+        )
+        self.assertEqual(code_stats.attribute_delta_count, 2)
+        self.assertIsNotNone(code_stats.average_new_value_size)
+
+        self.assertEqual(sum(bucket.object_delta_count for bucket in stats.write_rate), 2)
+        self.assertEqual(len(stats.hot_objects), 1)
+        self.assertEqual(stats.hot_objects[0].object_id, str(account.pk))
+        self.assertEqual(stats.hot_objects[0].object_delta_count, 2)
+
+        with self.assertRaises(ValueError):
+            collect_stats(buckets=0)
+        for option in ('--buckets', '--top'):
+            with self.assertRaises(CommandError):
+                call_command('revy_stats', option, '0')
+            with self.assertRaises(CommandError):
+                call_command('revy_stats', option, '-1')
+
+    def test_cost_account(self) -> None:
+
+        with revy.Context.via_cost_account():
+            account = Account.objects.create(code='E.0001')
+            account.code = 'E.0002'
+            account.save()
+
+            cost_account = revy.Context.get_cost_account()
+
+        assert cost_account is not None  # noqa
+        self.assertEqual(
+            cost_account.statements,
+            Revision.objects.count() + Delta.objects.count() + ObjectDelta.objects.count() + AttributeDelta.objects.count(),
+        )
+        self.assertGreater(cost_account.rows, 0)
+        self.assertGreater(cost_account.duration, 0)
+
+    def test_hooks(self) -> None:
+
+        before_events: List[HookEvent] = []
+        after_events: List[HookEvent] = []
+
+        def before(event: HookEvent) -> None:
+            before_events.append(dataclasses.replace(event))
+
+        def after(event: HookEvent) -> None:
+            after_events.append(event)
+
+        original_save_base = Account.save_base
+
+        hook_registry.register_before(before, operations=[HookEvent.OPERATION_SAVE_BASE])
+        hook_registry.register_after(after)
+        self.addCleanup(hook_registry.unregister, after)
+        self.addCleanup(hook_registry.unregister, before)
+
+        self.assertIsNot(Account.save_base, original_save_base)
+
+        with revy.Context():
+            account = Account(code='E.0001')
+            account.save()
+
+        self.assertEqual(
+            [event.operation for event in before_events],
+            [HookEvent.OPERATION_SAVE_BASE],
+        )
+        # The primary key is assigned, and thus tracked, during the save.
+        self.assertEqual(before_events[0].delta_count, ACCOUNT_MODEL_FIELDS_COUNT - 1)
+
+        save_base_events = [
+            event
+            for event in after_events
+            if event.operation == HookEvent.OPERATION_SAVE_BASE
+        ]
+        self.assertEqual(len(save_base_events), 1)
+        self.assertIs(save_base_events[0].model, Account)
+        self.assertIs(save_base_events[0].instance, account)
+        self.assertEqual(save_base_events[0].delta_count, ACCOUNT_MODEL_FIELDS_COUNT)
+        self.assertIsNotNone(save_base_events[0].duration)
+        self.assertIn(
+            HookEvent.OPERATION_INIT,
+            [event.operation for event in after_events],
+        )
+
+        hook_registry.unregister(before)
+        hook_registry.unregister(after)
+
+        self.assertIs(Account.save_base, original_save_base)
+
+    def test_init_hooks(self) -> None:
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0001')
+
+        init_events: List[HookEvent] = []
+
+        hook_registry.register_after(init_events.append, operations=[HookEvent.OPERATION_INIT])
+        self.addCleanup(hook_registry.unregister, init_events.append)
+
+        with revy.Context():
+            account = Account.objects.get(pk=account.pk)
+            state = get_model_instance_state(account)
+            self.assertFalse(state.is_new)
+            self.assertTrue(state.is_fetched)
+            self.assertEqual(state.attribute_deltas, [])
+            account.code = 'E.0002'
+            account.save()
+
+        self.assertEqual(len(init_events), 1)
+        object_delta = ObjectDelta.objects.latest('pk')
+        self.assertEqual(object_delta.get_action(), ObjectDelta.ACTION_UPDATE)
+        self.assertEqual(
+            [attribute_delta.get_attribute_name() for attribute_delta in object_delta.get_attribute_deltas()],
+            ['code'],
+        )
+
+        with override_settings(REVY_LAZY_PATCHING=True):
+            init_events.clear()
+            with revy.Context():
+                account = Account.objects.get(pk=account.pk)
+            self.assertFalse(Patcher.is_model_patched_lazily(Account))
+            self.assertFalse(get_model_instance_state(account).is_new)
+            self.assertEqual(len(init_events), 1)
+
+    @override_settings(
+        REVY_METRICS=True,
+        REVY_METRICS_ENCODED_BYTES=True,
+    )
+    def test_metrics(self) -> None:
+
+        metrics.metrics_registry.reset()
+
+        transactions_count = 3
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0001')
+            for _ in range(transactions_count):
+                Transaction.objects.create(
+                    account=account,
+                    type=Transaction.TYPE_CREDIT,
+                    amount=decimal.Decimal('1.00'),
+                    iso_4217_code='TZS',
+                    exchange_rate=decimal.Decimal('2.00'),
+                )
+            account.delete()
+
+        self.assertEqual(metrics.revisions_created.get(), 2 + transactions_count * 2)
+        self.assertEqual(metrics.deltas_written.get('ledger.account', 'object'), 2)
+        self.assertEqual(metrics.deltas_written.get('ledger.transaction', 'object'), transactions_count * 2)
+        self.assertEqual(
+            metrics.deltas_written.get('ledger.transaction', 'attribute'),
+            transactions_count * TRANSACTION_MODEL_FIELDS_COUNT,
+        )
+        self.assertGreater(metrics.json_encoded_bytes.get('ledger.transaction'), 0)
+        self.assertEqual(metrics.flush_duration.get_count('ledger.account', 'save'), 1)
+        self.assertEqual(metrics.flush_duration.get_count('ledger.account', 'delete'), 1)
+        self.assertEqual(metrics.cascade_fan_out.get_count('ledger.transaction', 'CASCADE'), 1)
+        self.assertEqual(metrics.cascade_fan_out.get_sum('ledger.transaction', 'CASCADE'), transactions_count)
+
+        shards_count = len(metrics.writes_suppressed.get_shards())
+        for _ in range(3):
+            thread = threading.Thread(target=metrics.writes_suppressed.inc, args=(1, 'ledger.account'))
+            thread.start()
+            thread.join()
+        self.assertEqual(len(metrics.writes_suppressed.get_shards()), shards_count)
+        self.assertEqual(metrics.writes_suppressed.get('ledger.account'), 3)
+
+        response = metrics_view(RequestFactory().get('/metrics'))
+        content = response.content.decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# TYPE revy_deltas_written_total counter', content)
+        self.assertIn('revy_deltas_written_total{model="ledger.account",kind="object"} 2.0', content)
+        self.assertIn('revy_cascade_fan_out_bucket{model="ledger.transaction",handler="CASCADE",le="5.0"} 1.0', content)
+        self.assertIn('revy_cascade_fan_out_count{model="ledger.transaction",handler="CASCADE"} 1.0', content)
+
+    @override_settings(
+        REVY_MODEL_FIELDS={
+            'ledger.Transaction': {
+                'exclude': ['date'],
+            },
+            'ledger.Account': {
+                'include': ['id'],
+            },
+        },
+        REVY_FIELD_TYPE_POLICIES={
+            'django.db.models.DecimalField': False,
+        },
+    )
+    def test_field_policies(self) -> None:
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0001')
+            transaction = Transaction.objects.create(
+                account=account,
+                type=Transaction.TYPE_CREDIT,
+                amount=decimal.Decimal('1.00'),
+                iso_4217_code='TZS',
+                exchange_rate=decimal.Decimal('2.00'),
+            )
+
+        self.assertEqual(
+            set(AttributeDelta.objects.filter(
+                content_type=ContentType.objects.get_for_model(Account),
+            ).values_list('field_name', flat=True)),
+            {'id'},
+        )
+        self.assertEqual(
+            set(AttributeDelta.objects.filter(
+                content_type=ContentType.objects.get_for_model(Transaction),
+            ).values_list('field_name', flat=True)),
+            {'id', 'account_id', 'type', 'iso_4217_code'},
+        )
+
+        object_delta = ObjectDelta.objects.filter(
+            content_type=ContentType.objects.get_for_model(Transaction),
+            content_id=transaction.pk,
+        ).annotate(
+            snapshot=ObjectSnapshot(Transaction),
+        ).get()
+        snapshot = getattr(object_delta, 'snapshot')
+        self.assertIsInstance(snapshot, Transaction)
+        self.assertIsNone(snapshot.amount)
+        self.assertIsNone(snapshot.local_amount)
+
+    @override_settings(
+        REVY_VALUE_STORE=True,
+        REVY_VALUE_STORE_THRESHOLD=64,
+    )
+    def test_value_store(self) -> None:
+
+        long_code = 'E.' + '0' * 100
+
+        with revy.Context():
+            account = Account.objects.create(code=long_code)
+            account.code = 'E.0001'
+            account.save()
+            account.code = long_code
+            account.save()
+
+        self.assertEqual(ValueBlob.objects.count(), 1)
+
+        attribute_deltas = list(AttributeDelta.objects.filter(
+            content_type=ContentType.objects.get_for_model(Account),
+            field_name='code',
+        ).order_by('pk'))
+        self.assertEqual(len(attribute_deltas), 3)
+        self.assertTrue(values.is_reference(getattr(attribute_deltas[0], AttributeDelta.NEW_VALUE_FIELD_NAME)))
+        self.assertEqual(attribute_deltas[0].get_new_value(), long_code)
+        self.assertEqual(attribute_deltas[1].get_old_value(), long_code)
+        self.assertEqual(attribute_deltas[1].get_new_value(), 'E.0001')
+        self.assertEqual(attribute_deltas[2].get_new_value(), long_code)
+
+        object_delta = ObjectDelta.objects.filter(
+            content_type=ContentType.objects.get_for_model(Account),
+        ).annotate(
+            snapshot=ObjectSnapshot(Account),
+        ).earliest('pk')
+        self.assertEqual(getattr(object_delta, 'snapshot').code, long_code)
+
+    @override_settings(
+        REVY_MODEL_FIELDS={
+            'ledger.Account': {
+                'diff': ['code'],
+            },
+        },
+        REVY_DIFF_KEYFRAME_INTERVAL=3,
+    )
+    def test_diff_encoding(self) -> None:
+
+        codes = [
+            'E.' + 'x' * index + '0' * (200 - index)
+            for index in range(6)
+        ]
+
+        with revy.Context():
+            account = Account.objects.create(code=codes[0])
+            for code in codes[1:]:
+                account.code = code
+                account.save()
+
+        diffs._text_cache.clear()
+
+        attribute_deltas = list(AttributeDelta.objects.filter(
+            content_type=ContentType.objects.get_for_model(Account),
+            field_name='code',
+        ).order_by('pk'))
+        raw_new_values = [
+            getattr(attribute_delta, AttributeDelta.NEW_VALUE_FIELD_NAME)
+            for attribute_delta in attribute_deltas
+        ]
+        self.assertEqual(
+            [diffs.is_diff(raw_new_value) for raw_new_value in raw_new_values],
+            [False, True, True, False, True, True],
+        )
+        self.assertEqual(
+            [attribute_delta.get_new_value() for attribute_delta in reversed(attribute_deltas)],
+            list(reversed(codes)),
+        )
+        diffs._text_cache.clear()
+        self.assertEqual(
+            [attribute_delta.get_old_value() for attribute_delta in attribute_deltas],
+            [None] + codes[:-1],
+        )
+
+        diffs._text_cache.clear()
+        snapshots = [
+            getattr(object_delta, 'snapshot')
+            for object_delta in ObjectDelta.objects.filter(
+                content_type=ContentType.objects.get_for_model(Account),
+            ).annotate(
+                snapshot=ObjectSnapshot(Account),
+            ).order_by('pk')
+        ]
+        self.assertEqual([snapshot.code for snapshot in snapshots], codes)
+
+    @override_settings(REVY_OLD_VALUES='never')
+    def test_new_value_only_storage(self) -> None:
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0001')
+            account.code = 'E.0002'
+            account.save()
+            account.code = 'E.0003'
+            account.save()
+
+        attribute_deltas = AttributeDelta.objects.filter(
+            content_type=ContentType.objects.get_for_model(Account),
+            field_name='code',
+        ).order_by('pk')
+
+        self.assertEqual(
+            [getattr(attribute_delta, AttributeDelta.OLD_VALUE_FIELD_NAME) for attribute_delta in attribute_deltas],
+            [{values.DERIVED_KEY: True}] * 3,
+        )
+        self.assertEqual(
+            [attribute_delta.get_old_value() for attribute_delta in attribute_deltas],
+            [None, 'E.0001', 'E.0002'],
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                [
+                    attribute_delta.get_old_value()
+                    for attribute_delta in old_values.annotate_previous_new_values(attribute_deltas)
+                ],
+                [None, 'E.0001', 'E.0002'],
+            )
+
+    @override_settings(REVY_OLD_VALUES='gaps')
+    def test_new_value_only_storage_with_gaps(self) -> None:
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0001')
+            account.code = 'E.0002'
+            account.save()
+
+        Account.objects.filter(pk=account.pk).update(code='E.0003')
+
+        with revy.Context():
+            account = Account.objects.get(pk=account.pk)
+            account.code = 'E.0004'
+            account.save()
+            account.code = 'E.0005'
+            account.save()
+
+        attribute_deltas = AttributeDelta.objects.filter(
+            content_type=ContentType.objects.get_for_model(Account),
+            field_name='code',
+        ).order_by('pk')
+
+        self.assertEqual(
+            [getattr(attribute_delta, AttributeDelta.OLD_VALUE_FIELD_NAME) for attribute_delta in attribute_deltas],
+            [{values.DERIVED_KEY: True}, {values.DERIVED_KEY: True}, 'E.0003', {values.DERIVED_KEY: True}],
+        )
+        self.assertEqual(
+            [attribute_delta.get_old_value() for attribute_delta in attribute_deltas],
+            [None, 'E.0001', 'E.0003', 'E.0004'],
+        )
+
+    @override_settings(REVY_OLD_VALUES='gaps')
+    def test_new_value_only_storage_with_null_gap(self) -> None:
+
+        with revy.Context():
+            memo = Memo.objects.create(text='Cash')
+
+        Memo.objects.filter(pk=memo.pk).update(text=None)
+
+        with revy.Context():
+            memo = Memo.objects.get(pk=memo.pk)
+            memo.text = 'Bank'
+            memo.save()
+
+        attribute_deltas = AttributeDelta.objects.filter(
+            content_type=ContentType.objects.get_for_model(Memo),
+            field_name='text',
+        ).order_by('pk')
+
+        self.assertEqual(
+            [
+                old_values.is_derived(getattr(attribute_delta, AttributeDelta.OLD_VALUE_FIELD_NAME))
+                for attribute_delta in attribute_deltas
+            ],
+            [True, False],
+        )
+        self.assertEqual(
+            [attribute_delta.get_old_value() for attribute_delta in attribute_deltas],
+            [None, None],
+        )
+        self.assertEqual(
+            [
+                attribute_delta.get_old_value()
+                for attribute_delta in old_values.annotate_previous_new_values(attribute_deltas)
+            ],
+            [None, None],
+        )
+
+        with override_settings(REVY_OLD_VALUES='always'):
+            self.assertEqual(
+                [attribute_delta.get_old_value() for attribute_delta in attribute_deltas.all()],
+                [None, None],
+            )
+
+    def test_field_codecs(self) -> None:
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0001')
+            transaction = Transaction.objects.create(
+                account=account,
+                type=Transaction.TYPE_CREDIT,
+                amount=decimal.Decimal('1.25'),
+                iso_4217_code='TZS',
+                exchange_rate=decimal.Decimal('2.00'),
+                date=datetime.date(2024, 2, 29),
+            )
+
+        attribute_deltas = {
+            attribute_delta.get_attribute_name(): attribute_delta
+            for attribute_delta in AttributeDelta.objects.filter(
+                content_type=ContentType.objects.get_for_model(Transaction),
+            )
+        }
+        self.assertEqual(getattr(attribute_deltas['amount'], AttributeDelta.NEW_VALUE_FIELD_NAME), '1.25')
+        self.assertEqual(attribute_deltas['amount'].get_new_value(), decimal.Decimal('1.25'))
+        self.assertEqual(attribute_deltas['date'].get_new_value(), datetime.date(2024, 2, 29))
+
+        object_delta = ObjectDelta.objects.filter(
+            content_type=ContentType.objects.get_for_model(Transaction),
+        ).annotate(
+            snapshot=ObjectSnapshot(Transaction),
+        ).get()
+        snapshot = getattr(object_delta, 'snapshot')
+        self.assertEqual(snapshot.pk, transaction.pk)
+        self.assertEqual(snapshot.account_id, account.pk)
+        self.assertEqual(snapshot.amount, decimal.Decimal('1.25'))
+        self.assertEqual(snapshot.local_amount, decimal.Decimal('2.50'))
+        self.assertEqual(snapshot.date, datetime.date(2024, 2, 29))
+
+    def test_registry(self) -> None:
+
+        registry = get_registry()
+        self.assertIsNotNone(registry)
+        registry = cast(Registry, registry)
+        self.assertIs(get_revision_model(), registry.revision_model)
+        self.assertIs(get_attribute_delta_model(), registry.attribute_delta_model)
+        self.assertIs(get_context_class(), registry.context_class)
+
+        with override_settings(REVY_JSON_ENCODER_CLASS='json.JSONEncoder'):
+            self.assertIsNot(get_registry(), registry)
+            self.assertIs(get_json_encoder_class(), json.JSONEncoder)
+
+        self.assertEqual(get_registry(), registry)
+        self.assertIs(get_json_encoder_class(), DjangoJSONEncoder)
+
+    def test_batched_actor_and_content_resolution(self) -> None:
+
+        users = [User.objects.create(username=f'tester{index}') for index in range(3)]
+
+        for index in range(6):
+            with revy.Context():
+                revy.Context.set_actor(users[index % len(users)])
+                Account.objects.create(code=f'E.{index:04}')
+
+        ContentType.objects.get_for_model(User)
+        ContentType.objects.get_for_model(Account)
+
+        with self.assertNumQueries(3):
+            revisions = list(cast(RevisionQuerySet, Revision.objects.order_by('pk')).prefetch_actors())
+            actors = [list(revision.get_actors()) for revision in revisions]
+        self.assertEqual(actors, [[users[index % len(users)]] for index in range(6)])
+
+        revision = Revision.objects.latest('id')
+        with self.assertNumQueries(2):
+            self.assertEqual(list(revision.get_actors()), [users[2]])
+
+        with self.assertNumQueries(2):
+            object_deltas = list(cast(DeltaQuerySet, ObjectDelta.objects.order_by('pk')).prefetch_contents())
+            codes = [object_delta.get_object().code for object_delta in object_deltas]
+        self.assertEqual(codes, [f'E.{index:04}' for index in range(6)])
+
+        object_delta = object_deltas[0]
+        with self.assertNumQueries(2):
+            self.assertEqual(list(object_delta.get_actors()), [users[0]])
+
+        with self.assertNumQueries(2):
+            object_deltas = list(cast(DeltaQuerySet, ObjectDelta.objects.order_by('pk')).prefetch_attribute_deltas())
+        with self.assertNumQueries(1):
+            self.assertEqual(list(object_deltas[0].get_actors()), [users[0]])
+
+    def test_object_history(self) -> None:
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0000')
+            Account.objects.create(code='F.0000')
+
+        for index in range(1, 5):
+            with revy.Context():
+                account.code = f'E.{index:04}'
+                account.save()
+
+        with self.assertNumQueries(2):
+            object_deltas = list(object_history(account))
+            codes = [
+                attribute_delta.get_new_value()
+                for object_delta in object_deltas
+                for attribute_delta in object_delta.get_attribute_deltas()
+                if attribute_delta.get_attribute_name() == 'code'
+            ]
+            revisions = [object_delta.get_revision() for object_delta in object_deltas]
+        self.assertEqual(codes, [f'E.{index:04}' for index in range(5)])
+        self.assertEqual(len(set(revisions)), 5)
+
+        pages = []
+        cursor = None
+        while True:
+            page = paginate_keyset(object_history(account), cursor=cursor, page_size=2)
+            pages.append([object_delta.pk for object_delta in page.objects])
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), [object_delta.pk for object_delta in object_deltas])
+
+        page = paginate_keyset(object_history(account), page_size=2, descending=True)
+        self.assertEqual([object_delta.pk for object_delta in page.objects], [object_deltas[4].pk, object_deltas[3].pk])
+
+        with override_settings(REVY_OLD_VALUES=old_values.MODE_NEVER):
+            with revy.Context():
+                account.code = 'E.0005'
+                account.save()
+            with self.assertNumQueries(2):
+                attribute_delta = [
+                    attribute_delta
+                    for attribute_delta in list(object_history(account))[-1].get_attribute_deltas()
+                    if attribute_delta.get_attribute_name() == 'code'
+                ][0]
+                self.assertEqual(attribute_delta.get_old_value(), 'E.0004')
+
+    def test_admin(self) -> None:
+
+        superuser = User.objects.create(username='admin', is_staff=True, is_superuser=True)
+        self.client.force_login(superuser)
+
+        with revy.Context():
+            revy.Context.set_actor(superuser)
+            account = Account.objects.create(code='E.0000')
+
+        for index in range(1, 4):
+            with revy.Context():
+                revy.Context.set_actor(superuser)
+                account.code = f'E.{index:04}'
+                account.save()
+
+        object_delta_admin = admin.site.get_model_admin(ObjectDelta)
+        with override_settings(REVY_ADMIN_COUNT_LIMIT=2), mock.patch.object(object_delta_admin, 'list_per_page', 3):
+            response = self.client.get(reverse('admin:revy_objectdelta_changelist'))
+            self.assertEqual(response.status_code, 200)
+            changelist = response.context['cl']
+            self.assertEqual(changelist.result_count, 2)
+            self.assertFalse(changelist.result_count_is_exact)
+            self.assertIsNotNone(changelist.next_url)
+
+            pks = [object_delta.pk for object_delta in changelist.result_list]
+            response = self.client.get(reverse('admin:revy_objectdelta_changelist') + changelist.next_url)
+            self.assertEqual(response.status_code, 200)
+            pks += [object_delta.pk for object_delta in response.context['cl'].result_list]
+        self.assertEqual(pks, sorted(pks, reverse=True))
+        self.assertEqual(len(pks), len(set(pks)))
+
+        response = self.client.get(reverse('admin:revy_objectdelta_changelist'), {CURSOR_VAR: 'abc'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['cl'].first_url)
+
+        for url_name in ('admin:revy_revision_changelist', 'admin:revy_attributedelta_changelist'):
+            response = self.client.get(reverse(url_name))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.context['cl'].result_count_is_exact)
+
+        response = self.client.get(reverse('admin:ledger_account_history', args=[account.pk]))
+        self.assertEqual(response.status_code, 200)
+        page = response.context['page']
+        self.assertEqual(len(page.objects), 4)
+        self.assertFalse(page.has_next)
+        self.assertContains(response, 'E.0003')
+
+        history_url = reverse('admin:ledger_account_history', args=[account.pk])
+        preserved_filters = {'_changelist_filters': 'q=E'}
+        with mock.patch.object(admin.site.get_model_admin(Account), 'history_per_page', 3):
+            response = self.client.get(history_url, preserved_filters)
+            self.assertEqual(response.status_code, 200)
+            next_url = response.context['next_url']
+            self.assertIn('_changelist_filters=q%3DE', next_url)
+            response = self.client.get(history_url + next_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['page'].objects), 1)
+            self.assertEqual(response.context['first_url'], '?_changelist_filters=q%3DE')
+            response = self.client.get(history_url, {**preserved_filters, CURSOR_VAR: 'abc'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['page'].objects), 3)
+
+    def test_lazy_patching(self) -> None:
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0000')
+
+        with override_settings(REVY_LAZY_PATCHING=True):
+            self.assertTrue(Patcher.is_model_patched_lazily(Account))
+            self.assertFalse(Patcher.is_method_patched(Account, '__setattr__'))
+            self.assertFalse(Patcher.is_method_patched(Account, 'save_base'))
+
+            with revy.Context():
+                account = Account.objects.get(pk=account.pk)
+                account.code = 'E.0001'
+                account.save()
+
+            self.assertTrue(Patcher.is_method_patched(Account, '__setattr__'))
+            self.assertTrue(Patcher.is_method_patched(Account, 'save_base'))
+            self.assertFalse(Patcher.is_model_patched_lazily(Account))
+            self.assertTrue(Patcher.is_method_patched(Account, '__init__'))
+
+            object_delta = ObjectDelta.objects.latest('pk')
+            self.assertEqual(object_delta.get_action(), ObjectDelta.ACTION_UPDATE)
+            self.assertEqual(
+                [attribute_delta.get_attribute_name() for attribute_delta in object_delta.get_attribute_deltas()],
+                ['code'],
+            )
+
+    def test_incremental_setup(self) -> None:
+
+        with (
+            mock.patch.object(Patcher, 'patch_model', wraps=Patcher.patch_model) as patch_model,
+            mock.patch.object(Patcher, 'unpatch_model', wraps=Patcher.unpatch_model) as unpatch_model,
+        ):
+            with override_settings(REVY_METRICS=True):
+                pass
+            self.assertEqual(patch_model.call_count, 0)
+            self.assertEqual(unpatch_model.call_count, 0)
+
+            with override_settings(REVY_MODEL_FIELDS={'ledger.Account': {'exclude': ['code']}}):
+                self.assertEqual([call.args[0] for call in patch_model.call_args_list], [Account])
+                self.assertEqual([call.args[0] for call in unpatch_model.call_args_list], [Account])
+
+                with revy.Context():
+                    account = Account.objects.create(code='E.0000')
+                self.assertFalse(
+                    AttributeDelta.objects.filter(
+                        **{AttributeDelta.ATTRIBUTE_NAME_FIELD_NAME: 'code'},
+                    ).exists(),
+                )
+            self.assertEqual([call.args[0] for call in patch_model.call_args_list], [Account, Account])
+
+            with override_settings(REVY_MODELS=['ledger.Account']):
+                self.assertNotIn(Account, [call.args[0] for call in unpatch_model.call_args_list[2:]])
+                self.assertFalse(Patcher.is_method_patched(Transaction, 'save_base'))
+            self.assertTrue(Patcher.is_method_patched(Transaction, 'save_base'))
+
+        with revy.Context():
+            account.code = 'E.0001'
+            account.save()
+        self.assertTrue(
+            AttributeDelta.objects.filter(
+                **{AttributeDelta.ATTRIBUTE_NAME_FIELD_NAME: 'code'},
+            ).exists(),
+        )
+
+    def test_context_var_storage(self) -> None:
+
+        with override_settings(REVY_STORAGE='revy.storages.ContextVarStorage'):
+            self.assertIsInstance(revy.Context._storage, revy.ContextVarStorage)
+            self.assertIs(get_context_class()._storage, revy.Context._storage)
+
+            with revy.Context.via_object_delta_description('Opened.'):
+                account = Account.objects.create(code='F.0000')
+
+            object_delta = ObjectDelta.objects.latest('pk')
+            self.assertEqual(object_delta.get_object(), account)
+            self.assertEqual(object_delta.get_description(), 'Opened.')
+
+        self.assertIsInstance(revy.Context._storage, revy.ASGIRefLocalStorage)
+
+    def test_coalescing(self) -> None:
+
+        def get_code_rows(object_delta: AbstractObjectDelta) -> List[tuple]:
+            return [
+                (attribute_delta.get_old_value(), attribute_delta.get_new_value())
+                for attribute_delta in object_delta.get_attribute_deltas()
+                if attribute_delta.get_attribute_name() == 'code'
+            ]
+
+        revision = Revision.objects.create()
+        with revy.Context.via_revision(revision), revy.Context.as_coalescing():
+            account = Account.objects.create(code='E.0001')
+            for code in ('E.0002', 'E.0003'):
+                account.code = code
+                account.save()
+
+        object_delta = ObjectDelta.objects.get(revision=revision)
+        self.assertEqual(object_delta.get_action(), ObjectDelta.ACTION_CREATE)
+        self.assertEqual(get_code_rows(object_delta), [(None, 'E.0003')])
+        self.assertEqual(
+            AttributeDelta.objects.filter(revision=revision).count(),
+            ACCOUNT_MODEL_FIELDS_COUNT,
+        )
+
+        revision = Revision.objects.create()
+        with revy.Context.via_revision(revision), revy.Context.as_coalescing():
+            for code in ('E.0004', 'E.0005'):
+                account.code = code
+                account.save()
+            transaction = Transaction.objects.create(
+                account=account,
+                type=Transaction.TYPE_CREDIT,
+                amount=decimal.Decimal('1.00'),
+                iso_4217_code='TZS',
+                exchange_rate=decimal.Decimal('2.00'),
+            )
+            transaction.delete()
+
+        object_delta = cast(DeltaQuerySet, ObjectDelta.objects.filter(revision=revision)).for_object(account).get()
+        self.assertEqual(object_delta.get_action(), ObjectDelta.ACTION_UPDATE)
+        self.assertEqual(get_code_rows(object_delta), [('E.0003', 'E.0005')])
+        self.assertEqual(ObjectDelta.objects.filter(revision=revision).count(), 3)
+
+        revision = Revision.objects.create()
+        with revy.Context.via_revision(revision):
+            for code in ('E.0006', 'E.0007'):
+                account.code = code
+                account.save()
+
+        self.assertEqual(ObjectDelta.objects.filter(revision=revision).count(), 2)
+
+
+    def test_coalescing_rollback(self) -> None:
+
+        account = Account.objects.create(code='E.0001')
+        transaction = Transaction.objects.create(
+            account=account,
+            type=Transaction.TYPE_CREDIT,
+            amount=decimal.Decimal('1.00'),
+            iso_4217_code='TZS',
+            exchange_rate=decimal.Decimal('2.00'),
+        )
+
+        revision = Revision.objects.create()
+        with revy.Context.via_revision(revision), revy.Context.as_coalescing():
+            with self.assertRaises(RuntimeError), atomic():
+                account.code = 'E.0002'
+                account.save()
+                raise RuntimeError
+            for code in ('E.0003', 'E.0004'):
+                account.code = code
+                account.save()
+
+            transaction.amount = decimal.Decimal('2.00')
+            transaction.save()
+            with self.assertRaises(RuntimeError), atomic():
+                transaction.iso_4217_code = 'USD'
+                transaction.save()
+                raise RuntimeError
+            transaction.iso_4217_code = 'EUR'
+            transaction.save()
+
+        object_delta = cast(DeltaQuerySet, ObjectDelta.objects.filter(revision=revision)).for_object(account).get()
+        self.assertEqual(
+            [
+                (attribute_delta.get_old_value(), attribute_delta.get_new_value())
+                for attribute_delta in object_delta.get_attribute_deltas()
+            ],
+            [('E.0002', 'E.0004')],
+        )
+        object_delta = cast(DeltaQuerySet, ObjectDelta.objects.filter(revision=revision)).for_object(transaction).get()
+        self.assertEqual(
+            sorted(
+                (attribute_delta.get_attribute_name(), attribute_delta.get_new_value())
+                for attribute_delta in object_delta.get_attribute_deltas()
+            ),
+            [
+                ('amount', decimal.Decimal('2.00')),
+                ('iso_4217_code', 'EUR'),
+                ('local_amount', decimal.Decimal('4.00')),
+            ],
+        )
+    @override_settings(REVY_METRICS=True)
+    def test_change_detection(self) -> None:
+
+        metrics.metrics_registry.reset()
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0001')
+            transaction = Transaction.objects.create(
+                account=account,
+                type=Transaction.TYPE_CREDIT,
+                amount=decimal.Decimal('1.00'),
+                iso_4217_code='TZS',
+                exchange_rate=decimal.Decimal('2.00'),
+                date=datetime.date(2024, 2, 29),
+            )
+
+        revisions_count = Revision.objects.count()
+        object_deltas_count = ObjectDelta.objects.count()
+
+        with revy.Context():
+            transaction.amount = decimal.Decimal('1.001')
+            transaction.exchange_rate = decimal.Decimal('2.000')
+            transaction.account = account
+            transaction.account_id = str(account.pk)
+            transaction.date = '2024-02-29'
+            transaction.save()
+
+        self.assertEqual(Revision.objects.count(), revisions_count)
+        self.assertEqual(ObjectDelta.objects.count(), object_deltas_count)
+        self.assertEqual(metrics.writes_suppressed.get('ledger.transaction'), 1)
+
+        with revy.Context():
+            transaction.amount = decimal.Decimal('1.50')
+            transaction.save()
+
+        object_delta = ObjectDelta.objects.latest('pk')
+        self.assertEqual(
+            [attribute_delta.get_attribute_name() for attribute_delta in object_delta.get_attribute_deltas()],
+            ['amount', 'local_amount'],
+        )
+        self.assertEqual(metrics.writes_suppressed.get('ledger.transaction'), 1)
+
+        field = cast(Field, Transaction._meta.get_field('date'))  # noqa
+        codec = field_codecs.get_field_codec(field)
+        self.assertFalse(field_codecs.is_value_changed(field, codec, datetime.date(2024, 2, 29), '2024-02-29'))
+
+        created_at_field = cast(Field, ObjectDelta._meta.get_field(ObjectDelta.CREATED_AT_FIELD_NAME))  # noqa
+        created_at_codec = field_codecs.get_field_codec(created_at_field)
+        self.assertFalse(field_codecs.is_value_changed(
+            created_at_field,
+            created_at_codec,
+            datetime.datetime(2024, 2, 29, 12),
+            datetime.datetime(2024, 2, 29, 12, tzinfo=datetime.timezone.utc),
+        ))
+        self.assertTrue(field_codecs.is_value_changed(
+            created_at_field,
+            created_at_codec,
+            datetime.datetime(2024, 2, 29, 12),
+            datetime.datetime(2024, 2, 29, 12, tzinfo=datetime.timezone(datetime.timedelta(hours=3))),
+        ))
+
+    def test_pending_attribute_deltas(self) -> None:
+
+        user = get_user_model().objects.create(username='user')
+
+        with revy.Context.via_actor(user):
+            account = Account(code='E.0001')
+            account.code = 'E.0002'
+
+            state = get_model_instance_state(account)
+            self.assertTrue(all(
+                isinstance(attribute_delta, PendingAttributeDelta)
+                for attribute_delta in state.attribute_deltas
+            ))
+            attribute_delta_index = state.field_name_to_attribute_delta_index_mapping['code'][-1]
+            pending_attribute_delta = state.attribute_deltas[attribute_delta_index]
+            self.assertEqual(pending_attribute_delta.new_value, 'E.0002')
+            self.assertIs(pending_attribute_delta.actor, user)
+
+            account.save()
+
+        self.assertEqual(state.attribute_deltas, [])
+        attribute_delta = AttributeDelta.objects.filter(field_name='code').latest('pk')
+        self.assertEqual(attribute_delta.get_new_value(), 'E.0002')
+        self.assertEqual(attribute_delta.get_actor(), user)
+
+    def test_untracked(self) -> None:
+
+        with revy.Context():
+            account = Account.objects.create(code='E.0001')
+            Transaction.objects.create(
+                account=account,
+                type=Transaction.TYPE_CREDIT,
+                amount=decimal.Decimal('1.00'),
+                iso_4217_code='TZS',
+                exchange_rate=decimal.Decimal('2.00'),
+                date=datetime.date(2024, 2, 29),
+            )
+
+        with revy.Context():
+            accounts = list(UntrackedQuerySet(model=Account).untracked().filter(pk=account.pk))
+            transactions = list(untracked(Transaction.objects.select_related('account').annotate(
+                account_code=F('account__code'),
+            )))
+            deferred_account = untracked(Account.objects.only('pk')).get(pk=account.pk)
+
+        self.assertEqual(accounts, [account])
+        self.assertEqual(accounts[0].code, 'E.0001')
+        self.assertFalse(accounts[0]._state.adding)
+        self.assertEqual(accounts[0]._state.db, 'default')
+        self.assertIsNone(ModelInstanceState.get_for(accounts[0]))
+        self.assertEqual(transactions[0].account, account)
+        self.assertEqual(getattr(transactions[0], 'account_code'), 'E.0001')
+        self.assertIsNone(ModelInstanceState.get_for(transactions[0]))
+        self.assertIsNone(ModelInstanceState.get_for(transactions[0].account))
+        self.assertEqual(deferred_account.get_deferred_fields(), {'code'})
+        self.assertEqual(untracked(Account.objects.values_list('code', flat=True)).get(), 'E.0001')
+
+        for code, untracked_account in (('E.0002', accounts[0]), ('E.0003', transactions[0].account)):
+            with revy.Context():
+                untracked_account.code = code
+                untracked_account.save()
+            object_delta = ObjectDelta.objects.latest('pk')
+            self.assertEqual(object_delta.get_action(), ObjectDelta.ACTION_UPDATE)
+            self.assertEqual(
+                [
+                    (attribute_delta.get_attribute_name(), attribute_delta.get_new_value())
+                    for attribute_delta in object_delta.get_attribute_deltas()
+                ],
+                [('code', code)],
+            )
+        self.assertEqual(
+            [
+                attribute_delta.get_old_value()
+                for attribute_delta in AttributeDelta.objects.filter(
+                    **{AttributeDelta.ATTRIBUTE_NAME_FIELD_NAME: 'code'},
+                ).order_by('pk')
+            ],
+            [None, 'E.0001', 'E.0001'],
+        )
+
+    def test_batch(self) -> None:
+
+        user = get_user_model().objects.create(username='user')
+        revisions_count = Revision.objects.count()
+        progress: List[int] = []
+
+        batch = revy.Batch(max_objects=2, on_progress=lambda batch: progress.append(batch.flushed_objects))
+        with revy.Context.via_actor(user), revy.Context.via_batch(batch):
+            accounts = [Account.objects.create(code=f'E.000{index}') for index in range(3)]
+            self.assertEqual(ObjectDelta.objects.count(), 2)
+            account_ids = [str(account.pk) for account in accounts]
+            accounts[0].code = 'E.0009'
+            accounts[0].save()
+            accounts[2].code = 'E.0008'
+            accounts[2].delete()
+            self.assertEqual(ObjectDelta.objects.count(), 4)
+
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertEqual(Revision.objects.count(), revisions_count + 1)
+        revision = batch.revision
+        assert revision is not None  # noqa
+        object_deltas = list(ObjectDelta.objects.filter(revision=revision).order_by('pk'))
+        self.assertEqual(
+            [(object_delta.get_action(), getattr(object_delta, 'content_id')) for object_delta in object_deltas],
+            [
+                (ObjectDelta.ACTION_CREATE, account_ids[0]),
+                (ObjectDelta.ACTION_CREATE, account_ids[1]),
+                (ObjectDelta.ACTION_CREATE, account_ids[2]),
+                (ObjectDelta.ACTION_UPDATE, account_ids[0]),
+                (ObjectDelta.ACTION_DELETE, account_ids[2]),
+            ],
+        )
+        self.assertEqual(
+            AttributeDelta.objects.filter(revision=revision).count(),
+            ACCOUNT_MODEL_FIELDS_COUNT * 3 + 2,
+        )
+        self.assertEqual(
+            [
+                (attribute_delta.get_old_value(), attribute_delta.get_new_value())
+                for attribute_delta in object_deltas[3].get_attribute_deltas()
+            ],
+            [('E.0000', 'E.0009')],
+        )
+        self.assertEqual(
+            [
+                (attribute_delta.get_old_value(), attribute_delta.get_new_value())
+                for attribute_delta in object_deltas[4].get_attribute_deltas()
+            ],
+            [('E.0002', 'E.0008')],
+        )
+        self.assertEqual(object_deltas[4].get_actor(), user)
+        object_delta = ObjectDelta.objects.filter(
+            pk=object_deltas[3].pk,
+        ).annotate(
+            snapshot=ObjectSnapshot(Account),
+        ).get()
+        self.assertEqual(getattr(object_delta, 'snapshot').code, 'E.0009')
+
+
+class AuditDatabaseTestCase(TestCase):
+
+    databases = {'default', 'audit'}
+
+    @override_settings(
+        REVY_DATABASE='audit',
+        DATABASE_ROUTERS=['revy.contrib.django.routers.AuditRouter'],
+    )
+    def test_audit_database(self) -> None:
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with revy.Context():
+                account = Account.objects.create(code='E.0000')
+            self.assertEqual(ObjectDelta.objects.count(), 0)
+        self.assertEqual(len(callbacks), 1)
+        account_id = str(account.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with revy.Context():
+                account.code = 'E.0001'
+                account.save()
+                account.delete()
+
+        self.assertEqual(ObjectDelta.objects.using('default').count(), 0)
+        self.assertEqual(AttributeDelta.objects.using('default').count(), 0)
+        self.assertEqual(Revision.objects.using('audit').count(), 3)
+        self.assertEqual(
+            [
+                (object_delta.get_action(), getattr(object_delta, 'content_id'))
+                for object_delta in ObjectDelta.objects.order_by('pk')
+            ],
+            [
+                (ObjectDelta.ACTION_CREATE, account_id),
+                (ObjectDelta.ACTION_UPDATE, account_id),
+                (ObjectDelta.ACTION_DELETE, account_id),
+            ],
+        )
+        self.assertEqual(
+            AttributeDelta.objects.filter(**{AttributeDelta.ATTRIBUTE_NAME_FIELD_NAME: 'code'}).count(),
+            2,
+        )
+
+    @override_settings(REVY_DATABASE='default')
+    def test_audit_database_shared(self) -> None:
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with revy.Context():
+                Account.objects.create(code='E.0000')
+            self.assertEqual(ObjectDelta.objects.count(), 1)
+        self.assertEqual(callbacks, [])
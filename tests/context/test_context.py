@@ -1,4 +1,9 @@
+import threading
 import unittest
+from typing import (
+    Any,
+    List,
+)
 
 import revy
 
@@ -44,3 +49,121 @@ class ContextTestCase(unittest.TestCase):
 
         self.assertFalse(revy.Context.is_enabled())
         self.assertTrue(revy.Context.is_disabled())
+
+    def test_cost_account(self) -> None:
+        self.assertIsNone(revy.Context.get_cost_account())
+
+        with revy.Context.via_cost_account():
+            outer_cost_account = revy.Context.get_cost_account()
+            assert outer_cost_account is not None  # noqa
+
+            with revy.Context.via_cost_account():
+                inner_cost_account = revy.Context.get_cost_account()
+                assert inner_cost_account is not None  # noqa
+                self.assertIsNot(inner_cost_account, outer_cost_account)
+                self.assertIs(inner_cost_account.get_root(), outer_cost_account)
+                inner_cost_account.add(statements=2, rows=3, duration=0.5)
+
+            outer_cost_account.add(statements=1)
+
+            self.assertEqual(inner_cost_account.statements, 2)
+            self.assertEqual(outer_cost_account.statements, 3)
+            self.assertEqual(outer_cost_account.rows, 3)
+            self.assertEqual(outer_cost_account.duration, 0.5)
+
+        self.assertIsNone(revy.Context.get_cost_account())
+
+    def test_snapshot(self) -> None:
+        self.assertTrue(revy.Context.get_snapshot().is_disabled)
+
+        with revy.Context.via_actor(1):
+            snapshot = revy.Context.get_snapshot()
+            self.assertFalse(snapshot.is_disabled)
+            self.assertEqual(snapshot.actor, 1)
+            self.assertIs(revy.Context.get_snapshot(), snapshot)
+
+            revy.Context.set_attribute_delta_description('Imported.')
+            snapshot = revy.Context.get_snapshot()
+            self.assertEqual(snapshot.attribute_delta_description, 'Imported.')
+            self.assertIs(revy.Context.get_snapshot(), snapshot)
+
+            with revy.Context.as_disabled():
+                self.assertTrue(revy.Context.get_snapshot().is_disabled)
+                self.assertEqual(revy.Context.get_snapshot().actor, 1)
+
+            self.assertIsNot(revy.Context.get_snapshot(), snapshot)
+            self.assertEqual(revy.Context.get_snapshot(), snapshot)
+
+            revy.Context.unset_actor()
+            self.assertIsNone(revy.Context.get_snapshot().actor)
+
+        self.assertTrue(revy.Context.get_snapshot().is_disabled)
+
+    def test_snapshot_threads(self) -> None:
+        actors: List[Any] = []
+
+        def run() -> None:
+            with revy.Context.via_actor(2):
+                revy.Context.set_actor(3)
+                actors.append(revy.Context.get_snapshot().actor)
+
+        with revy.Context.via_actor(1):
+            snapshot = revy.Context.get_snapshot()
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+            self.assertIs(revy.Context.get_snapshot(), snapshot)
+
+        self.assertEqual(actors, [3])
+
+    def test_coalescing(self) -> None:
+        self.assertFalse(revy.Context.is_coalescing())
+
+        with revy.Context.as_coalescing():
+            self.assertTrue(revy.Context.is_coalescing())
+            self.assertTrue(revy.Context.get_snapshot().is_coalescing)
+
+            with revy.Context():
+                revy.Context.disable_coalescing()
+                self.assertFalse(revy.Context.get_snapshot().is_coalescing)
+
+            self.assertTrue(revy.Context.is_coalescing())
+
+        with revy.Context():
+            revy.Context.enable_coalescing()
+            self.assertTrue(revy.Context.is_coalescing())
+
+    def test_batch(self) -> None:
+        flushed_entries: List[List[Any]] = []
+        progress: List[int] = []
+
+        def flush_handler(batch: revy.Batch, entries: List[Any]) -> None:
+            flushed_entries.append(entries)
+
+        self.assertIsNone(revy.Context.get_batch())
+
+        batch = revy.Batch(max_objects=2, on_progress=lambda batch: progress.append(batch.flushed_objects))
+        batch.flush_handler = flush_handler
+        with revy.Context.via_batch(batch):
+            self.assertIs(revy.Context.get_snapshot().batch, batch)
+            with revy.Context():
+                self.assertIs(revy.Context.get_batch(), batch)
+                for entry in range(3):
+                    batch.add(entry)
+            self.assertEqual(flushed_entries, [[0, 1]])
+
+        self.assertIsNone(revy.Context.get_batch())
+        self.assertEqual(flushed_entries, [[0, 1], [2]])
+        self.assertEqual(progress, [2, 3])
+        self.assertEqual(batch.flushes, 2)
+
+        batch = revy.Batch(max_objects=None, max_bytes=10)
+        batch.flush_handler = flush_handler
+        with self.assertRaises(RuntimeError), revy.Context.via_batch(batch):
+            batch.add('a', size=6)
+            batch.add('b', size=6)
+            batch.add('c', size=6)
+            raise RuntimeError
+        self.assertEqual(flushed_entries[-1], ['a', 'b'])
+        self.assertEqual(batch.entries, [])
+        self.assertEqual(batch.flushed_bytes, 12)
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import unittest
+from typing import (
+    Any,
+    List,
+    Optional,
+    cast,
+)
+
+import revy
+
+
+class ContextVarStorageTestCase(unittest.TestCase):
+
+    def test_get_base_context_class(self) -> None:
+        self.assertIs(revy.ContextVarStorage.get_base_context_class(), revy.Context)
+
+    def test_create_context_class(self) -> None:
+        storage = revy.ContextVarStorage()
+        context_class = storage.create_context_class()
+        self.assertTrue(issubclass(context_class, revy.Context))
+
+    def test_threads(self) -> None:
+        context_class = revy.ContextVarStorage().create_context_class(base=revy.Context)
+        actors: List[Optional[Any]] = []
+
+        def run() -> None:
+            actors.append(context_class.get_actor())
+            with context_class.via_actor(2):
+                actors.append(context_class.get_actor())
+
+        with context_class.via_actor(1):
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+            self.assertEqual(context_class.get_actor(), 1)
+
+        self.assertEqual(actors, [None, 2])
+        self.assertIsNone(context_class.get_current())
+
+    def test_tasks(self) -> None:
+        context_class = revy.ContextVarStorage().create_context_class(base=revy.Context)
+        entered = asyncio.Event()
+        exited = asyncio.Event()
+
+        async def inner() -> Optional[Any]:
+            with context_class.via_actor(2):
+                entered.set()
+                await exited.wait()
+                return context_class.get_actor()
+
+        async def outer() -> None:
+            with context_class.via_actor(1):
+                task = asyncio.create_task(inner())
+                await entered.wait()
+                self.assertEqual(context_class.get_actor(), 1)
+            self.assertIsNone(context_class.get_current())
+            exited.set()
+            self.assertEqual(await task, 2)
+
+        asyncio.run(outer())
+
+    def test_snapshot_tasks(self) -> None:
+        context_class = revy.ContextVarStorage().create_context_class(base=revy.Context)
+        entered = asyncio.Event()
+        changed = asyncio.Event()
+
+        async def first() -> Optional[Any]:
+            with context_class.via_actor(2):
+                snapshot = context_class.get_snapshot()
+                entered.set()
+                await changed.wait()
+                self.assertIs(context_class.get_snapshot(), snapshot)
+                return context_class.get_snapshot().actor
+
+        async def second() -> Optional[Any]:
+            await entered.wait()
+            context_class.set_actor(3)
+            changed.set()
+            return context_class.get_snapshot().actor
+
+        async def main() -> None:
+            with context_class.via_actor(1):
+                context_class.get_snapshot()
+                self.assertEqual(await asyncio.gather(first(), second()), [2, 3])
+                self.assertEqual(context_class.get_snapshot().actor, 1)
+
+        asyncio.run(main())
+
+    def test_set_global_storage(self) -> None:
+        storage = revy.ContextVarStorage()
+        previous_storage = cast(revy.Storage, revy.Context._storage)
+        try:
+            revy.set_global_storage(storage)
+            self.assertIs(revy.global_storage, storage)
+
+            class CustomContext(revy.Context):
+                ...
+
+            self.assertIs(CustomContext._storage, storage)
+            with revy.Context.via_actor(1):
+                self.assertEqual(CustomContext.get_actor(), 1)
+        finally:
+            revy.set_global_storage(previous_storage)
+        self.assertIs(revy.Context._storage, previous_storage)
+        self.assertIs(revy.global_storage, previous_storage)